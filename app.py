@@ -1,60 +1,144 @@
-from flask import Flask, render_template, request
+from flask import Flask, Response, g, render_template, request, jsonify
 import sys
-import os
+import io
+import time
+import logging
 from pathlib import Path
 
 # Add the src directory to Python path
 src_path = Path(__file__).parent / "src"
 sys.path.append(str(src_path))
 
-from src.mlproject.pipeline.pipelineprediction import ChurnPredictionPipeline
+from src.mlproject.pipeline.model_holder import get_model_holder
+from src.mlproject.pipeline.form_input import parse_form
+from src.mlproject.config.config import ConfigurationManager
+from mlproject.utils.metrics import (REGISTRY, CONTENT_TYPE, REQUESTS, ERRORS, REQUEST_SECONDS,
+                                     PARSE_SECONDS, RENDER_SECONDS)
+from mlproject.utils.logging_setup import configure_logging, REQUEST_LOGGER
+from mlproject import logger
 import pandas as pd
 
 app = Flask(__name__)
+config_manager = ConfigurationManager()
+configure_logging(config_manager.get_logging_config())
+REGISTRY.configure(enabled=config_manager.get_metrics_config().enabled)
+request_logger = logging.getLogger(REQUEST_LOGGER)
+
+# Load the model once per worker; later requests reuse it and pick up retrained artifacts.
+model_holder = get_model_holder()
+try:
+    model_holder.load()
+except Exception as e:
+    logger.exception(f"Model could not be loaded at startup: {e}")
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    if 'request_start' not in g or request.path == '/metrics':
+        return response
+    elapsed = time.perf_counter() - g.request_start
+    if REGISTRY.enabled:
+        endpoint = request.endpoint or 'unknown'
+        REQUEST_SECONDS.labels(endpoint=endpoint).observe(elapsed)
+        REQUESTS.labels(endpoint=endpoint).inc()
+        if response.status_code >= 400:
+            ERRORS.labels(endpoint=endpoint).inc()
+    # Sampled per logging.request_sample_rate; 4xx/5xx are always kept
+    level = logging.WARNING if response.status_code >= 400 else logging.INFO
+    request_logger.log(level, f"{request.method} {request.path} {response.status_code} {elapsed * 1000:.1f} ms")
+    return response
+
+
+def render(template: str, **context) -> str:
+    with RENDER_SECONDS.time():
+        return render_template(template, **context)
+
 
 @app.route('/')
 def home():
-    return render_template('index.html')
+    return render('index.html')
 
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
         # Get form data - matching the camelCase naming in your HTML form
-        data = {
-            'gender': [request.form['gender']],
-            'SeniorCitizen': [int(request.form['seniorCitizen'])],
-            'Partner': [request.form['partner']],
-            'Dependents': [request.form['dependents']],
-            'tenure': [float(request.form['tenure'])],
-            'PhoneService': [request.form['phoneService']],
-            'MultipleLines': [request.form['multipleLines']],
-            'InternetService': [request.form['internetService']],
-            'OnlineSecurity': [request.form['onlineSecurity']],
-            'OnlineBackup': [request.form['onlineBackup']],
-            'DeviceProtection': [request.form['deviceProtection']],
-            'TechSupport': [request.form['techSupport']],
-            'StreamingTV': [request.form['streamingTV']],
-            'StreamingMovies': [request.form['streamingMovies']],
-            'Contract': [request.form['contract']],
-            'PaperlessBilling': [request.form['paperlessBilling']],
-            'PaymentMethod': [request.form['paymentMethod']],
-            'MonthlyCharges': [float(request.form['monthlyCharges'])],
-            'TotalCharges': [float(request.form['totalCharges'])]
-        }
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
+        with PARSE_SECONDS.time():
+            df = pd.DataFrame([parse_form(request.form)])
         
-        # Initialize pipeline and make prediction
-        pipeline = ChurnPredictionPipeline()
+        # Get the shared pipeline and make prediction
+        pipeline = model_holder.get()
         result = pipeline.predict(df)
         
-        return render_template('results.html', 
-                             prediction=result['churn_status'],
-                             probability=round(result['churn_probability'] * 100, 2))
+        return render('results.html', 
+                      prediction=result['churn_status'],
+                      probability=round(result['churn_probability'] * 100, 2))
     
     except Exception as e:
-        return render_template('results.html', error=str(e))
+        # The form reports failures on a 200 page, so count them here
+        ERRORS.labels(endpoint='predict').inc()
+        return render('results.html', error=str(e))
+
+
+@app.route('/metrics')
+def metrics():
+    if not REGISTRY.enabled:
+        return Response("Metrics are disabled, set metrics.enabled in config/config.yaml\n",
+                        status=404, mimetype='text/plain')
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+
+def read_batch_request() -> pd.DataFrame:
+    """Builds a DataFrame from a JSON list of records, a CSV body or an uploaded CSV file."""
+    if 'file' in request.files:
+        return pd.read_csv(request.files['file'])
+    if request.mimetype in ('text/csv', 'application/csv'):
+        return pd.read_csv(io.BytesIO(request.get_data()))
+
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get('records')
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON list of records, {\"records\": [...]}, or a CSV body")
+    return pd.DataFrame.from_records(payload)
+
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        with PARSE_SECONDS.time():
+            df = read_batch_request()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+    if df.empty:
+        return jsonify({"error": "No rows to score"}), 400
+
+    try:
+        start = time.perf_counter()
+        probabilities_only = request.args.get('probabilities_only', 'false').lower() in ('1', 'true', 'yes')
+        result = model_holder.get().predict_batch(df, probabilities_only=probabilities_only)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if 'customerID' in df.columns:
+            result.insert(0, 'customerID', df['customerID'].values)
+        # Rows that failed validation carry an error instead of a score; NaN is not valid JSON
+        invalid_rows = int(result['error'].notna().sum())
+        result = result.astype(object).where(result.notna(), None)
+
+        return jsonify({
+            "rows": len(result),
+            "invalid_rows": invalid_rows,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "rows_per_ms": round(len(result) / elapsed_ms, 3) if elapsed_ms else None,
+            "predictions": result.to_dict(orient='records')
+        })
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 422
 
 if __name__ == '__main__':
     app.run(host="0.0.0.0", port=8080)
\ No newline at end of file
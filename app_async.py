@@ -0,0 +1,187 @@
+"""asyncio serving mode: concurrent /predict requests are scored in micro-batches.
+
+Run with `python app_async.py [--port 8080]`; batching knobs live under
+`async_serving` in config/config.yaml.
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import jinja2
+import pandas as pd
+from aiohttp import web
+
+# Add the src directory to Python path
+src_path = Path(__file__).parent / "src"
+sys.path.append(str(src_path))
+
+from src.mlproject.config.config import ConfigurationManager
+from src.mlproject.pipeline.model_holder import get_model_holder
+from src.mlproject.pipeline.micro_batching import MicroBatcher
+from src.mlproject.pipeline.form_input import parse_form
+from mlproject.utils.metrics import (REGISTRY, CONTENT_TYPE, REQUESTS, ERRORS, REQUEST_SECONDS,
+                                     PARSE_SECONDS, RENDER_SECONDS)
+from mlproject.utils.logging_setup import configure_logging, REQUEST_LOGGER
+from mlproject import logger
+
+
+templates = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=True,
+)
+request_logger = logging.getLogger(REQUEST_LOGGER)
+
+
+def render(template: str, **context) -> web.Response:
+    with RENDER_SECONDS.time():
+        text = templates.get_template(template).render(**context)
+    return web.Response(text=text, content_type="text/html")
+
+
+@web.middleware
+async def record_request(request, handler):
+    if request.path == '/metrics':
+        return await handler(request)
+
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        if REGISTRY.enabled:
+            endpoint = request.match_info.route.name or 'unknown'
+            REQUEST_SECONDS.labels(endpoint=endpoint).observe(elapsed)
+            REQUESTS.labels(endpoint=endpoint).inc()
+            if status >= 400:
+                ERRORS.labels(endpoint=endpoint).inc()
+        # Sampled per logging.request_sample_rate; 4xx/5xx are always kept
+        level = logging.WARNING if status >= 400 else logging.INFO
+        request_logger.log(level, f"{request.method} {request.path} {status} {elapsed * 1000:.1f} ms")
+
+
+def score_records(records: list) -> list:
+    """Scores a micro-batch; a record that failed validation gets its own error, not its neighbours'."""
+    results = get_model_holder().get().predict_batch(records).to_dict(orient='records')
+    return [ValueError(f"Input failed schema validation: {result['error']}") if result['error'] is not None
+            else result for result in results]
+
+
+async def home(request):
+    return render('index.html')
+
+
+async def predict(request):
+    try:
+        form = await request.post()
+        with PARSE_SECONDS.time():
+            record = parse_form(form)
+        result = await request.app['batcher'].submit(record)
+        return render('results.html',
+                      prediction=result['churn_status'],
+                      probability=round(result['churn_probability'] * 100, 2))
+    except Exception as e:
+        # The form reports failures on a 200 page, so count them here
+        ERRORS.labels(endpoint='predict').inc()
+        return render('results.html', error=str(e))
+
+
+async def predict_batch(request):
+    try:
+        body = await request.read()
+        with PARSE_SECONDS.time():
+            if request.content_type in ('text/csv', 'application/csv'):
+                df = pd.read_csv(io.BytesIO(body))
+            else:
+                payload = json.loads(body)
+                if isinstance(payload, dict):
+                    payload = payload.get('records')
+                if not isinstance(payload, list):
+                    raise ValueError("Expected a JSON list of records, {\"records\": [...]}, or a CSV body")
+                df = pd.DataFrame.from_records(payload)
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=400)
+
+    if df.empty:
+        return web.json_response({"error": "No rows to score"}, status=400)
+
+    try:
+        start = time.perf_counter()
+        # Already a batch, so it skips the micro-batcher but still runs off the event loop
+        result = await asyncio.get_running_loop().run_in_executor(None, get_model_holder().get().predict_batch, df)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if 'customerID' in df.columns:
+            result.insert(0, 'customerID', df['customerID'].values)
+        # Rows that failed validation carry an error instead of a score; NaN is not valid JSON
+        invalid_rows = int(result['error'].notna().sum())
+        result = result.astype(object).where(result.notna(), None)
+
+        return web.json_response({
+            "rows": len(result),
+            "invalid_rows": invalid_rows,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "rows_per_ms": round(len(result) / elapsed_ms, 3) if elapsed_ms else None,
+            "predictions": result.to_dict(orient='records')
+        })
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=422)
+
+
+async def metrics(request):
+    if not REGISTRY.enabled:
+        return web.Response(text="Metrics are disabled, set metrics.enabled in config/config.yaml\n", status=404)
+    return web.Response(body=REGISTRY.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+
+def create_app(max_batch_size: int, max_wait_ms: float, workers: int, metrics_enabled: bool = True) -> web.Application:
+    REGISTRY.configure(enabled=metrics_enabled)
+    app = web.Application(middlewares=[record_request])
+    app['batcher'] = MicroBatcher(score_records, max_batch_size=max_batch_size,
+                                  max_wait_ms=max_wait_ms, workers=workers)
+
+    async def on_startup(app):
+        try:
+            get_model_holder().load()
+        except Exception as e:
+            logger.exception(f"Model could not be loaded at startup: {e}")
+        await app['batcher'].start()
+
+    async def on_cleanup(app):
+        await app['batcher'].stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_get('/', home, name='home')
+    app.router.add_post('/predict', predict, name='predict')
+    app.router.add_post('/predict/batch', predict_batch, name='predict_batch')
+    app.router.add_get('/metrics', metrics, name='metrics')
+    return app
+
+
+if __name__ == '__main__':
+    config_manager = ConfigurationManager()
+    configure_logging(config_manager.get_logging_config())
+    config = config_manager.get_async_serving_config()
+
+    parser = argparse.ArgumentParser(description="Async micro-batching churn prediction server")
+    parser.add_argument("--host", default=config.host)
+    parser.add_argument("--port", type=int, default=config.port)
+    parser.add_argument("--max-batch-size", type=int, default=config.max_batch_size)
+    parser.add_argument("--max-wait-ms", type=float, default=config.max_wait_ms)
+    parser.add_argument("--workers", type=int, default=config.workers)
+    args = parser.parse_args()
+
+    app = create_app(args.max_batch_size, args.max_wait_ms, args.workers,
+                     metrics_enabled=config_manager.get_metrics_config().enabled)
+    web.run_app(app, host=args.host, port=args.port)
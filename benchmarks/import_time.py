@@ -0,0 +1,139 @@
+"""Import-time check for the serving path, based on `python -X importtime`.
+
+Every target is imported in a fresh interpreter a few times. The median
+cumulative import time is compared with a stored baseline, and the check
+fails if a target pulls in a module it must not load at import, such as
+lightgbm for the NumPy bundle backend or mlflow anywhere in serving.
+
+    python benchmarks/import_time.py                     # report, compare with the baseline
+    python benchmarks/import_time.py --save-baseline
+    python benchmarks/import_time.py --fail-on-regression --tolerance 0.3
+
+`app` also loads the model at import, so its time is the whole Flask
+cold start, including the sklearn and lightgbm imports of the default
+backend.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baselines" / "import_time.json"
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "import_time.json"
+
+# Libraries that only training, evaluation or notebooks need
+TRAINING_ONLY = {"mlflow", "dagshub", "imblearn", "catboost", "matplotlib", "ydata_profiling", "IPython"}
+# Loaded by unpickling the sklearn backend's artifacts, never by an import alone
+MODEL_LIBRARIES = {"sklearn", "lightgbm", "scipy", "joblib"}
+TARGETS = {
+    "mlproject": TRAINING_ONLY | MODEL_LIBRARIES,
+    "mlproject.config.config": TRAINING_ONLY | MODEL_LIBRARIES,
+    "mlproject.pipeline.model_holder": TRAINING_ONLY | MODEL_LIBRARIES,
+    "mlproject.pipeline.bundle_prediction": TRAINING_ONLY | MODEL_LIBRARIES,
+    "app_async": TRAINING_ONLY | MODEL_LIBRARIES,
+    "app": TRAINING_ONLY,
+}
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us, depth) per `-X importtime` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(target: str) -> tuple:
+    """`-X importtime` rows and the top-level packages left in sys.modules after `import target`."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT), str(ROOT / "src")]))
+    # sys.modules rather than the importtime lines: a blocked or failed import still gets a line
+    code = f"import {target}, sys; print('LOADED ' + ' '.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                             cwd=ROOT, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{process.stderr[-2000:]}")
+    line = next(line for line in process.stdout.splitlines() if line.startswith("LOADED "))
+    return parse_importtime(process.stderr), set(line.split()[1:])
+
+
+def bench_target(target: str, forbidden: set, runs: int, top: int) -> dict:
+    totals, rows, loaded = [], None, set()
+    for _ in range(runs):
+        rows, loaded = measure(target)
+        totals.append(next(cumulative for name, _, cumulative, _ in rows if name == target))
+
+    by_package = Counter()
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    return {
+        "total_ms": round(statistics.median(totals) / 1000, 1),
+        "runs_ms": [round(total / 1000, 1) for total in totals],
+        "modules": len(rows),
+        "top_packages_ms": {name: round(us / 1000, 1) for name, us in by_package.most_common(top)},
+        "forbidden": sorted(loaded & forbidden),
+    }
+
+
+def main(args):
+    results = {}
+    failures = []
+    for target in args.targets:
+        result = bench_target(target, TARGETS[target], args.runs, args.top)
+        results[target] = result
+        packages = ", ".join(f"{name} {ms}" for name, ms in result["top_packages_ms"].items())
+        print(f"{target:<38}{result['total_ms']:>9.1f} ms  {result['modules']:>5} modules  ({packages})")
+        if result["forbidden"]:
+            failures.append(target)
+            print(f"  FORBIDDEN at import: {result['forbidden']}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=4))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=4))
+        print(f"Baseline saved to {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        print(f"\n{'target':<38}{'baseline':>10}{'current':>10}{'change':>10}")
+        for target, result in results.items():
+            if target not in baseline:
+                continue
+            base = baseline[target]["total_ms"]
+            change = (result["total_ms"] - base) / base
+            flag = "  REGRESSION" if change > args.tolerance else ""
+            if flag and args.fail_on_regression:
+                failures.append(target)
+            print(f"{target:<38}{base:>10.1f}{result['total_ms']:>10.1f}{change:>+10.1%}{flag}")
+    else:
+        print(f"No baseline at {baseline_path}, run with --save-baseline to create one")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target, the median is kept")
+    parser.add_argument("--top", type=int, default=5, help="heaviest packages listed per target")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 on a timing regression; forbidden imports always fail")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,239 @@
+"""Inference benchmarks for ChurnPredictionPipeline, compared against a stored baseline.
+
+Measures:
+  * cold start: import + artifact load + first prediction, in a fresh interpreter
+  * latency of predict_batch at batch sizes 1/100/10k/1M (p50/p95/p99)
+  * Flask /predict throughput under concurrent load (via serving_load.py)
+
+Rows are synthetic, bootstrapped from the bundled data (see synthetic.py).
+
+    python benchmarks/inference.py                      # run and compare with the baseline
+    python benchmarks/inference.py --save-baseline      # store this run as the new baseline
+    python benchmarks/inference.py --sizes 1 100 --skip-flask --fail-on-regression
+
+Latencies are machine-dependent: regenerate the baseline on the machine
+that runs the comparison.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from synthetic import ROOT, load_source, synthetic_rows
+import serving_load
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baselines" / "inference.json"
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "inference.json"
+# Timed calls per batch size; large batches need few repeats to be stable
+REPEATS = {1: 500, 100: 200, 10_000: 20, 1_000_000: 3}
+PIPELINES = {
+    "sklearn": ("mlproject.pipeline.pipelineprediction", "ChurnPredictionPipeline"),
+    "bundle": ("mlproject.pipeline.bundle_prediction", "BundlePredictionPipeline"),
+}
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+import pandas as pd
+from {module} import {cls}
+imported = time.perf_counter()
+pipeline = {cls}()
+loaded = time.perf_counter()
+pipeline.predict_batch(pd.DataFrame.from_records([json.loads(sys.argv[1])]))
+predicted = time.perf_counter()
+print("BENCH_RESULT " + json.dumps({{"import_s": imported - start, "load_s": loaded - imported,
+                                     "first_predict_s": predicted - loaded, "total_s": predicted - start}}))
+"""
+
+
+def percentiles(samples_s: list) -> dict:
+    samples_ms = np.asarray(samples_s) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(samples_ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(samples_ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(samples_ms, 99)), 4),
+        "mean_ms": round(float(samples_ms.mean()), 4),
+    }
+
+
+def bench_cold_start(backend: str, record: dict, runs: int) -> dict:
+    module, cls = PIPELINES[backend]
+    code = COLD_START.format(module=module, cls=cls)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT), str(ROOT / "src")]))
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code, json.dumps(record)],
+                             cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+        line = next(line for line in out.splitlines() if line.startswith("BENCH_RESULT "))
+        results.append(json.loads(line[len("BENCH_RESULT "):]))
+    # Median run per phase
+    return {key: round(float(np.median([r[key] for r in results])), 4) for key in results[0]}
+
+
+def bench_latency(pipeline, source, sizes: list, seed: int) -> dict:
+    results = {}
+    for size in sizes:
+        repeats = REPEATS.get(size, max(3, 200_000 // max(size, 1)))
+        if size == 1:
+            # A different customer per call, as in real single-row traffic
+            pool = synthetic_rows(source, repeats, seed=seed)
+            batches = [pool.iloc[[i]] for i in range(repeats)]
+        else:
+            batches = [synthetic_rows(source, size, seed=seed)] * repeats
+        pipeline.predict_batch(batches[0])
+
+        samples = []
+        for batch in batches:
+            start = time.perf_counter()
+            pipeline.predict_batch(batch)
+            samples.append(time.perf_counter() - start)
+        result = percentiles(samples)
+        result["repeats"] = repeats
+        result["rows_per_s"] = round(size / (result["p50_ms"] / 1000), 1)
+        results[str(size)] = result
+        print(f"  batch {size:>9}: p50 {result['p50_ms']:>10.3f} ms  p99 {result['p99_ms']:>10.3f} ms  "
+              f"{result['rows_per_s']:>12.0f} rows/s")
+    return results
+
+
+def bench_flask(requests: int, concurrency: int) -> dict:
+    forms = serving_load.load_forms(serving_load.ROOT / "artifacts/data_ingestion/data.zip", requests)
+
+    async def run():
+        port = serving_load.free_port()
+        process = serving_load.start_server("flask", port)
+        try:
+            url = f"http://127.0.0.1:{port}"
+            await serving_load.wait_ready(url)
+            return await serving_load.run_load(url, forms, concurrency)
+        finally:
+            process.terminate()
+            process.wait()
+
+    return asyncio.run(run())
+
+
+def flatten(results: dict) -> dict:
+    """Metric name -> (value, higher_is_better) for the baseline comparison."""
+    metrics = {}
+    for backend, result in results["backends"].items():
+        metrics[f"{backend}.cold_start.total_s"] = (result["cold_start"]["total_s"], False)
+        for size, latency in result["latency"].items():
+            metrics[f"{backend}.batch_{size}.p50_ms"] = (latency["p50_ms"], False)
+            metrics[f"{backend}.batch_{size}.p99_ms"] = (latency["p99_ms"], False)
+    if "flask" in results:
+        metrics["flask.throughput_rps"] = (results["flask"]["throughput_rps"], True)
+        metrics["flask.p99_ms"] = (results["flask"]["p99_ms"], False)
+    return metrics
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    base_metrics = flatten(baseline)
+    print(f"\n{'metric':<34}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, (value, higher_is_better) in flatten(current).items():
+        if name not in base_metrics or not base_metrics[name][0]:
+            print(f"{name:<34}{'-':>12}{value:>12.4g}{'new':>10}")
+            continue
+        base = base_metrics[name][0]
+        change = (value - base) / base
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<34}{base:>12.4g}{value:>12.4g}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def environment() -> dict:
+    import lightgbm
+    import pandas
+    import sklearn
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pandas.__version__,
+        "scikit-learn": sklearn.__version__,
+        "lightgbm": lightgbm.__version__,
+        "commit": commit,
+    }
+
+
+def main(args):
+    import importlib
+
+    source = load_source()
+    record = json.loads(synthetic_rows(source, 1, seed=args.seed).to_json(orient="records"))[0]
+    results = {"environment": environment(), "backends": {}}
+
+    for backend in args.backends:
+        print(f"{backend}:")
+        cold_start = bench_cold_start(backend, record, args.cold_start_runs)
+        print(f"  cold start: {cold_start['total_s']:.3f} s "
+              f"(import {cold_start['import_s']:.3f}, load {cold_start['load_s']:.3f}, "
+              f"first predict {cold_start['first_predict_s']:.3f})")
+        module, cls = PIPELINES[backend]
+        pipeline = getattr(importlib.import_module(module), cls)()
+        results["backends"][backend] = {
+            "cold_start": cold_start,
+            "latency": bench_latency(pipeline, source, args.sizes, args.seed),
+        }
+
+    if not args.skip_flask:
+        results["flask"] = bench_flask(args.flask_requests, args.concurrency)
+        print(f"flask /predict: {results['flask']['throughput_rps']} req/s, "
+              f"p99 {results['flask']['p99_ms']} ms at {args.concurrency} clients")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=4))
+    print(f"\nResults written to {output}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=4))
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}, run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metrics regressed by more than {args.tolerance:.0%}: {regressions}")
+        return 1 if args.fail_on_regression else 0
+    print(f"\nNo regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=list(PIPELINES), default=["sklearn"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 100, 10_000, 1_000_000])
+    parser.add_argument("--cold-start-runs", type=int, default=3)
+    parser.add_argument("--skip-flask", action="store_true")
+    parser.add_argument("--flask-requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,150 @@
+"""Load test: Flask /predict (app.py) vs the async micro-batching server (app_async.py).
+
+Sends the same form posts, built from rows of the ingested data, to both servers
+with a fixed number of concurrent clients and reports throughput and p50/p99
+latency.
+
+    python benchmarks/serving_load.py --requests 2000 --concurrency 64
+
+Servers are started on free local ports unless --flask-url/--async-url point
+at running ones.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from mlproject.pipeline.form_input import FORM_FIELDS
+from mlproject.utils.common import read_csv_source
+
+
+def load_forms(data_path: Path, n: int, seed: int = 42) -> list:
+    data = read_csv_source(data_path)
+    data["TotalCharges"] = pd.to_numeric(data["TotalCharges"], errors="coerce")
+    data = data.dropna(subset=["TotalCharges"])
+    sample = data.sample(n=n, replace=True, random_state=seed)
+    return [
+        {field: str(row[feature]) for field, (feature, _) in FORM_FIELDS.items()}
+        for row in sample.to_dict(orient="records")
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, port: int) -> subprocess.Popen:
+    if kind == "flask":
+        cmd = [sys.executable, "-c", f"import app; app.app.run(host='127.0.0.1', port={port})"]
+    else:
+        cmd = [sys.executable, "app_async.py", "--host", "127.0.0.1", "--port", str(port)]
+    return subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_ready(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url + "/") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"Server at {url} did not come up within {timeout}s")
+
+
+async def run_load(url: str, forms: list, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    next_form = iter(forms)
+
+    async def client(session):
+        nonlocal errors
+        for form in next_form:
+            start = time.perf_counter()
+            try:
+                async with session.post(url + "/predict", data=form) as response:
+                    body = await response.text()
+                    if response.status != 200 or "Error:" in body:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    async def warm_up(session):
+        async with session.post(url + "/predict", data=forms[0]) as response:
+            await response.read()
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Warm up connections and the model before timing
+        await asyncio.gather(*(warm_up(session) for _ in range(concurrency)))
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 2),
+    }
+
+
+async def main(args):
+    forms = load_forms(ROOT / args.data, args.requests)
+    targets = {"flask": args.flask_url, "async": args.async_url}
+    processes = []
+    results = {}
+    try:
+        for kind, url in targets.items():
+            if url is None:
+                port = free_port()
+                processes.append(start_server(kind, port))
+                targets[kind] = url = f"http://127.0.0.1:{port}"
+            await wait_ready(url)
+            results[kind] = await run_load(url, forms, args.concurrency)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    print(f"{'server':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for kind, result in results.items():
+        print(f"{kind:<8}{result['throughput_rps']:>10}{result['p50_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--data", default="artifacts/data_ingestion/data.zip")
+    parser.add_argument("--flask-url", default=None)
+    parser.add_argument("--async-url", default=None)
+    parser.add_argument("--output", default=None, help="write the results as JSON")
+    asyncio.run(main(parser.parse_args()))
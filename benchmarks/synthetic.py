@@ -0,0 +1,42 @@
+"""Synthetic telecom customers drawn from the bundled Tele_Comm.csv.
+
+Rows are bootstrapped from the real data, so every categorical combination
+and the class balance stay realistic. The numeric columns are jittered so
+that large samples are not just copies of the 7k originals.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from mlproject.utils.common import read_csv_source
+
+DEFAULT_SOURCE = ROOT / "artifacts" / "data_ingestion" / "data.zip"
+
+
+def load_source(path: Path = DEFAULT_SOURCE) -> pd.DataFrame:
+    data = read_csv_source(path)
+    data["TotalCharges"] = pd.to_numeric(data["TotalCharges"], errors="coerce")
+    return data.dropna(subset=["TotalCharges"]).reset_index(drop=True)
+
+
+def synthetic_rows(source: pd.DataFrame, n: int, seed: int = 42, with_target: bool = False) -> pd.DataFrame:
+    """`n` rows in the raw schema, bootstrapped from `source` with jittered numerics."""
+    rng = np.random.default_rng(seed)
+    rows = source.iloc[rng.integers(0, len(source), size=n)].reset_index(drop=True)
+
+    tenure = np.clip(rows["tenure"].to_numpy() + rng.integers(-3, 4, size=n), 0, 72)
+    monthly = np.clip(rows["MonthlyCharges"].to_numpy() * rng.normal(1.0, 0.05, size=n), 18.0, 120.0).round(2)
+    rows["tenure"] = tenure
+    rows["MonthlyCharges"] = monthly
+    rows["TotalCharges"] = np.maximum(monthly, monthly * tenure * rng.normal(1.0, 0.03, size=n)).round(2)
+    rows["customerID"] = [f"SYN-{seed}-{i:09d}" for i in range(n)]
+
+    if not with_target:
+        rows = rows.drop(columns=["Churn"])
+    return rows
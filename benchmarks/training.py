@@ -0,0 +1,294 @@
+"""Training stage benchmarks on synthetic datasets at multiples of the bundled data.
+
+For every scale, a synthetic Tele_Comm.csv with scale x 7k rows is written
+(see synthetic.py) and these stages run on it, each in a fresh interpreter:
+
+  * data_transformation: feature pipeline fit, split, balancing, scaling
+  * model_training: LightGBM fit on the transformed features
+  * model_evaluation: preprocess + predict + metrics on the test split,
+    with experiment tracking switched off
+
+Each run records wall time, peak RSS of the stage process and the size of
+what it wrote. The table shows the scaling exponent k of wall time ~ rows^k
+between consecutive scales.
+
+    python benchmarks/training.py                          # 10x, 100x, 1000x
+    python benchmarks/training.py --scales 1 10 --plot
+    python benchmarks/training.py --scales 1000 --streaming --chunksize 200000
+    python benchmarks/training.py --scales 100 --balancing undersample
+
+A stage that fails (e.g. killed for running out of memory) is recorded with
+its exit code and the later stages of that scale are skipped.
+"""
+import argparse
+import dataclasses
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import ROOT, load_source, synthetic_rows
+
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "training.json"
+STAGES = ["data_transformation", "model_training", "model_evaluation"]
+# Directory each stage writes into, relative to the scale's work directory
+OUTPUT_DIRS = {
+    "data_transformation": "data_transformation",
+    "model_training": "model_trainer",
+    "model_evaluation": "model_evaluation",
+}
+GENERATE_BATCH = 200_000
+
+
+def dir_size_mb(path: Path) -> float:
+    if not path.exists():
+        return 0.0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / (1024 * 1024)
+
+
+def generate_dataset(source, rows: int, path: Path, seed: int):
+    """Writes `rows` synthetic customers in the raw CSV layout, batch by batch."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, "w", newline="") as f:
+        while written < rows:
+            n = min(GENERATE_BATCH, rows - written)
+            batch = synthetic_rows(source, n, seed=seed + written, with_target=True)
+            batch.to_csv(f, index=False, header=written == 0)
+            written += n
+
+
+def stage_configs(workdir: Path, streaming: bool, chunksize: int, balancing: str = None) -> dict:
+    """The pipeline's own configs with every path moved into `workdir`, and `balancing` as the strategy if given."""
+    from mlproject.config.config import ConfigurationManager
+
+    manager = ConfigurationManager()
+    transform_dir = workdir / "data_transformation"
+    trainer_dir = workdir / "model_trainer"
+    evaluation_dir = workdir / "model_evaluation"
+    for path in (transform_dir, trainer_dir, evaluation_dir):
+        path.mkdir(parents=True, exist_ok=True)
+
+    transformation = manager.get_data_transformation_config()
+    transformation = dataclasses.replace(
+        transformation,
+        root_dir=transform_dir,
+        data_path=workdir / "data.csv",
+        feature_pipeline_path=transform_dir / "feature_pipeline.npz",
+        streaming=streaming,
+        chunksize=chunksize or transformation.chunksize,
+        balancing=dataclasses.replace(transformation.balancing,
+                                      strategy=balancing or transformation.balancing.strategy),
+    )
+    trainer = manager.get_model_trainer_config()
+    tuned = trainer.tuned_params_path
+    trainer = dataclasses.replace(
+        trainer,
+        root_dir=trainer_dir,
+        train_data_path=transform_dir / "train_features.npy",
+        train_target_path=transform_dir / "train_target.npy",
+        test_data_path=transform_dir / "test_features.npy",
+        test_target_path=transform_dir / "test_target.npy",
+        # Tuned params when the pipeline has produced them, params.yaml otherwise
+        tuned_params_path=tuned if tuned is not None and Path(tuned).exists() else None,
+        class_weight="balanced" if transformation.balancing.strategy == "class_weight" else None,
+    )
+    evaluation = manager.get_model_evaluation_config()
+    evaluation = dataclasses.replace(
+        evaluation,
+        root_dir=evaluation_dir,
+        test_raw_data=transform_dir / "test.parquet",
+        model_path=trainer_dir / trainer.model_name,
+        feature_pipeline_path=transform_dir / "feature_pipeline.npz",
+        metric_file_path=evaluation_dir / "metrics.json",
+        report_path=evaluation_dir / "evaluation_report.json",
+        predictions_path=evaluation_dir / "predictions.parquet",
+        reuse_predictions=False,
+        # Experiment tracking measures the tracking store rather than us
+        tracking=dataclasses.replace(evaluation.tracking, backend="none"),
+    )
+    return {"data_transformation": transformation, "model_training": trainer, "model_evaluation": evaluation}
+
+
+def run_stage(name: str, workdir: Path, streaming: bool, chunksize: int, balancing: str = None):
+    """Child side: runs one stage and prints its timing on a BENCH_RESULT line."""
+    from mlproject.utils.common import get_peak_rss_mb
+
+    # Imports stay outside the timed section
+    if name == "data_transformation":
+        from mlproject.components.data_transformation import DataTransformation
+    elif name == "model_training":
+        from mlproject.components.data_modeltraining import ModelTrainer
+    else:
+        from mlproject.components.data_modelevaluation import ModelEvaluation
+
+    config = stage_configs(workdir, streaming, chunksize, balancing)[name]
+    start = time.perf_counter()
+    if name == "data_transformation":
+        transformation = DataTransformation(config)
+        if config.streaming:
+            transformation.streaming_transform()
+        else:
+            train, test = transformation.train_test_spliting()
+            transformation.preprocess_features(train, test)
+    elif name == "model_training":
+        ModelTrainer(config).train()
+    else:
+        ModelEvaluation(config).evaluate()
+    wall = time.perf_counter() - start
+    print("BENCH_RESULT " + json.dumps({"wall_s": wall, "peak_rss_mb": get_peak_rss_mb()}))
+
+
+def bench_stage(name: str, workdir: Path, args) -> dict:
+    command = [sys.executable, str(Path(__file__).resolve()), "--run-stage", name, "--workdir", str(workdir),
+               "--chunksize", str(args.chunksize)]
+    if args.streaming:
+        command.append("--streaming")
+    if args.balancing:
+        command += ["--balancing", args.balancing]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT), str(ROOT / "src")]))
+    process = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    lines = [line for line in process.stdout.splitlines() if line.startswith("BENCH_RESULT ")]
+    if process.returncode != 0 or not lines:
+        return {"status": "failed", "returncode": process.returncode,
+                "error": process.stderr.strip().splitlines()[-1:] or None}
+    result = json.loads(lines[-1][len("BENCH_RESULT "):])
+    return {
+        "status": "ok",
+        "wall_s": round(result["wall_s"], 3),
+        "peak_rss_mb": round(result["peak_rss_mb"], 1),
+        "output_mb": round(dir_size_mb(workdir / OUTPUT_DIRS[name]), 2),
+    }
+
+
+def scaling_exponents(runs: list, stage: str) -> list:
+    """log(wall ratio) / log(rows ratio) between consecutive scales, None where a run failed."""
+    exponents = [None]
+    for previous, current in zip(runs, runs[1:]):
+        a, b = previous["stages"].get(stage, {}), current["stages"].get(stage, {})
+        if a.get("status") == "ok" and b.get("status") == "ok" and a["wall_s"] > 0:
+            exponents.append(round(math.log(b["wall_s"] / a["wall_s"]) / math.log(current["rows"] / previous["rows"]), 2))
+        else:
+            exponents.append(None)
+    return exponents
+
+
+def print_table(runs: list, stages: list):
+    print(f"\n{'stage':<20}{'scale':>7}{'rows':>11}{'wall s':>10}{'rows/s':>11}{'peak MB':>10}{'out MB':>10}{'k':>7}")
+    for stage in stages:
+        for run, k in zip(runs, scaling_exponents(runs, stage)):
+            result = run["stages"].get(stage, {"status": "skipped"})
+            if result["status"] != "ok":
+                print(f"{stage:<20}{run['scale']:>6g}x{run['rows']:>11}  {result['status']}")
+                continue
+            rate = run["rows"] / result["wall_s"] if result["wall_s"] else float("inf")
+            print(f"{stage:<20}{run['scale']:>6g}x{run['rows']:>11}{result['wall_s']:>10.2f}{rate:>11.0f}"
+                  f"{result['peak_rss_mb']:>10.0f}{result['output_mb']:>10.1f}{'-' if k is None else k:>7}")
+
+
+def plot(runs: list, stages: list, path: Path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, skipping the plot")
+        return
+
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4.5))
+    for metric, label, ax in (("wall_s", "wall time (s)", axes[0]), ("peak_rss_mb", "peak RSS (MB)", axes[1]),
+                              ("output_mb", "output size (MB)", axes[2])):
+        for stage in stages:
+            points = [(run["rows"], run["stages"][stage][metric]) for run in runs
+                      if run["stages"].get(stage, {}).get("status") == "ok"]
+            if points:
+                ax.plot(*zip(*points), marker="o", label=stage)
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("rows")
+        ax.set_ylabel(label)
+        ax.grid(True, which="both", alpha=0.3)
+    axes[0].legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    print(f"Plot written to {path}")
+
+
+def main(args):
+    if args.run_stage:
+        run_stage(args.run_stage, Path(args.workdir), args.streaming, args.chunksize, args.balancing)
+        return 0
+
+    source = load_source()
+    base_rows = len(source)
+    root = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="churnshield-bench-"))
+    runs = []
+    for scale in sorted(args.scales):
+        rows = int(base_rows * scale)
+        workdir = root / f"scale_{scale:g}"
+        print(f"{scale:g}x ({rows} rows):")
+        start = time.perf_counter()
+        generate_dataset(source, rows, workdir / "data.csv", args.seed)
+        run = {
+            "scale": scale,
+            "rows": rows,
+            "input_mb": round(dir_size_mb(workdir), 2),
+            "generate_s": round(time.perf_counter() - start, 3),
+            "stages": {},
+        }
+        print(f"  dataset: {run['input_mb']:.1f} MB in {run['generate_s']:.1f} s")
+
+        for stage in args.stages:
+            result = bench_stage(stage, workdir, args)
+            run["stages"][stage] = result
+            if result["status"] != "ok":
+                print(f"  {stage}: failed with exit code {result['returncode']}: {result['error']}")
+                break
+            print(f"  {stage}: {result['wall_s']:.2f} s, peak RSS {result['peak_rss_mb']:.0f} MB, "
+                  f"output {result['output_mb']:.1f} MB")
+        runs.append(run)
+        if not args.keep_data:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if not args.keep_data and not args.workdir:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print_table(runs, args.stages)
+    results = {
+        "base_rows": base_rows,
+        "streaming": args.streaming,
+        "balancing": args.balancing,
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+        "scaling_exponents": {stage: scaling_exponents(runs, stage) for stage in args.stages},
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=4))
+    print(f"\nResults written to {output}")
+    if args.plot:
+        plot(runs, args.stages, output.with_suffix(".png"))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", type=float, default=[10, 100, 1000],
+                        help="dataset sizes as multiples of the bundled data")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--streaming", action="store_true", help="benchmark the bounded-memory transformation")
+    parser.add_argument("--chunksize", type=int, default=0, help="streaming chunk size, 0 keeps config.yaml's")
+    parser.add_argument("--balancing", choices=["smote", "undersample", "class_weight", "none"],
+                        help="balancing strategy, params.yaml's by default")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="where datasets and stage outputs go, a temporary directory by default")
+    parser.add_argument("--keep-data", action="store_true", help="keep the generated datasets and stage outputs")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--plot", action="store_true", help="also write a log-log plot next to the JSON (matplotlib)")
+    parser.add_argument("--run-stage", choices=STAGES, help=argparse.SUPPRESS)
+    sys.exit(main(parser.parse_args()))
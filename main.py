@@ -1,61 +1,40 @@
-from src.mlproject.pipeline.stage1_data_ingestion import DataIngestionTrainingPipeline
-from src.mlproject.pipeline.stage2_data_validation import DataValidationTrainingPipeline
-from src.mlproject.pipeline.stage3_data_transformation import DataTransformationTrainingPipeline
-from src.mlproject.pipeline.stage4_modeltraining import ModelTrainerTrainingPipeline
-from src.mlproject.pipeline.stage5_data_evalution import ModelEvaluationTrainingPipeline
+import argparse
+from src.mlproject.config.config import ConfigurationManager
+from src.mlproject.pipeline.stages import STAGES, get_stage, select_stages
+from src.mlproject.pipeline.executor import PipelineExecutor
 from mlproject import logger
 
 
-STAGE_NAME = "Data Ingestion stage"
-try:
-   logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-   data_ingestion = DataIngestionTrainingPipeline()
-   data_ingestion.main()
-   logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-STAGE_NAME = "Data Validation stage"
-try:
-   logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-   data_ingestion = DataValidationTrainingPipeline()
-   data_ingestion.main()
-   logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-STAGE_NAME = "Data Transformation stage"
-try:
-   logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-   data_ingestion = DataTransformationTrainingPipeline()
-   data_ingestion.main()
-   logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-STAGE_NAME = "Model Trainer stage"
-try:
-   logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-   data_ingestion = ModelTrainerTrainingPipeline()
-   data_ingestion.main()
-   logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-STAGE_NAME = "Model Evaluation stage"
-try:
-   logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-   data_ingestion = ModelEvaluationTrainingPipeline()
-   data_ingestion.main()
-   logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-        logger.exception(e)
-        raise e
+def main(args):
+   config = ConfigurationManager()
+   executor_config = config.get_pipeline_executor_config()
+
+   names, forced = select_stages(args.stage, args.from_stage, args.force)
+
+   executor = PipelineExecutor(
+      stages=[get_stage(name) for name in names],
+      max_workers=args.workers or executor_config.max_workers,
+      forced=forced,
+      use_cache=not args.no_cache,
+      report_path=executor_config.timing_report,
+   )
+   try:
+      executor.run()
+   except Exception as e:
+      logger.exception(e)
+      raise e
+
+
+if __name__ == "__main__":
+   parser = argparse.ArgumentParser(description="Run the churn training pipeline, skipping stages whose inputs have not changed")
+   parser.add_argument("--stage", action="append", choices=[stage.name for stage in STAGES],
+                       help="run only this stage (repeatable); the others are left as they are")
+   parser.add_argument("--from-stage", choices=[stage.name for stage in STAGES],
+                       help="re-run this stage and every stage downstream of it")
+   parser.add_argument("--force", nargs="*", metavar="STAGE",
+                       help="re-run the named stages, or every stage if none are named, even when cached")
+   parser.add_argument("--no-cache", action="store_true",
+                       help="ignore and do not write stage manifests")
+   parser.add_argument("--workers", type=int, default=None,
+                       help="stages run in parallel at most (default: pipeline_executor.max_workers)")
+   main(parser.parse_args())
@@ -25,5 +25,8 @@ setuptools.setup(
         "Bug Tracker": f"https://github.com/{AUTHOR_USER_NAME}/{REPO_NAME}/issues",
     },
     package_dir={"": "src"},
-    packages=setuptools.find_packages(where="src")
+    packages=setuptools.find_packages(where="src"),
+    entry_points={
+        "console_scripts": ["churnshield=mlproject.cli:main"],
+    },
 )
\ No newline at end of file
@@ -1,28 +1,14 @@
-import os
-import sys
 import logging
 
-logging_str = "[%(asctime)s : %(levelname)s : %(module)s : %(message)s]"
+from .utils.logging_setup import default_handlers
 
-# Create the logs directory if it does not exist
-log_dir = "logs"
-log_filepath = os.path.join(log_dir, "running.log")
-os.makedirs(log_dir, exist_ok=True)
-
-# Create handlers
-file_handler = logging.FileHandler(log_filepath)
-stream_handler = logging.StreamHandler(sys.stdout)
-
-# Set the logging format for each handler
-formatter = logging.Formatter(logging_str)
-file_handler.setFormatter(formatter)
-stream_handler.setFormatter(formatter)
-
-# Get the logger and configure it
+# Get the logger and configure it. The package is importable both as
+# `mlproject` and `src.mlproject`, so only the first import adds handlers.
+# Nothing is written to disk until the first record: logs/running.log is
+# created on demand. Serving apps switch to queued, rotating handlers
+# with configure_logging.
 logger = logging.getLogger('mlproject')
-logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
-logger.addHandler(stream_handler)
-
-# Test the logger
-logger.info("Logger has been set up successfully!")
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    for handler in default_handlers():
+        logger.addHandler(handler)
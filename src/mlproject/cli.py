@@ -0,0 +1,63 @@
+"""`churnshield` command line, installed by setup.py.
+
+    churnshield score --input subscribers.csv --output scores.parquet
+    churnshield score --input data.zip --output scores.parquet --workers 8 --chunksize 200000
+
+Run it from the project directory, like main.py: config/config.yaml and the
+artifacts are read from there.
+"""
+import argparse
+import dataclasses
+import sys
+
+
+def score(args) -> int:
+    from mlproject.config.config import ConfigurationManager
+    from mlproject.pipeline.batch_scoring import BatchScorer
+
+    config = ConfigurationManager().get_batch_scoring_config()
+    prediction = config.prediction
+    if args.backend:
+        prediction = dataclasses.replace(prediction, backend=args.backend)
+    config = dataclasses.replace(
+        config,
+        prediction=prediction,
+        chunksize=args.chunksize or config.chunksize,
+        n_workers=config.n_workers if args.workers is None else args.workers,
+        keep_columns=config.keep_columns if args.keep_columns is None else args.keep_columns,
+    )
+    BatchScorer(config, probabilities_only=args.probabilities_only).score(args.input, args.output,
+                                                                          restart=args.restart)
+    return 0
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="churnshield", description="ChurnShield churn model tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score_parser = commands.add_parser(
+        "score", help="score a large CSV file into a parquet file",
+        description="Scores a CSV (or a .zip holding one) chunk by chunk on a process pool. Output rows keep "
+                    "the input order. An interrupted run resumes from its checkpoints when started again.")
+    score_parser.add_argument("--input", required=True, help="subscriber CSV, or a .zip holding one")
+    score_parser.add_argument("--output", required=True, help="parquet file to write the scores to")
+    score_parser.add_argument("--chunksize", type=int, default=0,
+                              help="rows per chunk, 0 keeps batch_scoring.chunksize")
+    score_parser.add_argument("--workers", type=int, default=None,
+                              help="scoring processes, 0 for one per CPU (default: batch_scoring.n_workers)")
+    score_parser.add_argument("--backend", choices=["sklearn", "bundle"],
+                              help="prediction backend (default: prediction.backend)")
+    score_parser.add_argument("--keep-columns", nargs="*", default=None, metavar="COLUMN",
+                              help="input columns copied next to the scores (default: batch_scoring.keep_columns)")
+    score_parser.add_argument("--probabilities-only", action="store_true",
+                              help="write churn_probability only, without churn_status")
+    score_parser.add_argument("--restart", action="store_true",
+                              help="discard the checkpoints of an earlier run instead of resuming")
+    score_parser.set_defaults(func=score)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,13 @@
 import os
+import time
+import shutil
 import urllib.request as request
+from urllib.error import HTTPError, URLError
+from http.client import HTTPException
 import zipfile
 from mlproject import logger
-from src.mlproject.utils.common import get_size
+from src.mlproject.utils.common import get_size, get_zip_member
+from src.mlproject.utils.stage_cache import hash_file
 from pathlib import Path
 from src.mlproject.entities.config_entity import (DataIngestionConfig)
 
@@ -12,26 +17,105 @@ class DataIngestion:
         self.config = config
 
 
-    
+    def verify_checksum(self, path: Path) -> bool:
+        """True when `path` matches the configured sha256, or when none is configured."""
+        if not self.config.sha256:
+            logger.warning(f"No sha256 configured for {path}, skipping the integrity check")
+            return True
+        digest = hash_file(path)
+        if digest != self.config.sha256:
+            logger.error(f"Checksum mismatch for {path}: expected {self.config.sha256}, got {digest}")
+            return False
+        return True
+
+
+    def stream_download(self, part_path: Path) -> int:
+        """Streams the source into `part_path`, resuming from its current size with an HTTP Range request.
+
+        Returns:
+            int: size of the partial file when the transfer ended
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        req = request.Request(self.config.source_URL, headers=headers)
+        try:
+            response = request.urlopen(req, timeout=self.config.timeout)
+        except HTTPError as e:
+            # The part file already holds the whole resource
+            if e.code == 416 and offset:
+                return offset
+            raise
+
+        with response:
+            if offset and response.status != 206:
+                logger.info("Server ignored the Range header, restarting the download")
+                offset = 0
+            elif offset:
+                logger.info(f"Resuming download at byte {offset}")
+
+            # On a 206 Content-Length covers only the requested range
+            expected = response.headers.get("Content-Length")
+            received = 0
+            with open(part_path, "ab" if offset else "wb") as f:
+                while True:
+                    chunk = response.read(self.config.chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    received += len(chunk)
+            offset += received
+
+        if expected is not None and received < int(expected):
+            raise HTTPException(f"Connection closed after {received} of {expected} bytes")
+        return offset
+
+
     def download_file(self):
-        if not os.path.exists(self.config.local_data_file):
-            filename, headers = request.urlretrieve(
-                url = self.config.source_URL,
-                filename = self.config.local_data_file
-            )
-            logger.info(f"{filename} download! with following info: \n{headers}")
-        else:
-            logger.info(f"File already exists of size: {get_size(Path(self.config.local_data_file))}")
+        local_path = Path(self.config.local_data_file)
+        if local_path.exists():
+            if self.verify_checksum(local_path):
+                logger.info(f"File already exists of size: {get_size(local_path)}")
+                return
+            logger.warning(f"Discarding {local_path}, downloading it again")
+            local_path.unlink()
+
+        part_path = local_path.with_name(local_path.name + ".part")
+        for attempt in range(1, self.config.retries + 1):
+            try:
+                size = self.stream_download(part_path)
+                break
+            except (URLError, HTTPException, ConnectionError, TimeoutError) as e:
+                # Client errors will not go away on a retry
+                if isinstance(e, HTTPError) and e.code < 500:
+                    raise
+                if attempt == self.config.retries:
+                    raise
+                logger.warning(f"Download attempt {attempt} failed ({e!r}), retrying from the partial file")
+                time.sleep(min(2 ** attempt, 30))
+
+        if not self.verify_checksum(part_path):
+            part_path.unlink()
+            raise ValueError(f"Downloaded {self.config.source_URL} does not match the configured sha256")
+        os.replace(part_path, local_path)
+        logger.info(f"{local_path} downloaded from {self.config.source_URL} ({size} bytes)")
 
 
 
     def extract_zip_file(self):
         """
-        zip_file_path: str
-        Extracts the zip file into the data directory
-        Function returns None
+        Streams the CSV out of the zip file into the data directory.
+        Skipped unless `extract` is set: later stages read the CSV
+        straight from the archive.
         """
+        if not self.config.extract:
+            logger.info(f"Extraction disabled, stages read the CSV from {self.config.local_data_file}")
+            return
+
         unzip_path = self.config.unzip_dir
         os.makedirs(unzip_path, exist_ok=True)
         with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
-            zip_ref.extractall(unzip_path)
\ No newline at end of file
+            member = get_zip_member(zip_ref)
+            target = Path(unzip_path) / Path(member).name
+            with zip_ref.open(member) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, self.config.chunk_size)
+        logger.info(f"Extracted {member} to {target}")
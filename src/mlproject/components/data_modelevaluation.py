@@ -1,105 +1,185 @@
 import os
 import pandas as pd
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from urllib.parse import urlparse
 import numpy as np
-import mlflow
-from mlflow.models import infer_signature
-import mlflow.lightgbm
-import mlflow.sklearn
-import dagshub
 import joblib
+import pyarrow as pa
+import pyarrow.parquet as pq
 from src.mlproject.entities.config_entity import ModelEvaluationConfig
-from src.mlproject.utils.common import save_json
+from src.mlproject.utils.classification_metrics import BinaryEvaluator, predict_positive
+from src.mlproject.utils.common import get_artifact_version
+from src.mlproject.utils.feature_pipeline import feature_pipeline_paths, load_feature_pipeline
+from src.mlproject.utils.tracking import get_tracker
 from pathlib import Path
 from mlproject import logger
 import json
+import time
 
 
+MODEL_ARTIFACT_NAME = "TelecomCustomerChurnModel"
+
 
 class ModelEvaluation:
     def __init__(self, config: ModelEvaluationConfig):
         self.config = config
 
-
-        dagshub.init(
-            repo_owner="JavithNaseem-J",
-            repo_name="ChurnShield"
-        )
-        mlflow.set_tracking_uri(
-            "https://dagshub.com/JavithNaseem-J/ChurnShield.mlflow"
-        )
-        mlflow.set_experiment("Telecom-Customer-Churn-Prediction")
+    def get_predictions_version(self) -> str:
+        """Version of the inputs and decision threshold the stored predictions were computed from."""
+        version = get_artifact_version([Path(self.config.model_path), *self.get_feature_pipeline_paths(),
+                                        Path(self.config.test_raw_data)])
+        return f"{version}@{self.config.decision_threshold}"
+
+    def get_feature_pipeline_paths(self) -> list:
+        return feature_pipeline_paths(self.config.feature_pipeline_path, self.config.preprocessor_path,
+                                      self.config.label_encoder)
+
+    def load_predictions(self):
+        """Stored test-set predictions, or None when missing, disabled or computed from other artifacts."""
+        path = Path(self.config.predictions_path)
+        if not self.config.reuse_predictions or not path.exists():
+            return None
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(b"artifact_version", b"").decode() != self.get_predictions_version():
+            logger.info(f"Stored predictions at {path} are from other artifacts, rescoring")
+            return None
+        logger.info(f"Reusing test-set predictions from {path}")
+        return pd.read_parquet(path)
+
+    def save_predictions(self, predictions: pd.DataFrame):
+        table = pa.Table.from_pandas(predictions, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"artifact_version"] = self.get_predictions_version().encode()
+        path = Path(self.config.predictions_path)
+        os.makedirs(path.parent, exist_ok=True)
+        pq.write_table(table.replace_schema_metadata(metadata), path, compression='zstd')
+        logger.info(f"Test-set predictions saved to {path}")
+
+    def score_test_data(self) -> tuple:
+        """Scores the held-out test split and persists the predictions.
+
+        Returns:
+            tuple: model, transformed test features, predictions DataFrame
+                   with `label`, `prediction` and `probability` columns
+        """
+        if not Path(self.config.test_raw_data).exists():
+            raise FileNotFoundError(f"Test data not found at {self.config.test_raw_data}")
+        if not Path(self.config.model_path).exists():
+            raise FileNotFoundError(f"Model not found at {self.config.model_path}")
+
+        logger.info("Loading feature pipeline and model...")
+        feature_pipeline = load_feature_pipeline(self.config.feature_pipeline_path, self.config.preprocessor_path,
+                                         self.config.label_encoder, self.config.cat_cols, self.config.target_column)
+        model = joblib.load(self.config.model_path)
+
+        # Load and prepare test data
+        logger.info(f"Loading test data from {self.config.test_raw_data}...")
+        test_data = pd.read_parquet(self.config.test_raw_data)
+        target_column = self.config.target_column
+
+        if target_column not in test_data.columns:
+            raise KeyError(f"Target column '{target_column}' not found in test data.")
+
+        test_y = test_data[target_column]
+        test_x = test_data.drop(columns=[target_column])
+        logger.info(f"Test data shape: X={test_x.shape}, y={test_y.shape}")
+
+        logger.info("Preprocessing test features...")
+        test_x_transformed = feature_pipeline.transform(test_x)
+
+        logger.info("Making predictions...")
+        probabilities = model.predict_proba(test_x_transformed)[:, -1]
+        positive = predict_positive(probabilities, self.config.decision_threshold)
+        predictions = pd.DataFrame({
+            "label": test_y.to_numpy(),
+            "prediction": model.classes_[positive.astype(int)],
+            "probability": probabilities,
+        })
+        self.save_predictions(predictions)
+        return model, test_x_transformed, predictions
+
+    def compute_metrics(self, predictions: pd.DataFrame) -> dict:
+        """Metrics from stored predictions, saved to metrics.json and the evaluation report.
+
+        Everything is computed by BinaryEvaluator from one sort of the
+        churn probabilities. metrics.json keeps the scalar metrics; the
+        threshold sweep, calibration bins, lift table and bootstrap
+        intervals go to report_path.
+        """
+        logger.info("Evaluating model performance...")
+        start = time.perf_counter()
+        evaluator = BinaryEvaluator(predictions["label"].to_numpy(), predictions["probability"].to_numpy())
+        at_threshold = evaluator.at_threshold(self.config.decision_threshold)
+        calibration = evaluator.calibration(self.config.calibration_bins)
+
+        metrics = {
+            "accuracy": at_threshold["accuracy"],
+            "precision": at_threshold["precision"],
+            "recall": at_threshold["recall"],
+            "f1": at_threshold["f1"],
+            "roc_auc": evaluator.roc_auc(),
+            "pr_auc": evaluator.average_precision(),
+            "brier": calibration["brier"],
+            "log_loss": calibration["log_loss"],
+            "ece": calibration["ece"],
+        }
+        report = {
+            "rows": evaluator.n,
+            "positives": evaluator.n_pos,
+            "decision_threshold": self.config.decision_threshold,
+            "metrics": metrics,
+            "at_threshold": at_threshold,
+            "threshold_sweep": evaluator.threshold_sweep(self.config.n_thresholds),
+            "calibration": calibration["bins"],
+            "lift": evaluator.lift(self.config.lift_groups),
+        }
+        if self.config.n_bootstrap:
+            report["bootstrap"] = {
+                "n_resamples": self.config.n_bootstrap,
+                "confidence_level": self.config.confidence_level,
+                "intervals": evaluator.bootstrap(self.config.n_bootstrap, self.config.confidence_level,
+                                                 self.config.decision_threshold, self.config.random_state),
+            }
+        logger.info(f"Metrics computed in {time.perf_counter() - start:.3f} s")
+
+        logger.info(f"Evaluation Metrics:\n{json.dumps(metrics, indent=2)}")
+        metrics_file = Path(self.config.metric_file_path)
+        with open(metrics_file, "w") as f:
+            json.dump(metrics, f, indent=4)
+        logger.info(f"Metrics saved to {metrics_file}")
+
+        report_file = Path(self.config.report_path)
+        with open(report_file, "w") as f:
+            json.dump(report, f, indent=4, default=lambda value: value.tolist())
+        logger.info(f"Evaluation report saved to {report_file}")
+
+        return metrics
 
     def evaluate(self):
-            mlflow.lightgbm.autolog()
-
-            if not Path(self.config.test_raw_data).exists():
-                raise FileNotFoundError(f"Test data not found at {self.config.test_raw_data}")
-            if not Path(self.config.preprocessor_path).exists():
-                raise FileNotFoundError(f"Preprocessor not found at {self.config.preprocessor_path}")
-            if not Path(self.config.model_path).exists():
-                raise FileNotFoundError(f"Model not found at {self.config.model_path}")
-
-            with mlflow.start_run():
-                mlflow.set_tag("model_type", "CatBoostClassifier")
-                mlflow.set_tag("evaluation_stage", "testing")
-
-                logger.info("Loading preprocessor and model...")
-                preprocessor = joblib.load(self.config.preprocessor_path)
+        tracker = get_tracker(self.config.tracking)
+        try:
+            predictions = self.load_predictions()
+            features = None
+            if predictions is None:
+                model, features, predictions = self.score_test_data()
+            else:
                 model = joblib.load(self.config.model_path)
 
-
-                # Load and prepare test data
-                logger.info(f"Loading test data from {self.config.test_raw_data}...")
-                test_data = pd.read_csv(self.config.test_raw_data)
-                target_column = self.config.target_column
-
-                if target_column not in test_data.columns:
-                    raise KeyError(f"Target column '{target_column}' not found in test data.")
-
-                test_y = test_data[target_column]
-                test_x = test_data.drop(columns=[target_column])
-                logger.info(f"Test data shape: X={test_x.shape}, y={test_y.shape}")
-
-                logger.info("Preprocessing test features...")
-                test_x_transformed = preprocessor.transform(test_x)
-
-                logger.info("Making predictions...")
-                predictions = model.predict(test_x_transformed)
-
-                logger.info("Evaluating model performance...")
-
-                precision = precision_score(test_y, predictions, average="weighted")
-
-                recall = recall_score(test_y, predictions, average="weighted")
-                
-                f1 = f1_score(test_y, predictions, average="weighted")
-
-                metrics = {
-                    "accuracy": accuracy_score(test_y, predictions),
-                    "precision": precision,
-                    "recall": recall,
-                    "f1": f1
-                }
-
-                mlflow.log_metrics(metrics)
-
-                signature = infer_signature(test_x_transformed, predictions)
-                mlflow.sklearn.log_model(
-                    model,
-                    artifact_path="TelecomCustomerChurnModel",
-                    signature=signature,
-                    registered_model_name="TelecomCustomerChurnModel"
-                )
-
-                logger.info(f"Evaluation Metrics:\n{json.dumps(metrics, indent=2)}")
-                metrics_file = Path(self.config.root_dir) / "metrics.json"
-                with open(metrics_file, "w") as f:
-                    json.dump(metrics, f, indent=4)
-                logger.info(f"Metrics saved to {metrics_file}")
-
-                return metrics
-
-
-    
+            tracker.start_run(tags={"model_type": type(model).__name__,
+                                    "evaluation_stage": "testing",
+                                    "predictions_reused": features is None})
+            tracker.log_params(dict(self.config.all_params))
+            # Queued first, so the model upload overlaps the metric computation
+            tracker.log_model(model, MODEL_ARTIFACT_NAME, features, predictions["prediction"].to_numpy())
+
+            metrics = self.compute_metrics(predictions)
+            tracker.log_metrics(metrics)
+            tracker.log_artifact(Path(self.config.metric_file_path))
+            tracker.log_artifact(Path(self.config.report_path))
+            tracker.log_artifact(Path(self.config.predictions_path))
+            tracker.end_run()
+        except Exception:
+            tracker.end_run("FAILED")
+            raise
+        finally:
+            tracker.close()
+
+        return metrics
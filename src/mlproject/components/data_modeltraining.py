@@ -1,51 +1,61 @@
-import pandas as pd
 import os
 from mlproject import logger
 import joblib
 from lightgbm import LGBMClassifier
-import numpy as np
 from src.mlproject.entities.config_entity import ModelTrainerConfig
+from src.mlproject.utils.common import load_features, load_json
+from pathlib import Path
 
 class ModelTrainer:
     def __init__(self, config: ModelTrainerConfig):
         self.config = config
 
-    def train(self):
-        if not os.path.exists(self.config.train_data_path):
-            raise FileNotFoundError(f"Training data file not found at {self.config.train_data_path}")
-        if not os.path.exists(self.config.test_data_path):
-            raise FileNotFoundError(f"Testing data file not found at {self.config.test_data_path}")
-
-        train_data = np.load(self.config.train_data_path, allow_pickle=True)
-        test_data = np.load(self.config.test_data_path, allow_pickle=True)
+    def load_tuned_params(self) -> dict:
+        """Best params from the tuning stage, empty when tuning is disabled."""
+        if self.config.tuned_params_path is None:
+            return {}
+        if not os.path.exists(self.config.tuned_params_path):
+            raise FileNotFoundError(f"Tuned params not found at {self.config.tuned_params_path}, "
+                                    "run the model_tuning stage or set tuning.enabled: false")
+        tuned_params = load_json(Path(self.config.tuned_params_path)).params.to_dict()
+        logger.info(f"Using tuned params from {self.config.tuned_params_path}: {tuned_params}")
+        return tuned_params
 
-        logger.info(f"Loaded train data: type={type(train_data)}, shape={train_data.shape}")
-        logger.info(f"Loaded test data: type={type(test_data)}, shape={test_data.shape}")
+    def train(self):
+        for path in (self.config.train_data_path, self.config.train_target_path,
+                     self.config.test_data_path, self.config.test_target_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Data file not found at {path}")
 
-        train_x = train_data[:, :-1] 
-        train_y = train_data[:, -1]   
-        test_x = test_data[:, :-1]    
-        test_y = test_data[:, -1]    
+        # Memory-mapped float32 arrays go to LightGBM without parsing or copying
+        train_x, train_y = load_features(self.config.train_data_path, self.config.train_target_path)
+        test_x, test_y = load_features(self.config.test_data_path, self.config.test_target_path)
 
         logger.info(f"Training data shape: X={train_x.shape}, y={train_y.shape}")
         logger.info(f"Testing data shape: X={test_x.shape}, y={test_y.shape}")
 
         logger.info("Initializing Classifier...")
-        classifier = LGBMClassifier(n_estimators=self.config.n_estimators,
-                                            max_depth=self.config.max_depth,
-                                            subsample=self.config.subsample,
-                                            num_leaves=self.config.num_leaves,
-                                            learning_rate=self.config.learning_rate,
-                                            lambda_l2=self.config.lambda_l2,
-                                            lambda_l1=self.config.lambda_l1,
-                                            colsample_bytree=self.config.colsample_bytree,
-                                            random_state=42,verbose=-1)
+        params = dict(n_estimators=self.config.n_estimators,
+                      max_depth=self.config.max_depth,
+                      subsample=self.config.subsample,
+                      num_leaves=self.config.num_leaves,
+                      learning_rate=self.config.learning_rate,
+                      lambda_l2=self.config.lambda_l2,
+                      lambda_l1=self.config.lambda_l1,
+                      colsample_bytree=self.config.colsample_bytree,
+                      class_weight=self.config.class_weight,
+                      random_state=42)
+        params.update(self.load_tuned_params())
+        classifier = LGBMClassifier(**params, verbose=-1)
         classifier.fit(train_x, train_y)
 
         logger.info("Training the model...")
 
         # Save the trained model
         model_path = os.path.join(self.config.root_dir, self.config.model_name)
-        joblib.dump(classifier, model_path)
+        # joblib.dump writes in place; a reader must never see a half-written model
+        tmp_path = model_path + ".tmp"
+        joblib.dump(classifier, tmp_path)
+        os.replace(tmp_path, model_path)
         logger.info(f"Model saved successfully at {model_path}")
 
@@ -1,101 +1,105 @@
 import os
+from collections import Counter
 from mlproject import logger
-from sklearn.model_selection import train_test_split,GridSearchCV,StratifiedKFold
-from sklearn.preprocessing import LabelEncoder,StandardScaler,OneHotEncoder
-from imblearn.over_sampling import SMOTE
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-import joblib
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder,StandardScaler
+import time
 import numpy as np
 import pandas as pd
 from src.mlproject.entities.config_entity import DataTransformationConfig
+from src.mlproject.utils.common import get_peak_rss_mb, save_features, read_csv_source
+from src.mlproject.utils.balancing import balance, get_balancer
+from src.mlproject.utils.feature_pipeline import FeaturePipeline
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
         self.config = config
-        self.label_encoders = {}
         self.num_cols = config.num_cols
         self.cat_cols_le =  config.cat_cols
         self.cols_to_drop = config.columns_to_drop
+        self.target_encoder = None
+        self.pipeline = None
+        self.tuning_split = None
 
-    def preprocess_data(self, data: pd.DataFrame) -> pd.DataFrame:
-    
-            data = data.copy()
-            data = data.drop(columns=self.cols_to_drop, errors='ignore')
-            
-            for col in self.num_cols:
-                if col in data.columns:
-                    data[col] = pd.to_numeric(data[col], errors='coerce')
-                    data[col] = data[col].fillna(data[col].median())
-            
-            # Label encode categorical columns
-            for column in self.cat_cols_le:
-                if column in data.columns:
-                    le = LabelEncoder()
-                    data[column] = le.fit_transform(data[column].astype(str))
-                    self.label_encoders[column] = le
-            
-            # Encode target column if categorical
-            if self.config.target_column in data.columns:
-                le = LabelEncoder()
-                data[self.config.target_column] = le.fit_transform(data[self.config.target_column])
-                self.label_encoders[self.config.target_column] = le
-            
-            # Save label encoders
-            os.makedirs(os.path.dirname(self.config.label_encoder), exist_ok=True)
-            joblib.dump(self.label_encoders, self.config.label_encoder)
-            
-            return data
-            
+    def preprocess_data(self, data: pd.DataFrame) -> tuple:
+        """Splits the data, fits the feature pipeline on the training split and encodes both splits.
+
+        Medians, vocabularies and most frequent categories come from the
+        training rows only; a test category missing from them is encoded
+        like an unseen one at serving time.
+
+        Returns:
+            tuple: unscaled train and test blocks in the pipeline's feature_order, train and test target codes
+        """
+        data = data.drop(columns=self.cols_to_drop, errors='ignore')
+        target = self.config.target_column
+
+        self.target_encoder = LabelEncoder()
+        y = self.target_encoder.fit_transform(data[target])
+        train_features, test_features, train_y, test_y = self.split(data.drop(columns=[target]), y)
+        self.pipeline = FeaturePipeline.fit(train_features, self.cat_cols_le, self.num_cols,
+                                            target_classes=self.target_encoder.classes_)
+        return self.pipeline.encode(train_features), self.pipeline.encode(test_features), train_y, test_y
+
+    def get_balancer(self):
+        """Balancing strategy from params.yaml; SMOTE copies category codes instead of interpolating them."""
+        return get_balancer(self.config.balancing, categorical=self.pipeline.cat_positions)
+
+    def split(self, X: np.ndarray, y: np.ndarray, random_state: int = 42) -> tuple:
+        """75/25 train/test split, stratified on the target when every class has two rows or more.
+
+        A single row cannot be split and goes to train.
+        """
+        if len(y) < 2:
+            return X, X[:0], y, y[:0]
+        stratify = y if np.unique(y, return_counts=True)[1].min() >= 2 else None
+        return train_test_split(X, y, test_size=0.25, random_state=random_state, stratify=stratify)
+
+    def to_frame(self, block: np.ndarray, y: np.ndarray) -> pd.DataFrame:
+        """Raw feature columns and the target code, as stored in train.parquet and test.parquet."""
+        frame = self.pipeline.decode(block)
+        frame[self.config.target_column] = y
+        return frame
+
+    def compact_dtypes(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Downcasts the integer columns (the target) to the smallest int type."""
+        for col in data.columns:
+            if pd.api.types.is_integer_dtype(data[col]):
+                data[col] = pd.to_numeric(data[col], downcast='integer')
+        return data
 
     def train_test_spliting(self) -> tuple:
-            data = pd.read_csv(self.config.data_path)
-            data = self.preprocess_data(data)
+            data = read_csv_source(self.config.data_path)
+            train_x, test_x, train_y, test_y = self.preprocess_data(data)
             
-            X = data.drop(columns=[self.config.target_column])
-            y = data[self.config.target_column]
+            # Balancing only sees the training split, so the test set keeps the real class mix
+            # Tuning balances inside each CV fold, so it gets the training split as it was
+            self.tuning_split = (train_x, train_y)
+            train_x, train_y = balance(self.get_balancer(), train_x, train_y)
             
-            smote = SMOTE(random_state=42)
-            X_resampled, y_resampled = smote.fit_resample(X, y)
-            
-            X_resampled = pd.DataFrame(X_resampled, columns=X.columns)
-            resampled_data = X_resampled.copy()
-            resampled_data[self.config.target_column] = y_resampled
-            
-            train, test = train_test_split(resampled_data, test_size=0.25, random_state=42)
-            
-            train_path = os.path.join(self.config.root_dir, "train.csv")
-            test_path = os.path.join(self.config.root_dir, "test.csv")
-            train.to_csv(train_path, index=False)
-            test.to_csv(test_path, index=False)
+            train = self.compact_dtypes(self.to_frame(train_x, train_y))
+            test = self.compact_dtypes(self.to_frame(test_x, test_y))
+            train_path = os.path.join(self.config.root_dir, "train.parquet")
+            test_path = os.path.join(self.config.root_dir, "test.parquet")
+            train.to_parquet(train_path, index=False, compression='zstd')
+            test.to_parquet(test_path, index=False, compression='zstd')
             
             logger.info(f"Original data shape: {data.shape}")
-            logger.info(f"Resampled data shape: {resampled_data.shape}")
+            logger.info(f"Balanced training shape: {train_x.shape}")
             logger.info(f"Training data shape: {train.shape}")
             logger.info(f"Test data shape: {test.shape}")
             
             return train, test
             
     def preprocess_features(self, train, test) -> tuple:
-
+        """Fits the scaler on the training split and transforms both splits with the feature pipeline."""
         logger.info(f"Numeric columns for transformation: {self.num_cols}")
-            
-        valid_num_cols = [col for col in self.num_cols if col in train.columns]
 
-        if not valid_num_cols:
+        if not self.pipeline.scaled_cols:
             raise ValueError(f"None of the specified numeric columns {self.num_cols} exist in the data")
-            
-        numeric_transformer = Pipeline(steps=[
-            ('scaler', StandardScaler())
-        ])
-            
-        preprocessor = ColumnTransformer(
-                transformers=[
-                    ('num', numeric_transformer, valid_num_cols)
-                ],
-                remainder='passthrough'
-        )
 
         # Split features and target
         train_x = train.drop(columns=[self.config.target_column])
@@ -103,25 +107,172 @@ class DataTransformation:
         train_y = train[self.config.target_column]
         test_y = test[self.config.target_column]
 
-        train_processed = preprocessor.fit_transform(train_x)
-        test_processed = preprocessor.transform(test_x)
+        train_processed = self.pipeline.encode(train_x)
+        scaler = StandardScaler().fit(train_processed[:, self.pipeline.scaled_positions])
+        self.pipeline.set_scaler(scaler.mean_, scaler.scale_)
+        train_processed = self.pipeline.scale_block(train_processed)
+        test_processed = self.pipeline.transform(test_x)
+        tuning_x, tuning_y = self.tuning_split
+        tuning_processed = self.pipeline.scale_block(tuning_x)
 
-        # Reshape 
-        train_y = train_y.values.reshape(-1, 1)
-        test_y = test_y.values.reshape(-1, 1)
+        self.pipeline.save(self.config.feature_pipeline_path)
 
-        train_combined = np.hstack((train_processed, train_y))
-        test_combined = np.hstack((test_processed, test_y))
+        for split, processed, target in (("train", train_processed, train_y.to_numpy()),
+                                         ("test", test_processed, test_y.to_numpy()),
+                                         ("tuning", tuning_processed, tuning_y)):
+            save_features(os.path.join(self.config.root_dir, f"{split}_features.npy"),
+                          os.path.join(self.config.root_dir, f"{split}_target.npy"),
+                          processed, target)
 
-        os.makedirs(os.path.dirname(self.config.preprocessor_path), exist_ok=True)
-        joblib.dump(preprocessor, self.config.preprocessor_path)
-            
-        np.save(os.path.join(self.config.root_dir, "train_processed.npy"), train_combined)
-        np.save(os.path.join(self.config.root_dir, "test_processed.npy"), test_combined)
-
-        logger.info(f"Preprocessor saved at: {self.config.preprocessor_path}")
         logger.info(f"Training data shape: {train_processed.shape}")
         logger.info(f"Testing data shape: {test_processed.shape}")
+        logger.info(f"Peak RSS: {get_peak_rss_mb():.1f} MB")
             
         return train_processed, test_processed
-            
\ No newline at end of file
+
+    def compute_statistics(self) -> dict:
+        """First streaming pass: approximate medians, category vocabularies and counts.
+
+        Only the training part of every chunk counts, split as the second
+        pass splits it, so the pipeline sees no test rows. Medians come from
+        a fixed-size uniform reservoir sample per numeric column, so memory
+        does not grow with the file.
+        """
+        rng = np.random.default_rng(42)
+        sample_size = self.config.sample_size
+        reservoirs = {col: np.empty(0) for col in self.num_cols}
+        seen = {col: 0 for col in self.num_cols}
+        vocab = {col: Counter() for col in self.cat_cols_le}
+        target_vocab = set()
+        columns = None
+        rows = 0
+
+        target = self.config.target_column
+        for i, chunk in enumerate(self.read_chunks()):
+            rows += len(chunk)
+            if columns is None:
+                columns = list(chunk.columns)
+            target_vocab.update(chunk[target].unique())
+            # Target codes sort like the labels, so this is the split streaming_transform makes
+            chunk = self.split(chunk, chunk[target].to_numpy(), random_state=42 + i)[0]
+            for col in self.num_cols:
+                if col not in chunk.columns:
+                    continue
+                values = pd.to_numeric(chunk[col], errors='coerce').dropna().to_numpy(dtype=float)
+                sample = reservoirs[col]
+                # Fill the reservoir first, then replace slots with probability k / (i + 1)
+                take = min(sample_size - len(sample), len(values))
+                sample = np.concatenate([sample, values[:take]])
+                rest = values[take:]
+                if len(rest):
+                    positions = seen[col] + take + np.arange(len(rest))
+                    slots = rng.integers(0, positions + 1)
+                    keep = slots < sample_size
+                    sample[slots[keep]] = rest[keep]
+                reservoirs[col] = sample
+                seen[col] += len(values)
+            for col in self.cat_cols_le:
+                if col in chunk.columns:
+                    vocab[col].update(chunk[col].astype(str).value_counts().to_dict())
+
+        medians = {col: float(np.median(sample)) for col, sample in reservoirs.items() if len(sample)}
+        logger.info(f"Statistics pass over {rows} rows done, peak RSS: {get_peak_rss_mb():.1f} MB")
+        return {"rows": rows, "columns": columns, "medians": medians, "vocab": vocab, "target_vocab": target_vocab}
+
+    def read_chunks(self):
+        """CSV chunks of `chunksize` rows; a last chunk under half that size is appended to the one before.
+
+        Every chunk is split and balanced on its own, so a short tail would
+        otherwise get a split of a handful of rows and, with too few minority
+        rows, no oversampling.
+        """
+        previous = None
+        for chunk in read_csv_source(self.config.data_path, chunksize=self.config.chunksize):
+            if previous is not None and len(chunk) < self.config.chunksize // 2:
+                chunk = pd.concat([previous, chunk])
+            elif previous is not None:
+                yield previous
+            previous = chunk
+        if previous is not None:
+            yield previous
+
+    def transform_chunk(self, chunk: pd.DataFrame) -> tuple:
+        """Encodes one chunk with the feature pipeline; returns the unscaled block and target codes."""
+        chunk = chunk.drop(columns=self.cols_to_drop, errors='ignore')
+        y = self.target_encoder.transform(chunk[self.config.target_column])
+        return self.pipeline.encode(chunk.drop(columns=[self.config.target_column])), y
+
+    def streaming_transform(self) -> tuple:
+        """Bounded-memory version of train_test_spliting + preprocess_features.
+
+        Reads the CSV in `chunksize` rows three times: statistics, then
+        encode / split / balance the training part / append to train.parquet
+        and test.parquet while fitting the scaler incrementally, then scale
+        into the .npy feature and target files. The training parts before
+        balancing go through a temporary tuning.parquet into the tuning
+        .npy files.
+        """
+        stats = self.compute_statistics()
+        target = self.config.target_column
+        self.target_encoder = LabelEncoder().fit(np.array(sorted(stats["target_vocab"])))
+        input_features = [col for col in stats["columns"] if col not in self.cols_to_drop and col != target]
+        vocab = stats["vocab"]
+        # Ties go to the first category in vocabulary order, as in FeaturePipeline.fit
+        most_frequent = {col: min(counts, key=lambda value: (-counts[value], value))
+                         for col, counts in vocab.items() if counts}
+        self.pipeline = FeaturePipeline(input_features, self.cat_cols_le, self.num_cols, stats["medians"],
+                                        {col: sorted(counts) for col, counts in vocab.items()},
+                                        target_classes=self.target_encoder.classes_, most_frequent=most_frequent)
+
+        paths = {split: os.path.join(self.config.root_dir, f"{split}.parquet")
+                 for split in ("train", "test", "tuning")}
+        writers = {}
+
+        scaler = StandardScaler()
+        balancer = self.get_balancer()
+        balancing_s = 0.0
+        rows = {"train": 0, "test": 0, "tuning": 0}
+        for i, chunk in enumerate(self.read_chunks()):
+            train_x, test_x, train_y, test_y = self.split(*self.transform_chunk(chunk), random_state=42 + i)
+            tuning_x, tuning_y = train_x, train_y
+            start = time.perf_counter()
+            train_x, train_y = balancer.fit_resample(train_x, train_y)
+            balancing_s += time.perf_counter() - start
+            for split, part_x, part_y in (("train", train_x, train_y), ("test", test_x, test_y),
+                                          ("tuning", tuning_x, tuning_y)):
+                table = pa.Table.from_pandas(self.compact_dtypes(self.to_frame(part_x, part_y)), preserve_index=False)
+                if split not in writers:
+                    writers[split] = pq.ParquetWriter(paths[split], table.schema, compression='zstd')
+                writers[split].write_table(table.cast(writers[split].schema))
+                rows[split] += len(part_x)
+
+            scaler.partial_fit(train_x[:, self.pipeline.scaled_positions])
+        for writer in writers.values():
+            writer.close()
+        logger.info(f"Encoded and split {rows['train']} train / {rows['test']} test rows, "
+                    f"balancing '{balancer.name}' took {balancing_s:.3f} s, peak RSS: {get_peak_rss_mb():.1f} MB")
+
+        self.pipeline.set_scaler(scaler.mean_, scaler.scale_)
+        self.pipeline.save(self.config.feature_pipeline_path)
+
+        # Same .npy layout as save_features, filled chunk by chunk through memmaps
+        n_features = self.pipeline.n_features
+        for split, path in paths.items():
+            features = np.lib.format.open_memmap(os.path.join(self.config.root_dir, f"{split}_features.npy"),
+                                                 mode='w+', dtype=np.float32, shape=(rows[split], n_features))
+            labels = np.lib.format.open_memmap(os.path.join(self.config.root_dir, f"{split}_target.npy"),
+                                               mode='w+', dtype=np.int8, shape=(rows[split],))
+            start = 0
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.config.chunksize):
+                chunk = batch.to_pandas()
+                end = start + len(chunk)
+                features[start:end] = self.pipeline.transform(chunk.drop(columns=[target]))
+                labels[start:end] = chunk[target].to_numpy()
+                start = end
+            features.flush()
+            labels.flush()
+            del features, labels
+        os.remove(paths["tuning"])
+
+        logger.info(f"Streaming transformation done, peak RSS: {get_peak_rss_mb():.1f} MB")
+        return rows["train"], rows["test"]
@@ -1,31 +1,46 @@
-import os
+import time
 from mlproject import logger
 from src.mlproject.entities.config_entity import DataValidationConfig
-import pandas as pd
+from src.mlproject.utils.common import save_json, read_csv_source
+from src.mlproject.utils.schema_validator import SchemaValidator
+from pathlib import Path
 
 
 class DataValiadtion:
     def __init__(self, config: DataValidationConfig):
         self.config = config
+        constraints = dict(config.constraints or {})
+        self.validator = SchemaValidator(
+            columns=config.all_schema,
+            constraints=dict(constraints.get("columns", {}) or {}),
+            max_null_rate=constraints.get("max_null_rate", 0.0),
+            allow_extra_columns=False
+        )
 
 
     def validate_all_columns(self)-> bool:
-        validation_status = None
-
-        data = pd.read_csv(self.config.unzip_data_dir)
-        all_cols = list(data.columns)
-
-        all_schema = self.config.all_schema.keys()
- 
-        for col in all_cols:
-            if col not in all_schema:
-                validation_status = False
-                with open(self.config.STATUS_FILE, 'w') as f:
-                    f.write(f"Validation status: {validation_status}")
-            else:
-                validation_status = True
-                with open(self.config.STATUS_FILE, 'w') as f:
-                    f.write(f"Validation status: {validation_status}")
-
+        start = time.perf_counter()
+
+        # Read everything as strings so type checks see the raw values
+        if self.config.chunksize:
+            chunks = read_csv_source(self.config.unzip_data_dir, dtype=str, keep_default_na=False,
+                                     chunksize=self.config.chunksize)
+            report = self.validator.validate_chunks(chunks)
+        else:
+            data = read_csv_source(self.config.unzip_data_dir, dtype=str, keep_default_na=False)
+            report = self.validator.validate(data)
+
+        report["source"] = str(self.config.unzip_data_dir)
+        report["elapsed_s"] = round(time.perf_counter() - start, 3)
+        save_json(path=Path(self.config.report_file), data=report)
+
+        validation_status = report["status"]
+        with open(self.config.STATUS_FILE, 'w') as f:
+            f.write(f"Validation status: {validation_status}")
+
+        if validation_status:
+            logger.info(f"Validated {report['rows']} rows in {report['elapsed_s']}s")
+        else:
+            logger.error(f"Validation failed: {report['errors']}")
         return validation_status
 
@@ -0,0 +1,106 @@
+import os
+import joblib
+import numpy as np
+from mlproject import logger
+from src.mlproject.entities.config_entity import ModelExportConfig
+from src.mlproject.utils.common import get_size
+from src.mlproject.utils.feature_pipeline import feature_pipeline_paths, load_feature_pipeline
+from src.mlproject.utils.serving_manifest import write_serving_manifest
+from src.mlproject.utils.tree_bundle import MISSING_TYPES
+from pathlib import Path
+
+
+class ModelExporter:
+    """Flattens the trained model and its feature pipeline into one .npz bundle.
+
+    The bundle only holds plain arrays, so it can be scored with
+    `mlproject.pipeline.bundle_prediction` without lightgbm or sklearn.
+    """
+
+    def __init__(self, config: ModelExportConfig):
+        self.config = config
+
+    def export_trees(self, model) -> dict:
+        """Flattens the booster trees into node and leaf arrays.
+
+        Children >= 0 point at split nodes, children < 0 encode leaf `~index`.
+        """
+        dump = model.booster_.dump_model()
+        objective = dump["objective"].split()
+        if objective[0] != "binary" or dump["num_tree_per_iteration"] != 1:
+            raise ValueError(f"Only binary models can be exported, got {dump['objective']}")
+        sigmoid = 1.0
+        for option in objective[1:]:
+            if option.startswith("sigmoid:"):
+                sigmoid = float(option.split(":")[1])
+
+        feature, threshold, default_left, missing_type = [], [], [], []
+        left_child, right_child, leaf_value, tree_root = [], [], [], []
+        max_depth = 0
+
+        for tree in dump["tree_info"]:
+            if tree["num_cat"]:
+                raise ValueError("Categorical splits can not be exported")
+
+            def add(node, depth):
+                nonlocal max_depth
+                if "leaf_value" in node:
+                    leaf_value.append(node["leaf_value"])
+                    return ~(len(leaf_value) - 1)
+
+                max_depth = max(max_depth, depth + 1)
+                index = len(feature)
+                feature.append(node["split_feature"])
+                threshold.append(node["threshold"])
+                default_left.append(node["default_left"])
+                missing_type.append(MISSING_TYPES[node["missing_type"]])
+                left_child.append(0)
+                right_child.append(0)
+                left_child[index] = add(node["left_child"], depth + 1)
+                right_child[index] = add(node["right_child"], depth + 1)
+                return index
+
+            tree_root.append(add(tree["tree_structure"], 0))
+
+        return {
+            "sigmoid": np.float64(sigmoid),
+            "max_depth": np.int32(max_depth),
+            "tree_root": np.asarray(tree_root, dtype=np.int32),
+            "split_feature": np.asarray(feature, dtype=np.int32),
+            "threshold": np.asarray(threshold, dtype=np.float64),
+            "default_left": np.asarray(default_left, dtype=bool),
+            "missing_type": np.asarray(missing_type, dtype=np.int8),
+            "left_child": np.asarray(left_child, dtype=np.int32),
+            "right_child": np.asarray(right_child, dtype=np.int32),
+            "leaf_value": np.asarray(leaf_value, dtype=np.float64),
+        }
+
+    def export(self) -> Path:
+        if not os.path.exists(self.config.model_path):
+            raise FileNotFoundError(f"Artifact not found at {self.config.model_path}")
+
+        model = joblib.load(self.config.model_path)
+        feature_pipeline = load_feature_pipeline(self.config.feature_pipeline_path, self.config.preprocessor_path,
+                                                 self.config.label_encoder, self.config.cat_cols,
+                                                 self.config.target_column)
+
+        # The feature pipeline's arrays as they are, so the bundle loads with FeaturePipeline.from_arrays
+        arrays = feature_pipeline.to_arrays()
+        arrays.update(self.export_trees(model))
+
+        bundle_path = Path(self.config.bundle_path)
+        os.makedirs(bundle_path.parent, exist_ok=True)
+        # Write next to the target and rename, so serving never sees a partial bundle
+        tmp_path = bundle_path.with_name(bundle_path.stem + ".tmp.npz")
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, bundle_path)
+
+        logger.info(f"Model bundle with {len(arrays['tree_root'])} trees saved at {bundle_path} ({get_size(bundle_path)})")
+
+        # Written last: serving only picks up artifacts once they are all final and consistent
+        artifacts = [*feature_pipeline_paths(self.config.feature_pipeline_path, self.config.preprocessor_path,
+                                             self.config.label_encoder),
+                     Path(self.config.model_path), bundle_path]
+        version = write_serving_manifest(self.config.manifest_path, artifacts)
+        logger.info(f"Serving manifest {version} saved at {self.config.manifest_path}")
+        return bundle_path
@@ -0,0 +1,187 @@
+import os
+import math
+import time
+import numpy as np
+import lightgbm as lgb
+from joblib import Parallel, delayed
+from lightgbm import LGBMClassifier
+from sklearn.model_selection import StratifiedKFold
+from mlproject import logger
+from src.mlproject.entities.config_entity import ModelTuningConfig
+from src.mlproject.utils.balancing import balance, get_balancer
+from src.mlproject.utils.common import load_features, save_json
+from src.mlproject.utils.feature_pipeline import FeaturePipeline
+from pathlib import Path
+
+
+# Metrics where a larger value is better; everything else is minimised
+MAXIMIZE = {"auc", "average_precision"}
+
+
+def sample_params(search_space: dict, rng: np.random.Generator) -> dict:
+    """Draws one candidate from a search space of {name: {type, low, high}} or {name: {type: choice, values}}."""
+    params = {}
+    for name, spec in search_space.items():
+        kind = spec["type"]
+        if kind == "int":
+            params[name] = int(rng.integers(spec["low"], spec["high"] + 1))
+        elif kind == "uniform":
+            params[name] = float(rng.uniform(spec["low"], spec["high"]))
+        elif kind == "loguniform":
+            params[name] = float(math.exp(rng.uniform(math.log(spec["low"]), math.log(spec["high"]))))
+        elif kind == "choice":
+            params[name] = spec["values"][int(rng.integers(len(spec["values"])))]
+        else:
+            raise ValueError(f"Unknown search space type '{kind}' for {name}")
+    return params
+
+
+def fit_fold(params: dict, n_estimators: int, fold: tuple,
+             metric: str, early_stopping_rounds: int, threads: int) -> tuple:
+    """Fits one candidate on one CV fold with early stopping.
+
+    Args:
+        fold (tuple): balanced training part, validation part, as (train_x, train_y, valid_x, valid_y)
+
+    Returns:
+        tuple: validation score at the best iteration, best iteration
+    """
+    train_x, train_y, valid_x, valid_y = fold
+    model = LGBMClassifier(**params, n_estimators=n_estimators, n_jobs=threads, verbose=-1)
+    model.fit(train_x, train_y,
+              eval_set=[(valid_x, valid_y)],
+              eval_metric=metric,
+              callbacks=[lgb.early_stopping(early_stopping_rounds, first_metric_only=True, verbose=False)])
+    best_iteration = model.best_iteration_ or n_estimators
+    score = model.evals_result_["valid_0"][metric][best_iteration - 1]
+    return float(score), int(best_iteration)
+
+
+class ModelTuner:
+    """Successive halving search over LightGBM hyperparameters.
+
+    `n_candidates` random draws from the search space are cross-validated
+    with a budget of `min_resource` boosting rounds. The best
+    1/`reduction_factor` of them move on to the next rung with
+    `reduction_factor` times the budget, until one candidate is left or the
+    budget reaches `max_resource`. Every fit stops early once the
+    validation metric stops improving, so the budget is only a cap.
+
+    Folds of all candidates in a rung run in parallel: `n_workers`
+    processes, each fitting with `threads_per_worker` LightGBM threads.
+
+    The CV runs on the training split before balancing. The balancer is
+    applied to each fold's training part only, once for all candidates, so
+    validation rows and the synthetic rows made from them never meet.
+    """
+
+    def __init__(self, config: ModelTuningConfig):
+        self.config = config
+
+    def get_parallelism(self) -> tuple:
+        threads = max(1, self.config.threads_per_worker)
+        workers = self.config.n_workers or max(1, (os.cpu_count() or 1) // threads)
+        return workers, threads
+
+    def get_budgets(self) -> list:
+        budgets = []
+        budget = self.config.min_resource
+        while budget < self.config.max_resource:
+            budgets.append(budget)
+            budget *= self.config.reduction_factor
+        budgets.append(self.config.max_resource)
+        return budgets
+
+    def get_folds(self, x, y) -> list:
+        """Stratified CV folds as (train_x, train_y, valid_x, valid_y), the training parts balanced."""
+        pipeline = FeaturePipeline.load(self.config.feature_pipeline_path)
+        balancer = get_balancer(self.config.balancing, categorical=pipeline.cat_positions)
+        skf = StratifiedKFold(n_splits=self.config.cv_folds, shuffle=True, random_state=self.config.random_state)
+        folds = []
+        for train_idx, valid_idx in skf.split(np.zeros(len(y)), y):
+            train_x, train_y = balance(balancer, x[train_idx], y[train_idx])
+            folds.append((train_x, train_y, x[valid_idx], y[valid_idx]))
+        return folds
+
+    def evaluate_rung(self, parallel: Parallel, candidates: list, budget: int, folds: list) -> list:
+        threads = self.get_parallelism()[1]
+        fold_results = parallel(
+            delayed(fit_fold)(params, budget, fold,
+                              self.config.metric, self.config.early_stopping_rounds, threads)
+            for params in candidates
+            for fold in folds
+        )
+        n_folds = len(folds)
+        results = []
+        for i, params in enumerate(candidates):
+            scores, iterations = zip(*fold_results[i * n_folds:(i + 1) * n_folds])
+            results.append({
+                "params": params,
+                "score": float(np.mean(scores)),
+                "score_std": float(np.std(scores)),
+                "best_iteration": int(round(np.mean(iterations))),
+            })
+        return results
+
+    def tune(self) -> dict:
+        for path in (self.config.train_data_path, self.config.train_target_path, self.config.feature_pipeline_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Data file not found at {path}")
+
+        x, y = load_features(self.config.train_data_path, self.config.train_target_path)
+        logger.info(f"Tuning on X={x.shape} with {self.config.cv_folds}-fold CV")
+
+        folds = self.get_folds(x, y)
+
+        # Values in the search space override the fixed ones from LGBMClassifier
+        base_params = {key: value for key, value in self.config.base_params.items() if key != "n_estimators"}
+        base_params["random_state"] = self.config.random_state
+        rng = np.random.default_rng(self.config.random_state)
+        candidates = [{**base_params, **sample_params(self.config.search_space, rng)}
+                      for _ in range(self.config.n_candidates)]
+
+        maximize = self.config.metric in MAXIMIZE
+        workers, threads = self.get_parallelism()
+        logger.info(f"Successive halving: {len(candidates)} candidates, budgets {self.get_budgets()}, "
+                    f"{workers} workers x {threads} LightGBM threads")
+
+        start = time.perf_counter()
+        rungs = []
+        with Parallel(n_jobs=workers) as parallel:
+            budgets = self.get_budgets()
+            for budget in budgets:
+                # A lone survivor goes straight to the full budget
+                if len(candidates) == 1:
+                    budget = budgets[-1]
+                rung_start = time.perf_counter()
+                results = self.evaluate_rung(parallel, candidates, budget, folds)
+                results.sort(key=lambda result: result["score"], reverse=maximize)
+                rungs.append({
+                    "budget": budget,
+                    "candidates": len(results),
+                    "best_score": results[0]["score"],
+                    "elapsed_s": round(time.perf_counter() - rung_start, 3),
+                })
+                logger.info(f"Rung with {budget} rounds: {len(results)} candidates, "
+                            f"best {self.config.metric}={results[0]['score']:.5f}")
+                if budget == budgets[-1]:
+                    break
+                keep = max(1, len(results) // self.config.reduction_factor)
+                candidates = [result["params"] for result in results[:keep]]
+
+        best = results[0]
+        best_params = {**best["params"], "n_estimators": best["best_iteration"]}
+        summary = {
+            "params": best_params,
+            "metric": self.config.metric,
+            "score": best["score"],
+            "score_std": best["score_std"],
+            "n_candidates": self.config.n_candidates,
+            "rungs": rungs,
+            "workers": workers,
+            "threads_per_worker": threads,
+            "elapsed_s": round(time.perf_counter() - start, 3),
+        }
+        save_json(path=Path(self.config.best_params_path), data=summary)
+        logger.info(f"Best params ({self.config.metric}={best['score']:.5f}): {best_params}")
+        return best_params
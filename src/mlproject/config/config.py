@@ -1,12 +1,22 @@
 from src.mlproject.constants import *
 from src.mlproject.utils.common import read_yaml, create_directories
-from src.mlproject.entities.config_entity import (DataIngestionConfig, 
+from src.mlproject.entities.config_entity import (StageCacheConfig,
+                                                PipelineExecutorConfig,
+                                                DataIngestionConfig, 
                                                 DataValidationConfig, 
+                                                BalancingConfig,
                                                 DataTransformationConfig,
+                                                ModelTuningConfig,
                                                 ModelTrainerConfig,
+                                                TrackingConfig,
                                                 ModelEvaluationConfig,
-                                                ModelMonitoringConfig)
-import os
+                                                ModelMonitoringConfig,
+                                                ModelExportConfig,
+                                                PredictionConfig,
+                                                LoggingConfig,
+                                                MetricsConfig,
+                                                AsyncServingConfig,
+                                                BatchScoringConfig)
 
 
 class ConfigurationManager:
@@ -23,6 +33,26 @@ class ConfigurationManager:
         create_directories([self.config.artifacts_root])
 
 
+    def get_stage_cache_config(self) -> StageCacheConfig:
+        config = self.config.stage_cache
+
+        stage_cache_config = StageCacheConfig(
+            root_dir=Path(config.root_dir),
+            enabled=bool(config.enabled)
+        )
+
+        return stage_cache_config
+
+    def get_pipeline_executor_config(self) -> PipelineExecutorConfig:
+        config = self.config.pipeline_executor
+
+        pipeline_executor_config = PipelineExecutorConfig(
+            max_workers=int(config.max_workers),
+            timing_report=Path(config.timing_report)
+        )
+
+        return pipeline_executor_config
+
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         config = self.config.data_ingestion
 
@@ -32,7 +62,12 @@ class ConfigurationManager:
             root_dir=config.root_dir,
             source_URL=config.source_URL,
             local_data_file=config.local_data_file,
-            unzip_dir=config.unzip_dir 
+            unzip_dir=config.unzip_dir,
+            sha256=config.get("sha256"),
+            chunk_size=int(config.chunk_size),
+            timeout=float(config.timeout),
+            retries=max(1, int(config.retries)),
+            extract=bool(config.extract)
         )
 
         return data_ingestion_config
@@ -48,6 +83,9 @@ class ConfigurationManager:
             STATUS_FILE=config.STATUS_FILE,
             unzip_data_dir = config.unzip_data_dir,
             all_schema=schema,
+            constraints=self.schema.get("CONSTRAINTS", {}),
+            report_file=config.report_file,
+            chunksize=int(config.chunksize or 0)
         )
 
         return data_validation_config
@@ -60,14 +98,64 @@ class ConfigurationManager:
             root_dir=config.root_dir,
             data_path=config.data_path,
             target_column=config.target_column,
-            preprocessor_path=config.preprocessor_path,
-            label_encoder=config.label_encoder,
+            feature_pipeline_path=Path(config.feature_pipeline_path),
             columns_to_drop=schema.columns_to_drop,
             num_cols=schema.num_cols,
-            cat_cols=schema.cat_cols
+            cat_cols=schema.cat_cols,
+            streaming=config.streaming,
+            chunksize=config.chunksize,
+            sample_size=config.sample_size,
+            balancing=self.get_balancing_config()
         )
         return data_transformation_config
 
+    def get_balancing_config(self) -> BalancingConfig:
+        params = self.params.balancing
+
+        balancing_config = BalancingConfig(
+            strategy=params.strategy,
+            ratio=float(params.ratio),
+            random_state=int(params.random_state),
+            k_neighbors=int(params.k_neighbors),
+            block_size=int(params.block_size),
+            n_projections=int(params.n_projections),
+            chunk_size=int(params.chunk_size)
+        )
+        return balancing_config
+
+    def get_class_weight(self):
+        """LightGBM class_weight: "balanced" with the class_weight balancing strategy, else None."""
+        return "balanced" if self.params.balancing.strategy == "class_weight" else None
+
+    def get_model_tuning_config(self) -> ModelTuningConfig:
+        config = self.config.model_tuning
+        params = self.params.tuning
+
+        create_directories([config.root_dir])
+
+        model_tuning_config = ModelTuningConfig(
+            root_dir=config.root_dir,
+            train_data_path=config.train_data_path,
+            train_target_path=config.train_target_path,
+            feature_pipeline_path=Path(config.feature_pipeline_path),
+            best_params_path=Path(config.best_params_path),
+            base_params={**self.params.LGBMClassifier, "class_weight": self.get_class_weight()},
+            search_space=params.search_space.to_dict(),
+            n_candidates=int(params.n_candidates),
+            min_resource=int(params.min_resource),
+            max_resource=int(params.max_resource),
+            reduction_factor=int(params.reduction_factor),
+            cv_folds=int(params.cv_folds),
+            early_stopping_rounds=int(params.early_stopping_rounds),
+            metric=params.metric,
+            n_workers=int(params.n_workers),
+            threads_per_worker=int(params.threads_per_worker),
+            random_state=int(params.random_state),
+            balancing=self.get_balancing_config()
+        )
+
+        return model_tuning_config
+
     def get_model_trainer_config(self) -> ModelTrainerConfig:
         config = self.config.model_trainer
         params = self.params.LGBMClassifier
@@ -77,7 +165,9 @@ class ConfigurationManager:
         model_trainer_config = ModelTrainerConfig(
             root_dir=config.root_dir,
             train_data_path=config.train_data_path,
+            train_target_path=config.train_target_path,
             test_data_path=config.test_data_path,
+            test_target_path=config.test_target_path,
             model_name=config.model_name,
             n_estimators=params.n_estimators,
             max_depth=params.max_depth,
@@ -86,7 +176,10 @@ class ConfigurationManager:
             learning_rate=params.learning_rate,
             lambda_l2=params.lambda_l2,
             lambda_l1=params.lambda_l1,
-            colsample_bytree=params.colsample_bytree
+            colsample_bytree=params.colsample_bytree,
+            class_weight=self.get_class_weight(),
+            # Only train on tuned values while the tuning stage is enabled
+            tuned_params_path=Path(self.config.model_tuning.best_params_path) if self.params.tuning.enabled else None
         )
 
         return model_trainer_config
@@ -95,6 +188,7 @@ class ConfigurationManager:
         config = self.config.model_evaluation
         params = self.params.LGBMClassifier
         schema = self.schema.TARGET_COLUMN
+        evaluation = self.params.evaluation
 
         create_directories([config.root_dir])
 
@@ -105,10 +199,41 @@ class ConfigurationManager:
             all_params=params,
             metric_file_path=config.metric_file_path,
             preprocessor_path=config.preprocessor_path,
-            target_column=schema.name
+            target_column=schema.name,
+            feature_pipeline_path=Path(config.feature_pipeline_path),
+            label_encoder=Path(config.label_encoder),
+            cat_cols=self.schema.cat_cols,
+            predictions_path=Path(config.predictions_path),
+            reuse_predictions=bool(config.reuse_predictions),
+            tracking=self.get_tracking_config(),
+            report_path=Path(config.report_path),
+            decision_threshold=float(evaluation.decision_threshold),
+            n_thresholds=int(evaluation.n_thresholds),
+            calibration_bins=int(evaluation.calibration_bins),
+            lift_groups=int(evaluation.lift_groups),
+            n_bootstrap=int(evaluation.n_bootstrap),
+            confidence_level=float(evaluation.confidence_level),
+            random_state=int(evaluation.random_state)
         )
 
         return model_evaluation_config
+
+    def get_tracking_config(self) -> TrackingConfig:
+        config = self.config.model_evaluation.tracking
+
+        tracking_config = TrackingConfig(
+            backend=config.backend,
+            tracking_uri=config.tracking_uri,
+            artifact_location=Path(config.artifact_location) if config.artifact_location else None,
+            root_dir=Path(config.root_dir),
+            experiment_name=config.experiment_name,
+            registered_model_name=config.registered_model_name,
+            log_model=bool(config.log_model),
+            background_upload=bool(config.background_upload),
+            dagshub_repo=config.dagshub_repo
+        )
+
+        return tracking_config
     
     def get_model_monitoring_config(self) -> ModelMonitoringConfig:
         config = self.config.model_monitoring
@@ -123,4 +248,99 @@ class ConfigurationManager:
             preprocessor_path=config.preprocessor_path
         )
         
-        return model_monitoring_config
\ No newline at end of file
+        return model_monitoring_config
+
+    def get_model_export_config(self) -> ModelExportConfig:
+        config = self.config.model_export
+        schema = self.schema
+
+        create_directories([config.root_dir])
+
+        model_export_config = ModelExportConfig(
+            root_dir=config.root_dir,
+            model_path=config.model_path,
+            feature_pipeline_path=Path(config.feature_pipeline_path),
+            preprocessor_path=config.preprocessor_path,
+            label_encoder=config.label_encoder,
+            bundle_path=config.bundle_path,
+            manifest_path=Path(config.manifest_path),
+            cat_cols=schema.cat_cols,
+            target_column=schema.TARGET_COLUMN.name
+        )
+
+        return model_export_config
+
+    def get_prediction_config(self) -> PredictionConfig:
+        config = self.config.prediction
+
+        prediction_config = PredictionConfig(
+            backend=config.backend,
+            schema_path=Path(config.schema_path),
+            feature_pipeline_path=Path(config.feature_pipeline_path),
+            preprocessor_path=Path(config.preprocessor_path),
+            model_path=Path(config.model_path),
+            label_encoder=Path(config.label_encoder),
+            bundle_path=Path(config.bundle_path),
+            manifest_path=Path(config.manifest_path) if config.get("manifest_path") else None,
+            reload_interval=float(config.reload_interval),
+            unknown_category=config.unknown_category,
+            # The threshold the model is evaluated at, so serving makes the same decisions
+            decision_threshold=float(self.params.evaluation.decision_threshold),
+            validate_input=bool(config.validate_input),
+            cache_enabled=bool(config.cache_enabled),
+            cache_size=int(config.cache_size),
+            cache_ttl=float(config.cache_ttl) if config.cache_ttl else None
+        )
+
+        return prediction_config
+
+    def get_logging_config(self) -> LoggingConfig:
+        config = self.config.logging
+
+        logging_config = LoggingConfig(
+            log_dir=Path(config.log_dir),
+            log_file=config.log_file,
+            level=str(config.level).upper(),
+            async_mode=bool(config.async_mode),
+            max_bytes=int(config.max_bytes),
+            backup_count=int(config.backup_count),
+            request_sample_rate=float(config.request_sample_rate)
+        )
+
+        return logging_config
+
+    def get_metrics_config(self) -> MetricsConfig:
+        config = self.config.metrics
+
+        metrics_config = MetricsConfig(
+            enabled=bool(config.enabled)
+        )
+
+        return metrics_config
+
+    def get_async_serving_config(self) -> AsyncServingConfig:
+        config = self.config.async_serving
+
+        async_serving_config = AsyncServingConfig(
+            host=config.host,
+            port=int(config.port),
+            max_batch_size=int(config.max_batch_size),
+            max_wait_ms=float(config.max_wait_ms),
+            workers=int(config.workers)
+        )
+
+        return async_serving_config
+
+    def get_batch_scoring_config(self) -> BatchScoringConfig:
+        config = self.config.batch_scoring
+
+        batch_scoring_config = BatchScoringConfig(
+            prediction=self.get_prediction_config(),
+            chunksize=int(config.chunksize),
+            n_workers=int(config.n_workers),
+            threads_per_worker=int(config.threads_per_worker),
+            keep_columns=list(config.keep_columns or []),
+            progress_interval=float(config.progress_interval)
+        )
+
+        return batch_scoring_config
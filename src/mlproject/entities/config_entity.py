@@ -2,12 +2,29 @@ from dataclasses import dataclass
 from pathlib import Path
 
 
+@dataclass(frozen=True)
+class StageCacheConfig:
+    root_dir: Path
+    enabled: bool
+
+
+@dataclass(frozen=True)
+class PipelineExecutorConfig:
+    max_workers: int
+    timing_report: Path
+
+
 @dataclass(frozen=True)
 class DataIngestionConfig:
     root_dir: Path
     source_URL: str
     local_data_file: Path
     unzip_dir: Path
+    sha256: str
+    chunk_size: int
+    timeout: float
+    retries: int
+    extract: bool
 
 
 @dataclass(frozen=True)
@@ -16,6 +33,20 @@ class DataValidationConfig:
     STATUS_FILE: Path
     unzip_data_dir: Path
     all_schema: dict
+    constraints: dict
+    report_file: Path
+    chunksize: int
+
+
+@dataclass(frozen=True)
+class BalancingConfig:
+    strategy: str
+    ratio: float
+    random_state: int
+    k_neighbors: int
+    block_size: int
+    n_projections: int
+    chunk_size: int
 
 
 @dataclass(frozen=True)
@@ -23,18 +54,45 @@ class DataTransformationConfig:
     root_dir: Path
     data_path: Path
     target_column: str
-    label_encoder: Path
-    preprocessor_path: Path
+    feature_pipeline_path: Path
     columns_to_drop: list
     num_cols: list
     cat_cols: list
+    streaming: bool
+    chunksize: int
+    sample_size: int
+    balancing: BalancingConfig
+
+
+@dataclass(frozen=True)
+class ModelTuningConfig:
+    root_dir: Path
+    train_data_path: Path
+    train_target_path: Path
+    feature_pipeline_path: Path
+    best_params_path: Path
+    base_params: dict
+    search_space: dict
+    n_candidates: int
+    min_resource: int
+    max_resource: int
+    reduction_factor: int
+    cv_folds: int
+    early_stopping_rounds: int
+    metric: str
+    n_workers: int
+    threads_per_worker: int
+    random_state: int
+    balancing: BalancingConfig
 
 
 @dataclass(frozen=True)
 class ModelTrainerConfig:
     root_dir: Path
     train_data_path: Path
+    train_target_path: Path
     test_data_path: Path
+    test_target_path: Path
     model_name: str
     n_estimators: int
     max_depth: int
@@ -44,6 +102,21 @@ class ModelTrainerConfig:
     lambda_l2: float
     lambda_l1: float
     colsample_bytree: float
+    class_weight: str
+    tuned_params_path: Path
+
+
+@dataclass(frozen=True)
+class TrackingConfig:
+    backend: str
+    tracking_uri: str
+    artifact_location: Path
+    root_dir: Path
+    experiment_name: str
+    registered_model_name: str
+    log_model: bool
+    background_upload: bool
+    dagshub_repo: str
 
 
 @dataclass(frozen=True)
@@ -55,6 +128,20 @@ class ModelEvaluationConfig:
     metric_file_path: Path
     preprocessor_path: Path
     target_column: str
+    feature_pipeline_path: Path
+    label_encoder: Path
+    cat_cols: list
+    predictions_path: Path
+    reuse_predictions: bool
+    tracking: TrackingConfig
+    report_path: Path
+    decision_threshold: float
+    n_thresholds: int
+    calibration_bins: int
+    lift_groups: int
+    n_bootstrap: int
+    confidence_level: float
+    random_state: int
 
 
 @dataclass(frozen=True)
@@ -63,4 +150,70 @@ class ModelMonitoringConfig:
     train_data_path: Path
     test_data_path: Path
     model_path: Path
-    preprocessor_path: Path
\ No newline at end of file
+    preprocessor_path: Path
+
+@dataclass(frozen=True)
+class ModelExportConfig:
+    root_dir: Path
+    model_path: Path
+    feature_pipeline_path: Path
+    preprocessor_path: Path
+    label_encoder: Path
+    bundle_path: Path
+    manifest_path: Path
+    cat_cols: list
+    target_column: str
+
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    backend: str
+    schema_path: Path
+    feature_pipeline_path: Path
+    preprocessor_path: Path
+    model_path: Path
+    label_encoder: Path
+    bundle_path: Path
+    manifest_path: Path
+    reload_interval: float
+    unknown_category: str
+    decision_threshold: float
+    validate_input: bool
+    cache_enabled: bool
+    cache_size: int
+    cache_ttl: float
+
+
+@dataclass(frozen=True)
+class LoggingConfig:
+    log_dir: Path
+    log_file: str
+    level: str
+    async_mode: bool
+    max_bytes: int
+    backup_count: int
+    request_sample_rate: float
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    enabled: bool
+
+
+@dataclass(frozen=True)
+class AsyncServingConfig:
+    host: str
+    port: int
+    max_batch_size: int
+    max_wait_ms: float
+    workers: int
+
+
+@dataclass(frozen=True)
+class BatchScoringConfig:
+    prediction: PredictionConfig
+    chunksize: int
+    n_workers: int
+    threads_per_worker: int
+    keep_columns: list
+    progress_interval: float
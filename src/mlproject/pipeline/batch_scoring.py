@@ -0,0 +1,281 @@
+import json
+import multiprocessing
+import os
+import shutil
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from mlproject import logger
+from mlproject.entities.config_entity import BatchScoringConfig, PredictionConfig
+from mlproject.pipeline.model_holder import get_pipeline_class
+from mlproject.utils.common import get_zip_member, read_csv_source
+
+
+COUNT_BLOCK_BYTES = 1 << 24
+
+# The scoring pipeline of a worker process, loaded once by init_worker
+_pipeline = None
+
+
+def init_worker(config: PredictionConfig, threads: int):
+    """Pool initializer: loads the model once for all the chunks this worker scores."""
+    global _pipeline
+    # Read by LightGBM's OpenMP runtime, so it has to be set before the model is loaded
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    _pipeline = get_pipeline_class(config)(config)
+
+
+def score_chunk(index: int, chunk: pd.DataFrame, part_path: Path, keep_columns: list,
+                probabilities_only: bool) -> tuple:
+    """Scores one chunk in a worker and writes it as a checkpoint part.
+
+    Returns:
+        tuple: chunk index, rows scored, seconds taken
+    """
+    start = time.perf_counter()
+    scores = _pipeline.predict_batch(chunk, probabilities_only=probabilities_only)
+    kept = chunk[[col for col in keep_columns if col in chunk.columns]].astype("string")
+    # Every part must have the same schema, also when a chunk has no invalid (or no valid) rows
+    scores = scores.astype({col: "string" for col in scores.columns if scores[col].dtype == object})
+    result = pd.concat([kept.reset_index(drop=True), scores.reset_index(drop=True)], axis=1)
+
+    tmp_path = part_path.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pandas(result, preserve_index=False), tmp_path)
+    os.replace(tmp_path, part_path)
+    return index, len(result), time.perf_counter() - start
+
+
+def count_rows(path: Path) -> int:
+    """Data rows of a CSV, or of the CSV in a .zip, counted as line breaks.
+
+    Quoted line breaks inside a field are counted too, so this is only
+    used for the progress estimate.
+    """
+    def count(f) -> int:
+        lines, last = 0, b"\n"
+        while block := f.read(COUNT_BLOCK_BYTES):
+            lines += block.count(b"\n")
+            last = block[-1:]
+        # A last line without a line break, minus the header
+        return max(0, lines + (last != b"\n") - 1)
+
+    if str(path).lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            with archive.open(get_zip_member(archive)) as f:
+                return count(f)
+    with open(path, "rb") as f:
+        return count(f)
+
+
+class Progress:
+    """Logs rows scored, rows/s and the ETA at most every `interval` seconds.
+
+    The rate is measured from the first finished chunk, so the workers'
+    start-up and model load do not skew the ETA.
+    """
+
+    def __init__(self, total: int, resumed: int, interval: float):
+        self.total = total
+        self.resumed = resumed
+        self.interval = interval
+        self.rows = 0
+        self.first_done = None
+        self.rows_after_first = 0
+        self.next_report = time.perf_counter() + interval
+
+    @property
+    def rate(self) -> float:
+        if self.first_done is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.first_done
+        return self.rows_after_first / elapsed if elapsed > 0 and self.rows_after_first else 0.0
+
+    def update(self, rows: int):
+        if self.first_done is None:
+            self.first_done = time.perf_counter()
+        else:
+            self.rows_after_first += rows
+        self.rows += rows
+        if time.perf_counter() >= self.next_report:
+            self.report()
+
+    def report(self):
+        self.next_report = time.perf_counter() + self.interval
+        done = self.resumed + self.rows
+        total = max(self.total, done)
+        eta = str(timedelta(seconds=round((total - done) / self.rate))) if self.rate else "unknown"
+        logger.info(f"Scored {done}/{total} rows ({100 * done / max(total, 1):.1f}%), "
+                    f"{self.rate:,.0f} rows/s, ETA {eta}")
+
+
+class BatchScorer:
+    """Scores a CSV too large for memory on a pool of processes.
+
+    The parent process reads the input `chunksize` rows at a time and hands
+    the chunks to `n_workers` spawned workers, each of which loads the model
+    once. A worker writes every chunk it scores to
+    `<output>.parts/part-<chunk>.parquet`. Once all chunks are scored the
+    parts are joined in chunk order, so the output rows follow the input
+    whichever worker finished first. At most two chunks per worker are in
+    flight, which bounds memory.
+
+    The parts are the checkpoints: a run that stopped part way resumes from
+    them when started again with the same input, settings and model. The
+    parts directory is removed after the output is written.
+    """
+
+    def __init__(self, config: BatchScoringConfig, probabilities_only: bool = False):
+        self.config = config
+        self.probabilities_only = probabilities_only
+
+    def get_parallelism(self) -> tuple:
+        threads = max(1, self.config.threads_per_worker)
+        workers = self.config.n_workers or max(1, (os.cpu_count() or 1) // threads)
+        return workers, threads
+
+    @staticmethod
+    def get_parts_dir(output_path: Path) -> Path:
+        return output_path.with_name(output_path.name + ".parts")
+
+    @staticmethod
+    def get_part_path(parts_dir: Path, index: int) -> Path:
+        return parts_dir / f"part-{index:06d}.parquet"
+
+    def get_manifest(self, input_path: Path) -> dict:
+        """What the parts depend on; a resumed run must match it exactly."""
+        prediction = self.config.prediction
+        stat = os.stat(input_path)
+        return {
+            "input": str(Path(input_path).resolve()),
+            "input_size": stat.st_size,
+            "input_mtime_ns": stat.st_mtime_ns,
+            "chunksize": self.config.chunksize,
+            "keep_columns": list(self.config.keep_columns),
+            "probabilities_only": self.probabilities_only,
+            "backend": prediction.backend,
+            "decision_threshold": prediction.decision_threshold,
+            "unknown_category": prediction.unknown_category,
+            "artifact_version": get_pipeline_class(prediction).get_version(prediction),
+        }
+
+    def prepare_parts(self, parts_dir: Path, manifest: dict, restart: bool = False) -> dict:
+        """Rows per chunk index of the parts left by an interrupted run of the same job.
+
+        Parts from another input, settings or model are discarded.
+        """
+        manifest_path = parts_dir / "manifest.json"
+        if not restart and manifest_path.exists() and json.loads(manifest_path.read_text()) == manifest:
+            done = {int(path.stem.split("-")[1]): pq.read_metadata(path).num_rows
+                    for path in parts_dir.glob("part-*.parquet")}
+            if done:
+                logger.info(f"Resuming from {parts_dir}: {len(done)} chunks, {sum(done.values())} rows "
+                            f"already scored")
+            return done
+
+        if parts_dir.exists():
+            reason = "--restart" if restart else "they are from another input, settings or model"
+            logger.info(f"Discarding the checkpoints in {parts_dir}: {reason}")
+            shutil.rmtree(parts_dir)
+        parts_dir.mkdir(parents=True)
+        manifest_path.write_text(json.dumps(manifest, indent=4))
+        return {}
+
+    def read_chunks(self, input_path: Path, done: dict):
+        """(chunk index, DataFrame) for the chunks not scored yet.
+
+        The scored chunks in front of the first missing one are skipped
+        without being parsed; later scored chunks are read and dropped.
+        """
+        prefix = 0
+        while prefix in done:
+            prefix += 1
+        skip = sum(done[index] for index in range(prefix))
+        reader = read_csv_source(input_path, chunksize=self.config.chunksize,
+                                 dtype={col: str for col in self.config.keep_columns},
+                                 skiprows=(lambda i: 0 < i <= skip) if skip else None)
+        for index, chunk in enumerate(reader, start=prefix):
+            if index not in done:
+                yield index, chunk
+
+    def assemble(self, parts_dir: Path, output_path: Path) -> int:
+        """Joins the parts in chunk order into `output_path`, holding one part in memory at a time."""
+        # Zero-padded names sort in chunk order
+        parts = sorted(parts_dir.glob("part-*.parquet"))
+        if not parts:
+            raise ValueError("No rows were scored, the input is empty")
+
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        writer = None
+        rows = 0
+        try:
+            for part in parts:
+                table = pq.read_table(part)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+                writer.write_table(table)
+                rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_path, output_path)
+        return rows
+
+    def score(self, input_path: Path, output_path: Path, restart: bool = False) -> dict:
+        """Scores `input_path` (.csv or .zip) into `output_path` (.parquet).
+
+        Args:
+            restart (bool): ignore the checkpoints of an earlier run
+
+        Returns:
+            dict: rows written, rows scored by this run, seconds and rows/s
+        """
+        input_path, output_path = Path(input_path), Path(output_path)
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input not found: {input_path}")
+        if output_path.suffix != ".parquet":
+            raise ValueError(f"Output must be a .parquet file, got {output_path}")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        start = time.perf_counter()
+        parts_dir = self.get_parts_dir(output_path)
+        done = self.prepare_parts(parts_dir, self.get_manifest(input_path), restart)
+        progress = Progress(count_rows(input_path), sum(done.values()), self.config.progress_interval)
+        workers, threads = self.get_parallelism()
+        logger.info(f"Scoring {input_path} into {output_path}: ~{progress.total} rows, "
+                    f"chunks of {self.config.chunksize}, {workers} workers x {threads} threads")
+
+        # The prediction cache would only hold rows that are never seen again
+        prediction = replace(self.config.prediction, cache_enabled=False)
+        context = multiprocessing.get_context("spawn")
+        pending = set()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker,
+                                     initargs=(prediction, threads)) as pool:
+                for index, chunk in self.read_chunks(input_path, done):
+                    if len(pending) >= 2 * workers:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            progress.update(future.result()[1])
+                    pending.add(pool.submit(score_chunk, index, chunk, self.get_part_path(parts_dir, index),
+                                            self.config.keep_columns, self.probabilities_only))
+                for future in wait(pending).done:
+                    progress.update(future.result()[1])
+        except Exception:
+            logger.error(f"Scoring stopped; the chunks scored so far are kept in {parts_dir}, "
+                         f"run the same command again to resume")
+            raise
+        progress.report()
+
+        rows = self.assemble(parts_dir, output_path)
+        shutil.rmtree(parts_dir)
+        elapsed = time.perf_counter() - start
+        logger.info(f"Wrote {rows} scored rows to {output_path} in {elapsed:.1f} s "
+                    f"({progress.rows / elapsed:,.0f} rows/s)")
+        return {"rows": rows, "scored_rows": progress.rows, "resumed_rows": progress.resumed,
+                "seconds": round(elapsed, 3), "rows_per_s": round(progress.rows / elapsed, 1)}
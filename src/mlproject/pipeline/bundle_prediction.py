@@ -0,0 +1,48 @@
+import os
+import numpy as np
+from pathlib import Path
+from mlproject.entities.config_entity import PredictionConfig
+from mlproject.pipeline.pipelineprediction import ChurnPredictionPipeline
+from mlproject.pipeline.prediction_cache import PredictionCache
+from mlproject.utils.encoding import check_unknown_category
+from mlproject.utils.feature_pipeline import FeaturePipeline
+from mlproject.utils.tree_bundle import TreeEnsemble
+
+
+class BundlePredictionPipeline(ChurnPredictionPipeline):
+    """Scores from the .npz bundle written by ModelExporter.
+
+    Same interface as ChurnPredictionPipeline, but only needs NumPy and
+    pandas: no lightgbm or sklearn import and a single artifact to load.
+    The bundle holds the feature pipeline's arrays next to the trees.
+    """
+
+    def __init__(self, config: PredictionConfig = None, cache: PredictionCache = None):
+        if config is None:
+            from mlproject.config.config import ConfigurationManager
+            config = ConfigurationManager().get_prediction_config()
+
+        self.config = config
+        self.bundle_path = Path(config.bundle_path)
+        if not os.path.exists(self.bundle_path):
+            raise FileNotFoundError(f"Model bundle not found: {self.bundle_path}")
+
+        self.version = self.get_version(config)
+        with np.load(self.bundle_path, allow_pickle=False) as bundle:
+            bundle = dict(bundle)
+        self.check_unchanged(config)
+
+        self.unknown_category = check_unknown_category(config.unknown_category)
+        self.decision_threshold = config.decision_threshold
+        self.set_features(FeaturePipeline.from_arrays(bundle))
+
+        self.model = TreeEnsemble(bundle)
+        self.validator = self.init_validator(config)
+        self.cache = self.init_cache(config, cache)
+
+    @staticmethod
+    def get_artifact_paths(config: PredictionConfig) -> list:
+        return [Path(config.bundle_path)]
+
+    def score(self, processed_data) -> np.ndarray:
+        return self.model.predict_proba(processed_data)
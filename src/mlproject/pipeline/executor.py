@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from mlproject import logger
+from mlproject.pipeline.stages import Stage, get_stage
+from mlproject.utils.common import get_peak_rss_mb
+
+
+RAN = "ran"
+SKIPPED = "skipped"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+def run_stage(name: str, force: bool = False, use_cache: bool = True) -> dict:
+    """Runs one stage, or skips it if its stage manifest is still fresh.
+
+    Meant to run in a fresh worker process, so the peak RSS it reports
+    belongs to this stage alone.
+
+    Returns:
+        dict: status, wall time and peak RSS of the stage
+    """
+    from mlproject.config.config import ConfigurationManager
+    from mlproject.utils.stage_cache import StageCache
+
+    start = time.perf_counter()
+    stage = get_stage(name)
+    config = ConfigurationManager()
+    cache_config = config.get_stage_cache_config()
+    cache = StageCache(cache_config.root_dir) if use_cache and cache_config.enabled else None
+
+    inputs = stage.inputs(config)
+    outputs = stage.outputs(config)
+    sections = stage.sections(config)
+
+    if cache is not None and not force and cache.is_fresh(stage.name, inputs, outputs, sections):
+        logger.info(f">>>>>> stage {stage.title} skipped: inputs unchanged <<<<<<\n\nx==========x")
+        status = SKIPPED
+    else:
+        logger.info(f">>>>>> stage {stage.title} started <<<<<<")
+        if cache is not None:
+            # A run that dies half way must not leave the old manifest looking valid
+            cache.invalidate(stage.name)
+        stage.load_pipeline()().main()
+        if cache is not None:
+            cache.record(stage.name, inputs, outputs, sections)
+        logger.info(f">>>>>> stage {stage.title} completed <<<<<<\n\nx==========x")
+        status = RAN
+
+    return {
+        "status": status,
+        "wall_s": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": round(get_peak_rss_mb(), 1),
+        "pid": os.getpid(),
+    }
+
+
+class PipelineExecutor:
+    """Runs stages in dependency order, independent ones in parallel.
+
+    Every stage runs in its own spawned worker process (one task per
+    worker), so a crash or memory spike stays inside that stage. A stage is
+    submitted as soon as all of its dependencies that are part of this run
+    have finished. When a stage fails, the stages that depend on it are
+    marked blocked, the ones already running finish, and `run` raises after
+    the timing report is written.
+    """
+
+    def __init__(self, stages: list, max_workers: int = 2, forced: set = (), use_cache: bool = True,
+                 report_path: Path = None):
+        self.stages = stages
+        self.max_workers = max(1, max_workers)
+        self.forced = set(forced)
+        self.use_cache = use_cache
+        self.report_path = Path(report_path) if report_path else None
+
+    def pending_dependencies(self, stage: Stage, done: set) -> list:
+        selected = {s.name for s in self.stages}
+        return [dep for dep in stage.depends_on if dep in selected and dep not in done]
+
+    def run(self) -> dict:
+        results = {}
+        done = set()
+        waiting = list(self.stages)
+        running = {}
+        start = time.perf_counter()
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context, max_tasks_per_child=1) as pool:
+            while waiting or running:
+                for stage in list(waiting):
+                    blocked_by = [dep for dep in stage.depends_on
+                                  if results.get(dep, {}).get("status") in (FAILED, BLOCKED)]
+                    if blocked_by:
+                        results[stage.name] = {"status": BLOCKED, "blocked_by": blocked_by}
+                        logger.error(f"Stage {stage.name} not run: {blocked_by} did not complete")
+                        waiting.remove(stage)
+                    elif not self.pending_dependencies(stage, done):
+                        future = pool.submit(run_stage, stage.name, stage.name in self.forced, self.use_cache)
+                        running[future] = (stage, time.perf_counter() - start)
+                        waiting.remove(stage)
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, started = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Stage {stage.name} failed: {e!r}")
+                        result = {"status": FAILED, "error": repr(e)}
+                    result["started_s"] = round(started, 3)
+                    result["finished_s"] = round(time.perf_counter() - start, 3)
+                    result["depends_on"] = list(stage.depends_on)
+                    results[stage.name] = result
+                    done.add(stage.name)
+            total_s = time.perf_counter() - start
+
+        report = self.build_report(results, total_s)
+        self.log_report(report)
+        if self.report_path is not None:
+            os.makedirs(self.report_path.parent, exist_ok=True)
+            with open(self.report_path, "w") as f:
+                json.dump(report, f, indent=4)
+            logger.info(f"Pipeline timing report saved at: {self.report_path}")
+
+        failed = [name for name, result in results.items() if result["status"] == FAILED]
+        if failed:
+            raise RuntimeError(f"Pipeline stages failed: {failed}")
+        return report
+
+    def build_report(self, results: dict, total_s: float) -> dict:
+        stage_s = sum(result.get("wall_s", 0.0) for result in results.values())
+        return {
+            "total_wall_s": round(total_s, 3),
+            "sum_stage_wall_s": round(stage_s, 3),
+            # >1 means stages overlapped
+            "parallelism": round(stage_s / total_s, 2) if total_s else None,
+            "max_workers": self.max_workers,
+            "stages": {stage.name: results[stage.name] for stage in self.stages if stage.name in results},
+        }
+
+    def log_report(self, report: dict):
+        lines = [f"{'stage':<22}{'status':>9}{'start s':>10}{'wall s':>10}{'peak MB':>10}"]
+        for name, result in report["stages"].items():
+            lines.append(f"{name:<22}{result['status']:>9}{result.get('started_s', ''):>10}"
+                         f"{result.get('wall_s', ''):>10}{result.get('peak_rss_mb', ''):>10}")
+        lines.append(f"total wall {report['total_wall_s']} s, summed stage time {report['sum_stage_wall_s']} s")
+        logger.info("Pipeline timing:\n" + "\n".join(lines))
@@ -0,0 +1,30 @@
+# HTML form field (camelCase, see templates/index.html) -> model feature and type
+FORM_FIELDS = {
+    'gender': ('gender', str),
+    'seniorCitizen': ('SeniorCitizen', int),
+    'partner': ('Partner', str),
+    'dependents': ('Dependents', str),
+    'tenure': ('tenure', float),
+    'phoneService': ('PhoneService', str),
+    'multipleLines': ('MultipleLines', str),
+    'internetService': ('InternetService', str),
+    'onlineSecurity': ('OnlineSecurity', str),
+    'onlineBackup': ('OnlineBackup', str),
+    'deviceProtection': ('DeviceProtection', str),
+    'techSupport': ('TechSupport', str),
+    'streamingTV': ('StreamingTV', str),
+    'streamingMovies': ('StreamingMovies', str),
+    'contract': ('Contract', str),
+    'paperlessBilling': ('PaperlessBilling', str),
+    'paymentMethod': ('PaymentMethod', str),
+    'monthlyCharges': ('MonthlyCharges', float),
+    'totalCharges': ('TotalCharges', float),
+}
+
+
+def parse_form(form) -> dict:
+    """Converts the submitted prediction form into one feature record.
+
+    Raises KeyError for a missing field and ValueError for a bad number.
+    """
+    return {feature: cast(form[field]) for field, (feature, cast) in FORM_FIELDS.items()}
@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from mlproject import logger
+
+
+class MicroBatcher:
+    """Groups concurrent single-row requests into vectorized batches.
+
+    `submit` queues one record and waits for its result. A collector task
+    takes the first waiting record, keeps collecting for up to `max_wait_ms`
+    or until `max_batch_size` records are queued, and hands the batch to
+    `score_batch` on a worker thread. The results are fanned back out to the
+    waiting requests in order.
+    """
+
+    def __init__(self, score_batch, max_batch_size: int = 64, max_wait_ms: float = 5.0, workers: int = 2):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.workers = workers
+        self.batches = 0
+        self.rows = 0
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="micro-batch")
+        self._queue = None
+        self._slots = None
+        self._collector = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._collector = asyncio.create_task(self._collect())
+        logger.info(f"Micro-batching started: max_batch_size={self.max_batch_size}, "
+                    f"max_wait_ms={self.max_wait * 1000}, workers={self.workers}")
+
+    async def stop(self):
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+        logger.info(f"Micro-batching stopped after {self.batches} batches, {self.rows} rows")
+
+    async def submit(self, record: dict) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Bound the batches in flight to the worker threads; meanwhile the
+            # queue keeps filling and the next batch gets bigger.
+            await self._slots.acquire()
+            asyncio.create_task(self._run(batch))
+
+    async def _run(self, batch: list):
+        loop = asyncio.get_running_loop()
+        records = [record for record, _ in batch]
+        try:
+            results = await loop.run_in_executor(self._executor, self._score, records)
+            self.batches += 1
+            self.rows += len(records)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def _score(self, records: list) -> list:
+        try:
+            return self.score_batch(records)
+        except Exception:
+            if len(records) == 1:
+                raise
+        # One bad record should not fail its neighbours: score them one by one
+        results = []
+        for record in records:
+            try:
+                results.extend(self.score_batch([record]))
+            except Exception as e:
+                results.append(e)
+        return results
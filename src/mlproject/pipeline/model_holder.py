@@ -0,0 +1,106 @@
+import threading
+import time
+from mlproject import logger
+from mlproject.entities.config_entity import PredictionConfig
+from mlproject.pipeline.pipelineprediction import ChurnPredictionPipeline
+from mlproject.pipeline.prediction_cache import PredictionCache
+
+
+class ModelHolder:
+    """Keeps one loaded ChurnPredictionPipeline per process.
+
+    The artifacts are loaded once and shared by all request threads. Every
+    `reload_interval` seconds the serving manifest written by model export
+    is checked and, once a new model and feature pipeline are both final, a
+    fresh pipeline is loaded and swapped in with a single reference
+    assignment. Half-rewritten artifacts from a running training pipeline
+    are never loaded together. Requests that already hold the old pipeline
+    finish on it; a failed reload keeps the old model serving.
+    """
+
+    def __init__(self, config: PredictionConfig, pipeline_cls=ChurnPredictionPipeline):
+        self.config = config
+        self.pipeline_cls = pipeline_cls
+        self._pipeline = None
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        # One cache outlives reloads; each new pipeline re-binds it to its version
+        self.cache = None
+        if config.cache_enabled:
+            self.cache = PredictionCache(max_size=config.cache_size, ttl=config.cache_ttl)
+
+    @property
+    def version(self):
+        pipeline = self._pipeline
+        return pipeline.version if pipeline is not None else None
+
+    def get(self) -> ChurnPredictionPipeline:
+        pipeline = self._pipeline
+        if pipeline is None:
+            return self.load()
+        if time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._pipeline
+
+    def load(self) -> ChurnPredictionPipeline:
+        with self._lock:
+            if self._pipeline is None:
+                self._pipeline = self.pipeline_cls(self.config, cache=self.cache)
+                self._next_check = time.monotonic() + self.config.reload_interval
+                logger.info(f"Model loaded, version: {self._pipeline.version}")
+            return self._pipeline
+
+    def reload_if_changed(self) -> bool:
+        # Only one thread checks and loads; the others keep serving the current model.
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = time.monotonic() + self.config.reload_interval
+            try:
+                version = self.pipeline_cls.get_version(self.config)
+            except (FileNotFoundError, ValueError) as e:
+                # Artifacts are being rewritten by the training pipeline; model export writes a new
+                # manifest once they are all final
+                logger.debug(f"Not reloading yet: {e}")
+                return False
+            if self._pipeline is not None and version == self._pipeline.version:
+                return False
+
+            try:
+                pipeline = self.pipeline_cls(self.config, cache=self.cache)
+            except Exception as e:
+                logger.exception(f"Model reload failed, keeping version {self.version}: {e}")
+                return False
+
+            self._pipeline = pipeline
+            logger.info(f"Model reloaded, version: {pipeline.version}")
+            return True
+        finally:
+            self._lock.release()
+
+
+def get_pipeline_class(config: PredictionConfig):
+    """Pipeline class for `prediction.backend`: "sklearn" or the NumPy "bundle"."""
+    if config.backend == "bundle":
+        from mlproject.pipeline.bundle_prediction import BundlePredictionPipeline
+        return BundlePredictionPipeline
+    if config.backend == "sklearn":
+        return ChurnPredictionPipeline
+    raise ValueError(f"Unknown prediction backend: {config.backend}")
+
+
+_holder = None
+_holder_lock = threading.Lock()
+
+
+def get_model_holder(config: PredictionConfig = None) -> ModelHolder:
+    """Returns the process-wide ModelHolder, creating it on first use."""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                if config is None:
+                    from mlproject.config.config import ConfigurationManager
+                    config = ConfigurationManager().get_prediction_config()
+                _holder = ModelHolder(config, pipeline_cls=get_pipeline_class(config))
+    return _holder
@@ -1,81 +1,243 @@
 import os
-import joblib
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from mlproject.utils.common import read_yaml
+from mlproject.utils.common import read_yaml, get_artifact_version
+from mlproject.utils.classification_metrics import predict_positive
+from mlproject.utils.encoding import check_unknown_category
+from mlproject.utils.feature_pipeline import feature_pipeline_paths, load_feature_pipeline
+from mlproject.utils.serving_manifest import read_serving_manifest, verify_serving_manifest
 from mlproject.constants import *
+from mlproject.entities.config_entity import PredictionConfig
+from mlproject.pipeline.prediction_cache import PredictionCache
+from mlproject.utils.schema_validator import SchemaValidator
+from mlproject.utils.tree_bundle import sigmoid
+from mlproject.utils.metrics import (BATCH_ROWS, CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES, ENCODING_SECONDS,
+                                     INVALID_ROWS, PREDICTED_ROWS, SCORING_SECONDS, TRANSFORM_SECONDS,
+                                     VALIDATION_SECONDS)
+from mlproject import logger
 
 
 class ChurnPredictionPipeline:
-    def __init__(self):
-        self.schema = read_yaml(Path('schema.yaml'))
-        self.preprocessor_path = Path('artifacts/data_transformation/preprocessor.pkl')
-        self.model_path = Path('artifacts/model_trainer/model.joblib')
-        self.label_encoders_path = Path('artifacts/data_transformation/label_encoders.pkl')
-        
-        self.num_cols = self.schema.num_cols
-        self.cat_cols = self.schema.cat_cols
+    def __init__(self, config: PredictionConfig = None, cache: PredictionCache = None):
+        if config is None:
+            from mlproject.config.config import ConfigurationManager
+            config = ConfigurationManager().get_prediction_config()
+
+        self.config = config
+        self.schema = read_yaml(Path(config.schema_path))
+        self.model_path = Path(config.model_path)
         self.target_column = self.schema.TARGET_COLUMN.name
-    
 
-        if not os.path.exists(self.preprocessor_path):
-            raise FileNotFoundError(f"Preprocessor file not found: {self.preprocessor_path}")
         if not os.path.exists(self.model_path):
             raise FileNotFoundError(f"Model file not found: {self.model_path}")
-        if not os.path.exists(self.label_encoders_path):
-            raise FileNotFoundError(f"Label encoders file not found: {self.label_encoders_path}")
 
-        self.preprocessor = joblib.load(self.preprocessor_path)
+        # joblib (and through the pickle sklearn and lightgbm) is only needed by this backend
+        import joblib
+
+        self.version = self.get_version(config)
         self.model = joblib.load(self.model_path)
-        self.label_encoders = joblib.load(self.label_encoders_path) 
+        self.unknown_category = check_unknown_category(config.unknown_category)
+        self.decision_threshold = config.decision_threshold
+        self.set_features(load_feature_pipeline(config.feature_pipeline_path, config.preprocessor_path,
+                                                config.label_encoder, self.schema.cat_cols, self.target_column))
+        self.check_unchanged(config)
+
+        self.validator = self.init_validator(config, self.schema)
+        self.cache = self.init_cache(config, cache)
+
+    def set_features(self, features):
+        """Binds the fitted FeaturePipeline that turns request columns into the model's matrix."""
+        self.features = features
+        self.input_features = features.input_features
+        self.num_cols = features.num_cols
+        self.cat_cols = features.cat_cols
+        self.category_lookup = features.category_lookup
+        self.target_classes = features.target_classes
+
+    def init_validator(self, config: PredictionConfig, schema=None):
+        """Type and range checks on the model inputs, compiled once from schema.yaml.
+
+        Missing numbers are filled by the feature pipeline and unseen
+        categories follow `unknown_category`, so neither is checked here.
+        """
+        if not config.validate_input:
+            return None
+        if schema is None:
+            schema = read_yaml(Path(config.schema_path))
+        return SchemaValidator.from_schema(schema, columns=self.input_features,
+                                           check_nulls=False, check_domains=False)
+
+    def init_cache(self, config: PredictionConfig, cache: PredictionCache = None):
+        """Binds the shared cache, or creates one when `prediction.cache_enabled` is set."""
+        if cache is None and config.cache_enabled:
+            cache = PredictionCache(max_size=config.cache_size, ttl=config.cache_ttl)
+        if cache is not None:
+            cache.bind_version(self.version)
+        return cache
+
+    @staticmethod
+    def get_artifact_paths(config: PredictionConfig) -> list:
+        return [*feature_pipeline_paths(config.feature_pipeline_path, config.preprocessor_path, config.label_encoder),
+                Path(config.model_path)]
+
+    @classmethod
+    def get_version(cls, config: PredictionConfig) -> str:
+        """Version of the artifacts to serve.
+
+        With the serving manifest written by model export, its version,
+        once every artifact this backend reads matches the recorded sha256;
+        a ValueError while training is rewriting them. Runs without a
+        manifest fall back to the files' mtimes and sizes.
+        """
+        paths = cls.get_artifact_paths(config)
+        manifest = read_serving_manifest(config.manifest_path)
+        if manifest is None:
+            return get_artifact_version(paths)
+        return verify_serving_manifest(manifest, paths)
+
+    def check_unchanged(self, config: PredictionConfig):
+        """Fails the load if the artifacts were rewritten while they were being read."""
+        version = self.get_version(config)
+        if version != self.version:
+            raise ValueError(f"Artifacts changed while loading: {self.version} -> {version}")
 
     def preprocess_input(self, input_data):
-        
-        if not isinstance(input_data, pd.DataFrame):
-            raise ValueError("Input data must be a pandas DataFrame.")
-        
-        data = input_data.copy()
-        
-        for column in self.cat_cols:
-            if column in data.columns and column in self.label_encoders:
-                    data[column] = self.label_encoders[column].transform(data[column].astype(str))
-        
-        for column in self.num_cols:
-            if column in data.columns:
-                data[column] = data[column].astype(float)
-        
+        """Model matrix for the raw input: one encode and one scaling pass over a float64 block."""
+        with ENCODING_SECONDS.time():
+            block = self.features.encode(input_data, self.unknown_category)
+        with TRANSFORM_SECONDS.time():
+            return self.features.scale_block(block)
+
+    def score(self, processed_data) -> np.ndarray:
+        """Returns the churn probability per row from a single pass over the trees."""
+        booster = getattr(self.model, "booster_", None)
+        if booster is not None and booster.params.get("objective", "binary") == "binary":
+            raw_score = booster.predict(processed_data, raw_score=True)
+            # The same libm sigmoid as the bundle backend, so both return identical floats
+            return sigmoid(raw_score, float(booster.params.get("sigmoid", 1.0)))
+
+        probabilities = self.model.predict_proba(processed_data)
+        positive_class_index = 1 if probabilities.shape[1] > 1 else 0
+        return probabilities[:, positive_class_index]
+
+    def cache_keys(self, input_data: pd.DataFrame) -> list:
+        """Feature tuple per row, normalized the way the model reads it, for cache lookups."""
+        columns = []
+        for col in self.input_features:
+            values = input_data[col].to_numpy()
+            if col in self.category_lookup:
+                columns.append(values.astype(str).tolist())
+            else:
+                if values.dtype.kind not in 'biuf':
+                    values = pd.to_numeric(input_data[col], errors='coerce').to_numpy()
+                values = values.astype(float)
+                column = values.tolist()
+                # NaN != NaN, so a NaN in the key would never hit; every missing value keys as None
+                for i in np.flatnonzero(np.isnan(values)):
+                    column[i] = None
+                columns.append(column)
+        return list(zip(*columns))
+
+    def predict_probability(self, input_data: pd.DataFrame) -> tuple:
+        """Churn probability and validation error per row.
+
+        Rows that fail validation are not scored: their probability is NaN
+        and their error lists the failed checks. Valid rows have error None.
+        """
+        errors = np.full(len(input_data), None, dtype=object)
+        if self.validator is None:
+            return self.score_rows(input_data), errors
+
+        with VALIDATION_SECONDS.time():
+            valid, reasons = self.validator.check_rows(input_data)
+        if valid.all():
+            return self.score_rows(input_data), errors
+
+        INVALID_ROWS.inc(int((~valid).sum()))
+        errors[~valid] = reasons[~valid]
+        probability = np.full(len(input_data), np.nan)
+        if valid.any():
+            probability[valid] = self.score_rows(input_data[valid])
+        return probability, errors
+
+    def score_rows(self, input_data: pd.DataFrame) -> np.ndarray:
+        """Churn probability per row, scoring only the rows missing from the cache."""
+        if self.cache is None:
+            processed_data = self.preprocess_input(input_data)
+            with SCORING_SECONDS.time():
+                return self.score(processed_data).astype(float)
+
+        missing = [col for col in self.input_features if col not in input_data.columns]
+        if missing:
+            raise ValueError(f"Input data is missing columns: {missing}")
+
+        keys = self.cache_keys(input_data)
+        cached = self.cache.get_many(keys, self.version)
+        miss = np.array([value is None for value in cached])
+        probability = np.array([np.nan if value is None else value for value in cached], dtype=float)
+        misses = int(miss.sum())
+        CACHE_MISSES.inc(misses)
+        CACHE_HITS.inc(len(miss) - misses)
+
+        if misses:
+            processed_data = self.preprocess_input(input_data[miss])
+            with SCORING_SECONDS.time():
+                scored = self.score(processed_data).astype(float)
+            probability[miss] = scored
+            evicted = self.cache.put_many([keys[i] for i in np.flatnonzero(miss)], scored.tolist(), self.version)
+            CACHE_EVICTIONS.inc(evicted)
+        return probability
+
+    def predict_batch(self, input_data, probabilities_only: bool = False) -> pd.DataFrame:
+        """Scores many rows with one encoding, transform and model call.
+
+        Args:
+            input_data: DataFrame or list of record dicts with the raw features
+            probabilities_only (bool): skip the class decision and label decoding
+
+        Returns:
+            pd.DataFrame: churn_status, churn_probability and error per input
+                          row; rows that failed validation have an error and
+                          no status or probability
+        """
+        if isinstance(input_data, list):
+            input_data = pd.DataFrame.from_records(input_data)
+        BATCH_ROWS.observe(len(input_data))
+        PREDICTED_ROWS.inc(len(input_data))
+
         try:
-            processed_data = self.preprocessor.transform(data)
-            return processed_data
+            churn_probability, errors = self.predict_probability(input_data)
+
+            if probabilities_only:
+                return pd.DataFrame({"churn_probability": churn_probability, "error": errors},
+                                    index=input_data.index)
+
+            prediction_result = predict_positive(churn_probability, self.decision_threshold).astype(int)
+
+            # Decode the predictions using the label encoder if available
+            if self.target_classes is not None:
+                churn_status = self.target_classes[prediction_result]
+            else:
+                churn_status = np.where(prediction_result == 1, "Yes", "No")
+            churn_status = np.where(pd.isna(errors), churn_status, None)
+
+            return pd.DataFrame({
+                "churn_status": churn_status,
+                "churn_probability": churn_probability,
+                "error": errors
+            }, index=input_data.index)
+
         except Exception as e:
-            print(f"Error during preprocessing: {str(e)}")
+            logger.error(f"Error during prediction: {str(e)}")
             raise
 
     def predict(self, input_data):
         
-        try:
-            processed_data = self.preprocess_input(input_data)
-            
-            
-            prediction_result = int(self.model.predict(processed_data)[0])
-            probabilities = self.model.predict_proba(processed_data)[0]
-            
-            # Get the class probabilities
-            positive_class_index = 1 if len(probabilities) > 1 else 0
-            churn_probability = probabilities[positive_class_index]
-            
-            # Decode the prediction using the label encoder if available
-            if self.target_column in self.label_encoders:
-                churn_status = self.label_encoders[self.target_column].inverse_transform([prediction_result])[0]
-            else:
-                churn_status = "Yes" if prediction_result == 1 else "No"
-            
-            return {
-                "churn_status": churn_status,
-                "churn_probability": float(churn_probability)
-            }
-            
-        except Exception as e:
-            print(f"Error during prediction: {str(e)}")
-            raise
\ No newline at end of file
+        result = self.predict_batch(input_data).iloc[0]
+        if result["error"] is not None:
+            raise ValueError(f"Input failed schema validation: {result['error']}")
+        return {
+            "churn_status": result["churn_status"],
+            "churn_probability": float(result["churn_probability"])
+        }
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Bounded LRU cache of churn probabilities with an optional TTL.
+
+    Entries belong to one model version: `bind_version` drops everything when
+    the artifacts change, and results computed by an older pipeline are not
+    stored after a newer one has been bound.
+    """
+
+    def __init__(self, max_size: int = 100000, ttl: float = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bind_version(self, version: str):
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+    def get_many(self, keys, version: str) -> list:
+        """Returns the cached probability per key, None for a miss."""
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            current = version == self.version
+            for key in keys:
+                entry = self._entries.get(key) if current else None
+                if entry is not None and entry[1] is not None and entry[1] < now:
+                    del self._entries[key]
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    results.append(entry[0])
+        return results
+
+    def put_many(self, keys, values, version: str) -> int:
+        """Stores the probabilities and returns how many old entries were evicted to fit them."""
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        evicted = 0
+        with self._lock:
+            if version != self.version:
+                return 0
+            for key, value in zip(keys, values):
+                self._entries[key] = (value, expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+        return evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "version": self.version,
+            }
@@ -12,7 +12,11 @@ class DataValidationTrainingPipeline:
         config = ConfigurationManager()
         data_validation_config = config.get_data_validation_config()
         data_validation = DataValiadtion(config=data_validation_config)
-        data_validation.validate_all_columns()
+        status = data_validation.validate_all_columns()
+        # Transformation runs alongside validation, so the gate is here:
+        # a failed stage stops everything that depends on it
+        if not status:
+            raise Exception("You data schema is not valid")
 
 
 
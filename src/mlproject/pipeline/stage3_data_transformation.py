@@ -1,7 +1,6 @@
 from mlproject.config.config import ConfigurationManager
 from mlproject.components.data_transformation import DataTransformation
 from mlproject import logger
-from pathlib import Path
 
 
 
@@ -13,18 +12,14 @@ class DataTransformationTrainingPipeline:
 
 
     def main(self):
-            with open(Path("artifacts/data_validation/status.txt"), "r") as f:
-                status = f.read().split(" ")[-1]
-
-            if status == "True":
-                config = ConfigurationManager()
-                data_transformation_config = config.get_data_transformation_config()
-                data_transformation = DataTransformation(config=data_transformation_config)
+            config = ConfigurationManager()
+            data_transformation_config = config.get_data_transformation_config()
+            data_transformation = DataTransformation(config=data_transformation_config)
+            if data_transformation_config.streaming:
+                data_transformation.streaming_transform()
+            else:
                 train,test = data_transformation.train_test_spliting()
                 train_processed, test_processed = data_transformation.preprocess_features(train, test)
 
-            else:
-                raise Exception("You data schema is not valid")
-
 
 
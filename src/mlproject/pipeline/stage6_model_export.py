@@ -0,0 +1,16 @@
+from mlproject.config.config import ConfigurationManager
+from mlproject.components.model_export import ModelExporter
+
+
+
+class ModelExportTrainingPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        config = ConfigurationManager()
+        model_export_config = config.get_model_export_config()
+        model_exporter = ModelExporter(config=model_export_config)
+        model_exporter.export()
+
+
@@ -0,0 +1,20 @@
+from mlproject.config.config import ConfigurationManager
+from mlproject.components.model_tuning import ModelTuner
+from mlproject import logger
+
+
+
+class ModelTuningTrainingPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        config = ConfigurationManager()
+        if not config.params.tuning.enabled:
+            logger.info("Tuning disabled in params.yaml, training will use the LGBMClassifier values")
+            return
+        model_tuning_config = config.get_model_tuning_config()
+        model_tuner = ModelTuner(config=model_tuning_config)
+        model_tuner.tune()
+
+
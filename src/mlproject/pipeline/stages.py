@@ -0,0 +1,220 @@
+import importlib
+from dataclasses import dataclass
+from typing import Callable
+from mlproject.config.config import ConfigurationManager
+
+
+COMPONENTS_DIR = "src/mlproject/components"
+FEATURE_PIPELINE_MODULE = "src/mlproject/utils/feature_pipeline.py"
+BALANCING_MODULE = "src/mlproject/utils/balancing.py"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A training pipeline stage and what it reads and writes.
+
+    `inputs` and `outputs` return file paths and `sections` the config,
+    params and schema sections the stage depends on; all three take the
+    ConfigurationManager so paths always follow config.yaml. `pipeline` is
+    a "module:Class" path, imported only when the stage actually runs, so a
+    skipped stage costs none of its heavy imports. `depends_on` names the
+    stages that must finish first; stages with no path between them may run
+    at the same time.
+    """
+    name: str
+    title: str
+    pipeline: str
+    inputs: Callable
+    outputs: Callable
+    sections: Callable
+    depends_on: tuple = ()
+
+    def load_pipeline(self):
+        module, cls = self.pipeline.split(":")
+        return getattr(importlib.import_module(module), cls)
+
+
+def ingestion_outputs(cm: ConfigurationManager) -> list:
+    return [cm.config.data_ingestion.local_data_file]
+
+
+def validation_outputs(cm: ConfigurationManager) -> list:
+    return [cm.config.data_validation.STATUS_FILE, cm.config.data_validation.report_file]
+
+
+def transformation_outputs(cm: ConfigurationManager) -> list:
+    config = cm.config.data_transformation
+    trainer = cm.config.model_trainer
+    tuning = cm.config.model_tuning
+    return [config.feature_pipeline_path,
+            cm.config.model_evaluation.test_raw_data,
+            trainer.train_data_path, trainer.train_target_path,
+            trainer.test_data_path, trainer.test_target_path,
+            tuning.train_data_path, tuning.train_target_path]
+
+
+def tuning_inputs(cm: ConfigurationManager) -> list:
+    if not cm.params.tuning.enabled:
+        return []
+    config = cm.config.model_tuning
+    return [config.train_data_path, config.train_target_path, config.feature_pipeline_path,
+            f"{COMPONENTS_DIR}/model_tuning.py", BALANCING_MODULE]
+
+
+def tuning_outputs(cm: ConfigurationManager) -> list:
+    return [cm.config.model_tuning.best_params_path] if cm.params.tuning.enabled else []
+
+
+def tuning_sections(cm: ConfigurationManager) -> dict:
+    # Disabled, the stage does nothing, so only switching it on (or the balancing) should re-run it
+    if not cm.params.tuning.enabled:
+        return {"tuning": cm.params.tuning, "balancing": cm.params.balancing}
+    return {"model_tuning": cm.config.model_tuning, "tuning": cm.params.tuning,
+            "LGBMClassifier": cm.params.LGBMClassifier, "balancing": cm.params.balancing}
+
+
+def training_inputs(cm: ConfigurationManager) -> list:
+    config = cm.config.model_trainer
+    return [config.train_data_path, config.train_target_path,
+            config.test_data_path, config.test_target_path,
+            *tuning_outputs(cm),
+            f"{COMPONENTS_DIR}/data_modeltraining.py"]
+
+
+def training_outputs(cm: ConfigurationManager) -> list:
+    config = cm.config.model_trainer
+    return [f"{config.root_dir}/{config.model_name}"]
+
+
+def evaluation_outputs(cm: ConfigurationManager) -> list:
+    return [cm.config.model_evaluation.metric_file_path, cm.config.model_evaluation.report_path,
+            cm.config.model_evaluation.predictions_path]
+
+
+def schema_sections(cm: ConfigurationManager) -> dict:
+    schema = cm.schema
+    return {"columns_to_drop": schema.columns_to_drop, "num_cols": schema.num_cols,
+            "cat_cols": schema.cat_cols, "TARGET_COLUMN": schema.TARGET_COLUMN}
+
+
+STAGES = [
+    Stage(
+        name="data_ingestion",
+        title="Data Ingestion stage",
+        pipeline="mlproject.pipeline.stage1_data_ingestion:DataIngestionTrainingPipeline",
+        inputs=lambda cm: [f"{COMPONENTS_DIR}/data_ingestion.py"],
+        outputs=ingestion_outputs,
+        sections=lambda cm: {"data_ingestion": cm.config.data_ingestion},
+    ),
+    Stage(
+        name="data_validation",
+        title="Data Validation stage",
+        pipeline="mlproject.pipeline.stage2_data_validation:DataValidationTrainingPipeline",
+        inputs=lambda cm: [cm.config.data_validation.unzip_data_dir,
+                           f"{COMPONENTS_DIR}/data_validation.py",
+                           "src/mlproject/utils/schema_validator.py"],
+        outputs=validation_outputs,
+        sections=lambda cm: {"data_validation": cm.config.data_validation, "COLUMNS": cm.schema.COLUMNS,
+                             "CONSTRAINTS": cm.schema.get("CONSTRAINTS")},
+        depends_on=("data_ingestion",),
+    ),
+    Stage(
+        name="data_transformation",
+        title="Data Transformation stage",
+        pipeline="mlproject.pipeline.stage3_data_transformation:DataTransformationTrainingPipeline",
+        inputs=lambda cm: [cm.config.data_transformation.data_path,
+                           f"{COMPONENTS_DIR}/data_transformation.py",
+                           FEATURE_PIPELINE_MODULE, BALANCING_MODULE],
+        outputs=transformation_outputs,
+        sections=lambda cm: {"data_transformation": cm.config.data_transformation,
+                             "balancing": cm.params.balancing, **schema_sections(cm)},
+        depends_on=("data_ingestion",),
+    ),
+    Stage(
+        name="model_tuning",
+        title="Model Tuning stage",
+        pipeline="mlproject.pipeline.stage7_model_tuning:ModelTuningTrainingPipeline",
+        inputs=tuning_inputs,
+        outputs=tuning_outputs,
+        sections=tuning_sections,
+        depends_on=("data_transformation",),
+    ),
+    Stage(
+        name="model_training",
+        title="Model Trainer stage",
+        pipeline="mlproject.pipeline.stage4_modeltraining:ModelTrainerTrainingPipeline",
+        inputs=training_inputs,
+        outputs=training_outputs,
+        sections=lambda cm: {"model_trainer": cm.config.model_trainer,
+                             "LGBMClassifier": cm.params.LGBMClassifier,
+                             "tuning_enabled": cm.params.tuning.enabled,
+                             "balancing_strategy": cm.params.balancing.strategy, **schema_sections(cm)},
+        depends_on=("data_validation", "data_transformation", "model_tuning"),
+    ),
+    Stage(
+        name="model_export",
+        title="Model Export stage",
+        pipeline="mlproject.pipeline.stage6_model_export:ModelExportTrainingPipeline",
+        inputs=lambda cm: [cm.config.model_export.model_path,
+                           cm.config.model_export.feature_pipeline_path,
+                           f"{COMPONENTS_DIR}/model_export.py",
+                           FEATURE_PIPELINE_MODULE],
+        outputs=lambda cm: [cm.config.model_export.bundle_path, cm.config.model_export.manifest_path],
+        sections=lambda cm: {"model_export": cm.config.model_export, **schema_sections(cm)},
+        depends_on=("model_training",),
+    ),
+    Stage(
+        name="model_evaluation",
+        title="Model Evaluation stage",
+        pipeline="mlproject.pipeline.stage5_data_evalution:ModelEvaluationTrainingPipeline",
+        inputs=lambda cm: [cm.config.model_evaluation.model_path,
+                           cm.config.model_evaluation.feature_pipeline_path,
+                           cm.config.model_evaluation.test_raw_data,
+                           f"{COMPONENTS_DIR}/data_modelevaluation.py",
+                           FEATURE_PIPELINE_MODULE,
+                           "src/mlproject/utils/classification_metrics.py"],
+        outputs=evaluation_outputs,
+        sections=lambda cm: {"model_evaluation": cm.config.model_evaluation,
+                             "LGBMClassifier": cm.params.LGBMClassifier,
+                             "evaluation": cm.params.evaluation,
+                             "TARGET_COLUMN": cm.schema.TARGET_COLUMN},
+        depends_on=("model_training",),
+    ),
+]
+
+
+def get_stage(name: str) -> Stage:
+    for stage in STAGES:
+        if stage.name == name:
+            return stage
+    raise ValueError(f"Unknown stage '{name}', expected one of {[stage.name for stage in STAGES]}")
+
+
+def downstream_of(name: str) -> list:
+    """The named stage and every stage that depends on it, directly or not."""
+    names = [get_stage(name).name]
+    for stage in STAGES:
+        if any(dep in names for dep in stage.depends_on) and stage.name not in names:
+            names.append(stage.name)
+    return names
+
+
+def select_stages(stage: list = None, from_stage: str = None, force: list = None) -> tuple:
+    """Stages to run and the ones re-run even when cached, for main.py's --stage, --from-stage and --force.
+
+    Returns:
+        tuple: stage names in pipeline order, set of forced stage names
+    """
+    names = [s.name for s in STAGES]
+    forced = set()
+    if from_stage:
+        # The stage and everything downstream of it, re-run even if cached
+        names = downstream_of(from_stage)
+        forced = set(names)
+    if stage:
+        names = [name for name in names if name in stage]
+    # --force with no names forces every selected stage
+    forced |= set(names if force == [] else force or [])
+    for name in forced:
+        get_stage(name)
+    return names, forced
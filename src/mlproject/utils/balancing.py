@@ -0,0 +1,181 @@
+import time
+import numpy as np
+from mlproject import logger
+from mlproject.entities.config_entity import BalancingConfig
+
+
+def class_targets(y: np.ndarray, ratio: float, grow: bool) -> dict:
+    """Rows wanted per class: every class grows to `ratio` x the largest, or shrinks to the smallest / `ratio`."""
+    classes, counts = np.unique(y, return_counts=True)
+    if grow:
+        target = int(round(counts.max() * ratio))
+        return {cls: max(count, target) for cls, count in zip(classes, counts)}
+    target = int(round(counts.min() / ratio))
+    return {cls: min(count, target) for cls, count in zip(classes, counts)}
+
+
+class NoBalancing:
+    """Strategy `none`, and the base of the others: the training split is kept as it is."""
+
+    name = "none"
+
+    def fit_resample(self, X: np.ndarray, y: np.ndarray) -> tuple:
+        return X, y
+
+
+class ClassWeightBalancing(NoBalancing):
+    """Strategy `class_weight`: no resampling; training and tuning fit LightGBM with class_weight="balanced"."""
+
+    name = "class_weight"
+
+
+class RandomUndersampling(NoBalancing):
+    """Strategy `undersample`: a random subset of the larger classes, original row order kept."""
+
+    name = "undersample"
+
+    def __init__(self, ratio: float = 1.0, random_state: int = 42):
+        self.ratio = ratio
+        self.random_state = random_state
+
+    def fit_resample(self, X: np.ndarray, y: np.ndarray) -> tuple:
+        rng = np.random.default_rng(self.random_state)
+        keep = []
+        for cls, target in class_targets(y, self.ratio, grow=False).items():
+            rows = np.flatnonzero(y == cls)
+            keep.append(rows if target >= len(rows) else rng.choice(rows, size=target, replace=False))
+        keep = np.sort(np.concatenate(keep))
+        return X[keep], y[keep]
+
+
+class ApproximateSMOTE(NoBalancing):
+    """Strategy `smote`: SMOTE oversampling with an approximate, block-wise neighbour search.
+
+    Exact k-NN over n minority rows costs O(n^2). Here the rows of a class
+    are sorted along `n_projections` random directions and cut into windows
+    of `block_size` rows; neighbours are searched exactly inside each window
+    and the best k across projections are kept. Consecutive projections
+    shift the windows by half a block so no row is always at an edge. The
+    search costs O(n * block_size) time and O(block_size^2) extra memory,
+    and is exact when a class fits in one block.
+
+    Synthetic rows are generated `chunk_size` at a time. Numeric columns are
+    interpolated between a row and one of its neighbours; columns in
+    `categorical` take the value of whichever of the two is nearer, so no
+    category is invented.
+    """
+
+    name = "smote"
+
+    def __init__(self, ratio: float = 1.0, k_neighbors: int = 5, block_size: int = 2048, n_projections: int = 3,
+                 chunk_size: int = 100_000, random_state: int = 42, categorical: list = ()):
+        self.ratio = ratio
+        self.k_neighbors = k_neighbors
+        self.block_size = block_size
+        self.n_projections = n_projections
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+        self.categorical = list(categorical)
+
+    def neighbors(self, X: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Indices of (approximately) the k nearest rows of every row, on standardized columns."""
+        n = len(X)
+        k = min(self.k_neighbors, n - 1)
+        std = X.std(axis=0)
+        Z = ((X - X.mean(axis=0)) / np.where(std > 0, std, 1.0)).astype(np.float32)
+        norms = np.einsum("ij,ij->i", Z, Z)
+
+        best_dist = np.full((n, k), np.inf, dtype=np.float32)
+        # -1 marks an empty slot; 0 would be taken for row 0 and keep it out of every neighbour list
+        best_index = np.full((n, k), -1, dtype=np.int64)
+        projections = 1 if n <= self.block_size else self.n_projections
+        for p in range(projections):
+            order = np.argsort(Z @ rng.standard_normal(Z.shape[1]).astype(np.float32), kind="stable")
+            offset = (self.block_size // 2) * (p % 2)
+            bounds = np.r_[0, np.arange(offset or self.block_size, n, self.block_size), n]
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                rows = order[start:end]
+                m = len(rows)
+                if m < 2:
+                    continue
+                dist = norms[rows][:, None] + norms[rows][None, :] - 2 * Z[rows] @ Z[rows].T
+                np.fill_diagonal(dist, np.inf)
+                kk = min(k, m - 1)
+                nearest = np.argpartition(dist, kk - 1, axis=1)[:, :kk]
+                candidate_dist = np.take_along_axis(dist, nearest, axis=1)
+                candidate_index = rows[nearest]
+                # A neighbour found again in a later projection must not take two slots
+                known = (candidate_index[:, :, None] == best_index[rows][:, None, :]).any(axis=2)
+                candidate_dist[known] = np.inf
+
+                merged_dist = np.concatenate([best_dist[rows], candidate_dist], axis=1)
+                merged_index = np.concatenate([best_index[rows], candidate_index], axis=1)
+                keep = np.argsort(merged_dist, axis=1, kind="stable")[:, :k]
+                best_dist[rows] = np.take_along_axis(merged_dist, keep, axis=1)
+                best_index[rows] = np.take_along_axis(merged_index, keep, axis=1)
+
+        # Rows that only met smaller windows than k + 1 rows: a row with no neighbour at all is
+        # searched against the whole class, other empty slots repeat the nearest neighbour found
+        lonely = np.flatnonzero(best_index[:, 0] < 0)
+        if len(lonely):
+            dist = norms[lonely][:, None] + norms[None, :] - 2 * Z[lonely] @ Z.T
+            dist[np.arange(len(lonely)), lonely] = np.inf
+            best_index[lonely] = np.argsort(dist, axis=1, kind="stable")[:, :k]
+        return np.where(best_index < 0, best_index[:, :1], best_index)
+
+    def synthesize(self, X: np.ndarray, n_new: int, rng: np.random.Generator) -> np.ndarray:
+        neighbors = self.neighbors(X, rng)
+        synthetic = np.empty((n_new, X.shape[1]), dtype=X.dtype)
+        for start in range(0, n_new, self.chunk_size):
+            size = min(self.chunk_size, n_new - start)
+            base = rng.integers(0, len(X), size=size)
+            other = neighbors[base, rng.integers(0, neighbors.shape[1], size=size)]
+            gap = rng.random(size)[:, None]
+            chunk = X[base] + gap * (X[other] - X[base])
+            if self.categorical:
+                chunk[:, self.categorical] = np.where(gap < 0.5, X[base][:, self.categorical],
+                                                      X[other][:, self.categorical])
+            synthetic[start:start + size] = chunk
+        return synthetic
+
+    def fit_resample(self, X: np.ndarray, y: np.ndarray) -> tuple:
+        rng = np.random.default_rng(self.random_state)
+        parts_x, parts_y = [X], [y]
+        for cls, target in class_targets(y, self.ratio, grow=True).items():
+            rows = np.flatnonzero(y == cls)
+            n_new = target - len(rows)
+            if n_new <= 0:
+                continue
+            if len(rows) < 2:
+                logger.warning(f"Class {cls} has {len(rows)} row, too few for SMOTE; left as it is")
+                continue
+            parts_x.append(self.synthesize(X[rows], n_new, rng))
+            parts_y.append(np.full(n_new, cls, dtype=y.dtype))
+        return np.concatenate(parts_x), np.concatenate(parts_y)
+
+
+def get_balancer(config: BalancingConfig, categorical: list = ()):
+    """Balancer for `balancing.strategy`: "smote", "undersample", "class_weight" or "none"."""
+    if config.strategy == "smote":
+        return ApproximateSMOTE(ratio=config.ratio, k_neighbors=config.k_neighbors, block_size=config.block_size,
+                                n_projections=config.n_projections, chunk_size=config.chunk_size,
+                                random_state=config.random_state, categorical=categorical)
+    if config.strategy == "undersample":
+        return RandomUndersampling(ratio=config.ratio, random_state=config.random_state)
+    if config.strategy == "class_weight":
+        return ClassWeightBalancing()
+    if config.strategy == "none":
+        return NoBalancing()
+    raise ValueError(f"Unknown balancing strategy: {config.strategy}")
+
+
+def balance(balancer, X: np.ndarray, y: np.ndarray) -> tuple:
+    """Runs `balancer` on a training block and logs its row counts and wall time."""
+    start = time.perf_counter()
+    X_balanced, y_balanced = balancer.fit_resample(X, y)
+    elapsed = time.perf_counter() - start
+    before = {int(cls): int(count) for cls, count in zip(*np.unique(y, return_counts=True))}
+    after = {int(cls): int(count) for cls, count in zip(*np.unique(y_balanced, return_counts=True))}
+    logger.info(f"Balancing '{balancer.name}': {len(y)} -> {len(y_balanced)} rows, "
+                f"class counts {before} -> {after}, {elapsed:.3f} s")
+    return X_balanced, y_balanced
@@ -0,0 +1,214 @@
+import numpy as np
+
+
+# Bootstrap weights are built in blocks of at most this many cells (resamples x rows)
+BOOTSTRAP_BLOCK_CELLS = 4_000_000
+
+
+def safe_divide(numerator, denominator):
+    """Elementwise ratio that is 0 where the denominator is 0, like sklearn's zero_division=0."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+def predict_positive(scores, threshold: float) -> np.ndarray:
+    """The decision rule used for evaluation and serving: positive when the score is >= the threshold."""
+    return np.asarray(scores, dtype=float) >= threshold
+
+
+class BinaryEvaluator:
+    """Binary classification metrics from a single sort of the scores.
+
+    Scores are sorted once in descending order and reduced to cumulative
+    true and false positive counts at every distinct score. ROC-AUC,
+    average precision, the confusion matrix at any threshold, the threshold
+    sweep and the lift table are all read from those arrays. Bootstrap
+    resamples reuse the same order: a resample is a vector of row counts,
+    so a block of resamples is a weight matrix whose row-wise cumulative
+    sums give every replicate's curves at once.
+
+    A row is predicted positive when its score is >= the threshold, as in
+    `predict_positive`.
+    """
+
+    def __init__(self, y_true, scores):
+        y_true = np.asarray(y_true, dtype=float).ravel()
+        scores = np.asarray(scores, dtype=float).ravel()
+        if y_true.shape != scores.shape:
+            raise ValueError(f"y_true and scores differ in length: {len(y_true)} vs {len(scores)}")
+        if not np.isin(y_true, (0.0, 1.0)).all():
+            raise ValueError("y_true must hold 0/1 labels")
+
+        order = np.argsort(-scores, kind="stable")
+        self.y = y_true[order]
+        self.scores = scores[order]
+        self.n = len(self.y)
+        # Last position of every run of equal scores
+        self.ends = np.r_[np.flatnonzero(np.diff(self.scores)), self.n - 1]
+        self.thresholds = self.scores[self.ends]
+        self.tps = np.cumsum(self.y)[self.ends]
+        self.fps = self.ends + 1 - self.tps
+        self.n_pos = float(self.tps[-1]) if self.n else 0.0
+        self.n_neg = float(self.fps[-1]) if self.n else 0.0
+
+    def groups_above(self, thresholds) -> np.ndarray:
+        """Number of distinct scores >= each threshold."""
+        return np.searchsorted(-self.thresholds, -np.asarray(thresholds, dtype=float), side="right")
+
+    def confusion(self, thresholds) -> tuple:
+        """tp, fp, tn, fn at each threshold, one searchsorted for all of them."""
+        k = self.groups_above(thresholds)
+        tp = np.r_[0.0, self.tps][k]
+        fp = np.r_[0.0, self.fps][k]
+        return tp, fp, self.n_neg - fp, self.n_pos - tp
+
+    def roc_auc(self) -> float:
+        if not self.n_pos or not self.n_neg:
+            return float("nan")
+        tpr = np.r_[0.0, self.tps] / self.n_pos
+        fpr = np.r_[0.0, self.fps] / self.n_neg
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def average_precision(self) -> float:
+        """Area under the precision-recall curve as a step sum, as sklearn's average_precision_score."""
+        if not self.n_pos:
+            return float("nan")
+        precision = self.tps / (self.tps + self.fps)
+        return float(np.sum(np.diff(np.r_[0.0, self.tps]) / self.n_pos * precision))
+
+    def threshold_sweep(self, n_thresholds: int = 1000) -> dict:
+        thresholds = np.linspace(0.0, 1.0, n_thresholds)
+        tp, fp, tn, fn = self.confusion(thresholds)
+        precision = safe_divide(tp, tp + fp)
+        recall = safe_divide(tp, tp + fn)
+        return {
+            "threshold": thresholds,
+            "precision": precision,
+            "recall": recall,
+            "f1": safe_divide(2 * precision * recall, precision + recall),
+            "accuracy": (tp + tn) / self.n,
+            "specificity": safe_divide(tn, tn + fp),
+            "positive_rate": (tp + fp) / self.n,
+        }
+
+    def at_threshold(self, threshold: float) -> dict:
+        """Positive-class and support-weighted metrics at one threshold, from the confusion counts."""
+        tp, fp, tn, fn = (float(value[0]) for value in self.confusion([threshold]))
+        precision_pos, precision_neg = safe_divide(tp, tp + fp), safe_divide(tn, tn + fn)
+        recall_pos, recall_neg = safe_divide(tp, tp + fn), safe_divide(tn, tn + fp)
+        f1_pos = safe_divide(2 * precision_pos * recall_pos, precision_pos + recall_pos)
+        f1_neg = safe_divide(2 * precision_neg * recall_neg, precision_neg + recall_neg)
+        weights = np.array([self.n_pos, self.n_neg]) / self.n
+        return {
+            "tp": tp, "fp": fp, "tn": tn, "fn": fn,
+            "accuracy": (tp + tn) / self.n,
+            "precision_positive": float(precision_pos),
+            "recall_positive": float(recall_pos),
+            "f1_positive": float(f1_pos),
+            # average="weighted" in sklearn terms
+            "precision": float(weights @ [precision_pos, precision_neg]),
+            "recall": float(weights @ [recall_pos, recall_neg]),
+            "f1": float(weights @ [f1_pos, f1_neg]),
+        }
+
+    def calibration(self, n_bins: int = 10) -> dict:
+        """Reliability bins, expected calibration error, Brier score and log loss.
+
+        For the log loss, scores are clipped to [eps, 1 - eps] with eps the
+        float64 machine epsilon, as sklearn's log_loss does, so a score of
+        exactly 0 or 1 on the wrong label costs about 36 instead of infinity.
+        """
+        bins = np.minimum((self.scores * n_bins).astype(int), n_bins - 1)
+        counts = np.bincount(bins, minlength=n_bins)
+        mean_predicted = safe_divide(np.bincount(bins, weights=self.scores, minlength=n_bins), counts)
+        observed_rate = safe_divide(np.bincount(bins, weights=self.y, minlength=n_bins), counts)
+        eps = np.finfo(np.float64).eps
+        clipped = np.clip(self.scores, eps, 1 - eps)
+        return {
+            "bins": {
+                "lower": np.arange(n_bins) / n_bins,
+                "upper": np.arange(1, n_bins + 1) / n_bins,
+                "count": counts,
+                "mean_predicted": mean_predicted,
+                "observed_rate": observed_rate,
+            },
+            "ece": float(np.sum(counts / self.n * np.abs(observed_rate - mean_predicted))),
+            "brier": float(np.mean((self.scores - self.y) ** 2)),
+            "log_loss": float(-np.mean(self.y * np.log(clipped) + (1 - self.y) * np.log(1 - clipped))),
+        }
+
+    def lift(self, n_groups: int = 10) -> dict:
+        """Gain and lift per score-ranked group (deciles by default), highest scores first."""
+        bounds = np.ceil(self.n * np.arange(1, n_groups + 1) / n_groups).astype(int)
+        cumulative_pos = np.r_[0.0, np.cumsum(self.y)][bounds]
+        sizes = np.diff(np.r_[0, bounds])
+        positives = np.diff(np.r_[0.0, cumulative_pos])
+        base_rate = self.n_pos / self.n
+        return {
+            "group": np.arange(1, n_groups + 1),
+            "rows": sizes,
+            "positives": positives,
+            "response_rate": safe_divide(positives, sizes),
+            "lift": safe_divide(safe_divide(positives, sizes), base_rate),
+            "cumulative_gain": safe_divide(cumulative_pos, self.n_pos),
+            "cumulative_lift": safe_divide(safe_divide(cumulative_pos, bounds), base_rate),
+        }
+
+    def bootstrap_block(self, weights: np.ndarray, threshold: float) -> dict:
+        """Metrics of a block of resamples given as a (resamples, rows) count matrix in sorted order."""
+        tps = np.cumsum(weights * self.y, axis=1)[:, self.ends]
+        totals = np.cumsum(weights, axis=1)[:, self.ends]
+        fps = totals - tps
+        n_pos, n_neg = tps[:, -1], fps[:, -1]
+
+        tpr = safe_divide(np.pad(tps, ((0, 0), (1, 0))), n_pos[:, None])
+        fpr = safe_divide(np.pad(fps, ((0, 0), (1, 0))), n_neg[:, None])
+        roc_auc = np.sum(np.diff(fpr, axis=1) * (tpr[:, 1:] + tpr[:, :-1]) / 2, axis=1)
+        average_precision = np.sum(safe_divide(np.diff(tpr, axis=1) * tps, totals), axis=1)
+
+        k = int(self.groups_above([threshold])[0])
+        tp = tps[:, k - 1] if k else np.zeros(len(weights))
+        fp = fps[:, k - 1] if k else np.zeros(len(weights))
+        precision = safe_divide(tp, tp + fp)
+        recall = safe_divide(tp, n_pos)
+        degenerate = (n_pos == 0) | (n_neg == 0)
+        return {
+            "roc_auc": np.where(degenerate, np.nan, roc_auc),
+            "average_precision": np.where(n_pos == 0, np.nan, average_precision),
+            "accuracy": (tp + n_neg - fp) / self.n,
+            "precision_positive": precision,
+            "recall_positive": recall,
+            "f1_positive": safe_divide(2 * precision * recall, precision + recall),
+            "brier": weights @ ((self.scores - self.y) ** 2) / self.n,
+        }
+
+    def bootstrap(self, n_resamples: int = 1000, confidence: float = 0.95, threshold: float = 0.5,
+                  random_state: int = 42) -> dict:
+        """Percentile confidence intervals over `n_resamples` bootstrap resamples.
+
+        Resamples are drawn as row-count vectors (bincount of uniform
+        indices) in blocks of BOOTSTRAP_BLOCK_CELLS, so memory stays bounded
+        for large test sets.
+        """
+        rng = np.random.default_rng(random_state)
+        block = max(1, BOOTSTRAP_BLOCK_CELLS // max(self.n, 1))
+        results = {}
+        for start in range(0, n_resamples, block):
+            size = min(block, n_resamples - start)
+            draws = rng.integers(0, self.n, size=(size, self.n)) + (np.arange(size) * self.n)[:, None]
+            weights = np.bincount(draws.ravel(), minlength=size * self.n).reshape(size, self.n).astype(float)
+            for name, values in self.bootstrap_block(weights, threshold).items():
+                results.setdefault(name, []).append(values)
+
+        alpha = (1 - confidence) / 2
+        intervals = {}
+        for name, blocks in results.items():
+            values = np.concatenate(blocks)
+            intervals[name] = {
+                "low": float(np.nanquantile(values, alpha)),
+                "high": float(np.nanquantile(values, 1 - alpha)),
+                "std": float(np.nanstd(values)),
+            }
+        return intervals
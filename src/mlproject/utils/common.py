@@ -1,12 +1,13 @@
 import os
+import sys
+import resource
+import zipfile
 from box.exceptions import BoxValueError
-from box import Box
+from box import ConfigBox
 import yaml
 from mlproject import logger
 import json
-import joblib
 from ensure import ensure_annotations
-from box import ConfigBox
 from pathlib import Path
 from typing import Any
 
@@ -93,6 +94,8 @@ def save_bin(data: Any, path: Path):
         data (Any): data to be saved as binary
         path (Path): path to binary file
     """
+    import joblib
+
     joblib.dump(value=data, filename=path)
     logger.info(f"binary file saved at: {path}")
 
@@ -107,6 +110,8 @@ def load_bin(path: Path) -> Any:
     Returns:
         Any: object stored in the file
     """
+    import joblib
+
     data = joblib.load(path)
     logger.info(f"binary file loaded from: {path}")
     return data
@@ -127,5 +132,105 @@ def get_size(path: Path) -> str:
     return f"~ {size_in_kb} KB"
 
 
+@ensure_annotations
+def get_artifact_version(paths: list) -> str:
+    """build a version tag from the mtime and size of artifact files
+
+    Args:
+        paths (list): paths of the artifact files
+
+    Returns:
+        str: version tag, changes whenever any of the files is rewritten
+    """
+    parts = []
+    for path in paths:
+        stat = os.stat(path)
+        parts.append(f"{stat.st_mtime_ns}-{stat.st_size}")
+    return ":".join(parts)
+
+
+def get_peak_rss_mb() -> float:
+    """peak resident set size of the current process
+
+    Returns:
+        float: peak RSS in MB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def save_features(features_path: Path, target_path: Path, features, target):
+    """save a feature matrix and its target as two contiguous fixed-dtype .npy files
+
+    Features are stored as C-contiguous float32 and the target as int8, so
+    later stages can memory-map them and hand them to LightGBM as they are.
+
+    Args:
+        features_path (Path): path to the features .npy file
+        target_path (Path): path to the target .npy file
+        features (np.ndarray): 2D feature matrix
+        target (np.ndarray): target per row
+    """
+    import numpy as np
+
+    np.save(features_path, np.ascontiguousarray(features, dtype=np.float32))
+    np.save(target_path, np.ascontiguousarray(target, dtype=np.int8))
+    logger.info(f"features saved at: {features_path} ({get_size(Path(features_path))})")
+
+
+def load_features(features_path: Path, target_path: Path) -> tuple:
+    """memory-map the feature and target files written by `save_features`
+
+    Args:
+        features_path (Path): path to the features .npy file
+        target_path (Path): path to the target .npy file
+
+    Returns:
+        tuple: read-only float32 feature matrix, int8 target array
+    """
+    import numpy as np
+
+    features = np.load(features_path, mmap_mode="r")
+    target = np.load(target_path, mmap_mode="r")
+    logger.info(f"features memory-mapped from: {features_path}")
+    return features, target
+
+
+def get_zip_member(archive: zipfile.ZipFile, member: str = None) -> str:
+    """name of the CSV to read from an archive: `member`, or its only .csv file"""
+    if member is not None:
+        return member
+    csv_members = [name for name in archive.namelist() if name.lower().endswith(".csv")]
+    if len(csv_members) != 1:
+        raise ValueError(f"Expected exactly one CSV in {archive.filename}, found {csv_members}")
+    return csv_members[0]
+
+
+def read_csv_source(path: Path, member: str = None, **kwargs):
+    """read a CSV from disk, or stream it out of a .zip without extracting it
+
+    Args:
+        path (Path): path to a .csv file or to a .zip holding one
+        member (str): CSV inside the archive, defaults to its only .csv file
+        **kwargs: passed to pd.read_csv; with `chunksize` the chunks are
+            yielded while the archive stays open
+
+    Returns:
+        pd.DataFrame, or an iterator of DataFrame chunks when chunksize is set
+    """
+    import pandas as pd
+
+    if not str(path).lower().endswith(".zip"):
+        return pd.read_csv(path, **kwargs)
 
+    if kwargs.get("chunksize"):
+        def chunks():
+            with zipfile.ZipFile(path) as archive:
+                with archive.open(get_zip_member(archive, member)) as f:
+                    yield from pd.read_csv(f, **kwargs)
+        return chunks()
 
+    with zipfile.ZipFile(path) as archive:
+        with archive.open(get_zip_member(archive, member)) as f:
+            return pd.read_csv(f, **kwargs)
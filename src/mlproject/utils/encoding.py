@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+
+UNKNOWN_MOST_FREQUENT = "most_frequent"
+UNKNOWN_ERROR = "error"
+UNKNOWN_MODES = (UNKNOWN_MOST_FREQUENT, UNKNOWN_ERROR)
+
+
+def check_unknown_category(unknown: str) -> str:
+    """`prediction.unknown_category` as given, after checking it is a known mode.
+
+    Raises:
+        ValueError: not one of UNKNOWN_MODES
+    """
+    if unknown not in UNKNOWN_MODES:
+        raise ValueError(f"Unknown unknown_category '{unknown}', expected one of {list(UNKNOWN_MODES)}")
+    return unknown
+
+
+def compile_label_encoders(label_encoders: dict, columns: list) -> dict:
+    """compile fitted LabelEncoders into hash lookup tables
+
+    Args:
+        label_encoders (dict): column name -> fitted sklearn LabelEncoder
+        columns (list): categorical columns to compile
+
+    Returns:
+        dict: column name -> pd.Index of the classes, position is the code
+    """
+    return {
+        column: pd.Index(np.asarray(label_encoders[column].classes_).astype(str))
+        for column in columns
+        if column in label_encoders
+    }
+
+
+def encode_categories(data: pd.DataFrame, lookup: dict, unknown: str = UNKNOWN_MOST_FREQUENT,
+                      fallback_codes=None) -> np.ndarray:
+    """encode categorical columns with precompiled lookup tables
+
+    The model only ever saw the training vocabulary and was trained without
+    missing category codes, so an unseen category cannot be left missing:
+    LightGBM would score it as code 0.
+
+    Args:
+        data (pd.DataFrame): raw input, must contain every column of `lookup`
+        lookup (dict): tables built by `compile_label_encoders`
+        unknown (str): "most_frequent" encodes unseen categories (and missing
+            values) as `fallback_codes`, "error" raises ValueError
+        fallback_codes (array-like): code per entry of `lookup`, the most
+            frequent training category; code 0 when not given
+
+    Returns:
+        np.ndarray: float codes, one column per entry of `lookup`
+    """
+    check_unknown_category(unknown)
+    codes = np.empty((len(data), len(lookup)), dtype=float)
+    for i, (column, classes) in enumerate(lookup.items()):
+        codes[:, i] = classes.get_indexer(data[column].astype(str))
+
+    unseen = codes < 0
+    if unseen.any():
+        if unknown == UNKNOWN_ERROR:
+            bad = {
+                column: sorted(set(data[column].astype(str)[unseen[:, i]]))
+                for i, column in enumerate(lookup)
+                if unseen[:, i].any()
+            }
+            raise ValueError(f"Unseen categories: {bad}")
+        if fallback_codes is None:
+            fallback_codes = np.zeros(len(lookup))
+        codes = np.where(unseen, np.asarray(fallback_codes, dtype=float), codes)
+
+    return codes
@@ -0,0 +1,236 @@
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from mlproject import logger
+from mlproject.utils.encoding import UNKNOWN_MOST_FREQUENT, compile_label_encoders, encode_categories
+
+
+class FeaturePipeline:
+    """The fitted preprocessing in front of the model, as plain arrays.
+
+    One `transform` call turns raw feature columns into the model's matrix:
+    categories become their code in the training vocabulary (unseen ones
+    that of the most frequent training category), numeric values
+    are coerced to float, missing numbers are filled with the training
+    medians and the scaled columns are standardized, all on one float64
+    block. Transformation, evaluation and both serving backends use it the
+    same way, and it is saved as a single .npz that loads without pickle,
+    sklearn or joblib.
+
+    Output columns follow `feature_order`: the scaled numeric columns first,
+    then the others in input order, the layout of the ColumnTransformer used
+    before.
+    """
+
+    def __init__(self, input_features: list, cat_cols: list, scaled_cols: list, medians: dict, vocab: dict,
+                 scaler_mean=None, scaler_scale=None, target_classes=None, feature_order: list = None,
+                 most_frequent: dict = None):
+        self.input_features = list(input_features)
+        self.cat_cols = [col for col in cat_cols if col in self.input_features]
+        self.num_cols = [col for col in self.input_features if col not in self.cat_cols]
+        self.scaled_cols = [col for col in scaled_cols if col in self.num_cols]
+        if feature_order is None:
+            feature_order = self.scaled_cols + [col for col in self.input_features if col not in self.scaled_cols]
+        self.feature_order = list(feature_order)
+        self.medians = {col: float(medians[col]) for col in self.num_cols if col in medians}
+        self.category_lookup = {col: pd.Index(np.asarray(vocab[col]).astype(str)) for col in self.cat_cols}
+        # Category unseen values are encoded as; pipelines saved without it fall back to code 0
+        self.most_frequent = {col: str(most_frequent[col]) for col in self.cat_cols
+                              if most_frequent and col in most_frequent}
+        self.fallback_codes = np.array([self.category_lookup[col].get_loc(self.most_frequent[col])
+                                        if col in self.most_frequent else 0 for col in self.cat_cols], dtype=float)
+        self.target_classes = None if target_classes is None else np.asarray(target_classes)
+
+        # Where each input column lands in the output block
+        self.num_positions = [self.feature_order.index(col) for col in self.num_cols]
+        self.cat_positions = [self.feature_order.index(col) for col in self.cat_cols]
+        self.scaled_positions = [self.feature_order.index(col) for col in self.scaled_cols]
+        # Per output column fill value (NaN: left missing) and scaler parameters (0 / 1: unscaled)
+        self.fill = np.full(len(self.feature_order), np.nan)
+        for col, median in self.medians.items():
+            self.fill[self.feature_order.index(col)] = median
+        self.has_fill = ~np.isnan(self.fill)
+        self.set_scaler(np.zeros(len(self.scaled_cols)) if scaler_mean is None else scaler_mean,
+                        np.ones(len(self.scaled_cols)) if scaler_scale is None else scaler_scale)
+
+    def set_scaler(self, mean, scale):
+        """Standardization parameters of `scaled_cols`, e.g. a fitted StandardScaler's mean_ and scale_."""
+        self.scaler_mean = np.asarray(mean, dtype=np.float64)
+        self.scaler_scale = np.asarray(scale, dtype=np.float64)
+        self.mean = np.zeros(len(self.feature_order))
+        self.scale = np.ones(len(self.feature_order))
+        self.mean[self.scaled_positions] = self.scaler_mean
+        self.scale[self.scaled_positions] = self.scaler_scale
+
+    @classmethod
+    def fit(cls, data: pd.DataFrame, cat_cols: list, scaled_cols: list, target_classes=None):
+        """Medians, vocabularies and most frequent categories from the raw features; the scaler starts as the identity."""
+        cat_cols = [col for col in cat_cols if col in data.columns]
+        medians = {col: pd.to_numeric(data[col], errors='coerce').median()
+                   for col in data.columns if col not in cat_cols}
+        counts = {col: data[col].astype(str).value_counts().sort_index() for col in cat_cols}
+        vocab = {col: counts[col].index.to_numpy() for col in cat_cols}
+        most_frequent = {col: counts[col].idxmax() for col in cat_cols}
+        return cls(list(data.columns), cat_cols, scaled_cols, medians, vocab, target_classes=target_classes,
+                   most_frequent=most_frequent)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_order)
+
+    def check_columns(self, data: pd.DataFrame) -> pd.DataFrame:
+        if isinstance(data, np.ndarray):
+            return pd.DataFrame(data, columns=self.input_features)
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data must be a pandas DataFrame.")
+        missing = [col for col in self.input_features if col not in data.columns]
+        if missing:
+            raise ValueError(f"Input data is missing columns: {missing}")
+        return data
+
+    def encode(self, data, unknown: str = UNKNOWN_MOST_FREQUENT) -> np.ndarray:
+        """Raw features to an unscaled float64 block in `feature_order`, missing numbers filled."""
+        data = self.check_columns(data)
+        block = np.empty((len(data), self.n_features), dtype=np.float64)
+        if self.cat_cols:
+            block[:, self.cat_positions] = encode_categories(data, self.category_lookup, unknown,
+                                                             self.fallback_codes)
+        for col, position in zip(self.num_cols, self.num_positions):
+            values = data[col]
+            if values.dtype.kind not in 'biuf':
+                values = pd.to_numeric(values, errors='coerce')
+            block[:, position] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        np.copyto(block, self.fill, where=np.isnan(block) & self.has_fill)
+        return block
+
+    def scale_block(self, block: np.ndarray) -> np.ndarray:
+        """Standardizes an encoded block in place."""
+        block -= self.mean
+        block /= self.scale
+        return block
+
+    def transform(self, data, unknown: str = UNKNOWN_MOST_FREQUENT) -> np.ndarray:
+        return self.scale_block(self.encode(data, unknown))
+
+    def decode(self, block: np.ndarray) -> pd.DataFrame:
+        """Raw features back from an unscaled block; category codes are rounded to the nearest class."""
+        columns = {}
+        for col in self.input_features:
+            values = block[:, self.feature_order.index(col)]
+            if col in self.category_lookup:
+                classes = self.category_lookup[col]
+                values = classes.to_numpy()[np.clip(np.rint(values), 0, len(classes) - 1).astype(int)]
+            columns[col] = values
+        return pd.DataFrame(columns)
+
+    def to_arrays(self) -> dict:
+        arrays = {
+            "input_features": np.asarray(self.input_features, dtype=str),
+            "feature_order": np.asarray(self.feature_order, dtype=str),
+            "cat_cols": np.asarray(self.cat_cols, dtype=str),
+            "median_cols": np.asarray(list(self.medians), dtype=str),
+            "medians": np.asarray(list(self.medians.values()), dtype=np.float64),
+            "scaled_cols": np.asarray(self.scaled_cols, dtype=str),
+            "scaler_mean": self.scaler_mean,
+            "scaler_scale": self.scaler_scale,
+        }
+        for col, classes in self.category_lookup.items():
+            arrays[f"vocab__{col}"] = np.asarray(classes, dtype=str)
+        if self.most_frequent:
+            arrays["most_frequent_cols"] = np.asarray(list(self.most_frequent), dtype=str)
+            arrays["most_frequent"] = np.asarray(list(self.most_frequent.values()), dtype=str)
+        if self.target_classes is not None:
+            arrays["target_classes"] = np.asarray(self.target_classes).astype(str)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: dict):
+        """Pipeline from `to_arrays` output, e.g. a loaded .npz or the model bundle.
+
+        Bundles exported before imputation was part of the pipeline have no
+        medians and leave missing numbers to the model; without the most
+        frequent categories, unseen ones are encoded as code 0.
+        """
+        cat_cols = list(arrays["cat_cols"])
+        medians = dict(zip(arrays["median_cols"], arrays["medians"])) if "medians" in arrays else {}
+        most_frequent = (dict(zip(arrays["most_frequent_cols"], arrays["most_frequent"]))
+                         if "most_frequent" in arrays else None)
+        return cls(arrays["input_features"], cat_cols, list(arrays["scaled_cols"]), medians,
+                   {col: arrays[f"vocab__{col}"] for col in cat_cols},
+                   scaler_mean=arrays["scaler_mean"], scaler_scale=arrays["scaler_scale"],
+                   target_classes=arrays.get("target_classes"), feature_order=list(arrays["feature_order"]),
+                   most_frequent=most_frequent)
+
+    def save(self, path: Path):
+        path = Path(path)
+        os.makedirs(path.parent, exist_ok=True)
+        # Write next to the target and rename, so a reader never sees a partial file
+        tmp_path = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp_path, **self.to_arrays())
+        os.replace(tmp_path, path)
+        logger.info(f"Feature pipeline saved at: {path}")
+
+    @classmethod
+    def load(cls, path: Path):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls.from_arrays(dict(arrays))
+
+    @classmethod
+    def from_legacy(cls, preprocessor, label_encoders: dict, cat_cols: list, target_column: str = None):
+        """Pipeline equivalent to a fitted ColumnTransformer plus the LabelEncoder dict.
+
+        That pair never imputed, so missing numbers stay missing, and it has
+        no category counts, so unseen categories are encoded as code 0.
+        """
+        feature_order, scaled_cols, mean, scale = [], [], [], []
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == "remainder":
+                if transformer != "passthrough":
+                    raise NotImplementedError(f"Unsupported remainder: {transformer}")
+                feature_order.extend(preprocessor.feature_names_in_[i] for i in columns)
+                continue
+            if transformer == "drop":
+                continue
+
+            steps = transformer.steps if hasattr(transformer, "steps") else [(name, transformer)]
+            scaler = steps[-1][1]
+            if len(steps) != 1 or not hasattr(scaler, "mean_"):
+                raise NotImplementedError(f"Only a StandardScaler can be converted, got {transformer}")
+            feature_order.extend(columns)
+            scaled_cols.extend(columns)
+            mean.extend(scaler.mean_ if scaler.mean_ is not None else np.zeros(len(columns)))
+            scale.extend(scaler.scale_ if scaler.scale_ is not None else np.ones(len(columns)))
+
+        lookup = compile_label_encoders(label_encoders, cat_cols)
+        target_classes = None
+        if target_column in label_encoders:
+            target_classes = np.asarray(label_encoders[target_column].classes_)
+        return cls(list(preprocessor.feature_names_in_), list(lookup), scaled_cols, {}, lookup,
+                   scaler_mean=mean, scaler_scale=scale, target_classes=target_classes, feature_order=feature_order)
+
+
+def feature_pipeline_paths(pipeline_path: Path, preprocessor_path: Path = None, label_encoder_path: Path = None) -> list:
+    """Files the feature pipeline is read from: the .npz, or the legacy pickles when it is missing."""
+    if os.path.exists(pipeline_path) or preprocessor_path is None:
+        return [Path(pipeline_path)]
+    return [Path(preprocessor_path), Path(label_encoder_path)]
+
+
+def load_feature_pipeline(pipeline_path: Path, preprocessor_path: Path = None, label_encoder_path: Path = None,
+                          cat_cols: list = (), target_column: str = None) -> FeaturePipeline:
+    """Loads the feature pipeline, falling back to preprocessor.pkl + label_encoders.pkl from older runs."""
+    if os.path.exists(pipeline_path):
+        return FeaturePipeline.load(pipeline_path)
+
+    legacy = [path for path in (preprocessor_path, label_encoder_path) if path is not None]
+    if len(legacy) < 2 or not all(os.path.exists(path) for path in legacy):
+        raise FileNotFoundError(f"Feature pipeline not found: {pipeline_path}")
+
+    # Only artifacts from before the fused pipeline need these
+    import joblib
+
+    logger.warning(f"Feature pipeline not found at {pipeline_path}, converting {preprocessor_path} "
+                   f"and {label_encoder_path}; re-run data_transformation to write it")
+    return FeaturePipeline.from_legacy(joblib.load(preprocessor_path), joblib.load(label_encoder_path),
+                                       cat_cols, target_column)
@@ -0,0 +1,111 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+
+LOG_FORMAT = "[%(asctime)s : %(levelname)s : %(module)s : %(message)s]"
+# Per-request logs go to this child of the mlproject logger and can be sampled
+REQUEST_LOGGER = "mlproject.requests"
+
+_listener = None
+
+
+class DirCreatingFileHandler(logging.FileHandler):
+    """FileHandler that creates the log directory when the file is first opened, not at import."""
+
+    def __init__(self, filename, mode="a", encoding=None):
+        super().__init__(filename, mode=mode, encoding=encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class DirCreatingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    def __init__(self, filename, max_bytes: int = 0, backup_count: int = 0, encoding=None):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` fraction of records below `min_level`; warnings and errors always pass."""
+
+    def __init__(self, rate: float, min_level: int = logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.min_level = min_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.min_level or random.random() < self.rate
+
+
+def default_handlers(log_dir: str = "logs", log_file: str = "running.log") -> list:
+    """The import-time handlers: stdout plus a file that is only created on the first record."""
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = DirCreatingFileHandler(os.path.join(log_dir, log_file))
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, stream_handler]
+
+
+def stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(config) -> logging.Logger:
+    """Replaces the mlproject handlers according to a LoggingConfig.
+
+    With `async_mode`, callers only put records on an in-memory queue; a
+    background thread formats them and writes to stdout and the rotating
+    file, so request threads never wait on disk or terminal I/O. The queue
+    is drained at interpreter exit.
+
+    Only long-running single processes (the serving apps) should call this:
+    size-based rotation is not safe with several processes appending to the
+    same file.
+    """
+    logger = logging.getLogger("mlproject")
+    stop_listener()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = DirCreatingRotatingFileHandler(os.path.join(config.log_dir, config.log_file),
+                                                  max_bytes=config.max_bytes, backup_count=config.backup_count)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    logger.setLevel(config.level)
+    if config.async_mode:
+        global _listener
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler,
+                                                   respect_handler_level=True)
+        _listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(stream_handler)
+
+    request_logger = logging.getLogger(REQUEST_LOGGER)
+    for log_filter in list(request_logger.filters):
+        request_logger.removeFilter(log_filter)
+    if config.request_sample_rate < 1.0:
+        request_logger.addFilter(SamplingFilter(config.request_sample_rate))
+    return logger
+
+
+atexit.register(stop_listener)
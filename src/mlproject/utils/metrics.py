@@ -0,0 +1,218 @@
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000, 10000, 100000, 1000000)
+# Shared by every `time()` call while metrics are disabled
+_NO_TIMER = nullcontext()
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text format.
+
+    Disabled registries make `inc`, `observe` and `time` return after one
+    attribute check, so instrumented code costs next to nothing when
+    `metrics.enabled` is off. Values live in the process, so every
+    serving process exposes its own `/metrics`.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.metrics = []
+
+    def configure(self, enabled: bool):
+        self.enabled = enabled
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()):
+        return self.register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        return self.register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class Metric(ABC):
+    kind = None
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labelnames: tuple = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, **labels):
+        """Child for one combination of label values; bind it once and reuse it on hot paths."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self.new_child())
+        return child
+
+    @abstractmethod
+    def new_child(self):
+        """Holds the value(s) for one combination of label values."""
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child.samples(self.name, self.labelnames, key))
+        return lines
+
+
+class CounterChild:
+    __slots__ = ("registry", "value", "lock")
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        if not self.registry.enabled:
+            return
+        with self.lock:
+            self.value += amount
+
+    def samples(self, name: str, labelnames: tuple, key: tuple) -> list:
+        return [f"{name}_total{format_labels(labelnames, key)} {format_value(self.value)}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def new_child(self):
+        return CounterChild(self.registry)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+
+class Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class HistogramChild:
+    __slots__ = ("registry", "buckets", "counts", "sum", "lock")
+
+    def __init__(self, registry: MetricsRegistry, buckets: tuple):
+        self.registry = registry
+        self.buckets = buckets
+        # Last slot counts the observations above the largest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self):
+        """Context manager observing the seconds spent in its block."""
+        if not self.registry.enabled:
+            return _NO_TIMER
+        return Timer(self)
+
+    def samples(self, name: str, labelnames: tuple, key: tuple) -> list:
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{format_value(bound)}"'
+            lines.append(f"{name}_bucket{format_labels(labelnames, key, le)} {cumulative}")
+        lines.append(f"{name}_sum{format_labels(labelnames, key)} {format_value(total)}")
+        lines.append(f"{name}_count{format_labels(labelnames, key)} {cumulative}")
+        return lines
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        super().__init__(registry, name, documentation, labelnames)
+
+    def new_child(self):
+        return HistogramChild(self.registry, self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+
+REGISTRY = MetricsRegistry()
+
+# Serving metrics, shared by app.py, app_async.py and the prediction pipelines
+REQUESTS = REGISTRY.counter("churnshield_requests", "HTTP requests handled", ("endpoint",))
+ERRORS = REGISTRY.counter("churnshield_errors", "HTTP requests that returned an error", ("endpoint",))
+REQUEST_SECONDS = REGISTRY.histogram("churnshield_request_seconds", "Request handling time", ("endpoint",))
+STAGE_SECONDS = REGISTRY.histogram("churnshield_stage_seconds", "Time spent per step of a prediction", ("stage",))
+BATCH_ROWS = REGISTRY.histogram("churnshield_batch_rows", "Rows per predict_batch call", buckets=SIZE_BUCKETS)
+PREDICTED_ROWS = REGISTRY.counter("churnshield_predicted_rows", "Rows scored by predict_batch")
+CACHE_HITS = REGISTRY.counter("churnshield_cache_hits", "Rows answered from the prediction cache")
+CACHE_MISSES = REGISTRY.counter("churnshield_cache_misses", "Rows scored because they were not cached")
+CACHE_EVICTIONS = REGISTRY.counter("churnshield_cache_evictions", "Cached rows dropped to stay under the size limit")
+INVALID_ROWS = REGISTRY.counter("churnshield_invalid_rows", "Rows not scored because they failed validation")
+
+PARSE_SECONDS = STAGE_SECONDS.labels(stage="parse")
+VALIDATION_SECONDS = STAGE_SECONDS.labels(stage="validation")
+ENCODING_SECONDS = STAGE_SECONDS.labels(stage="label_encoding")
+TRANSFORM_SECONDS = STAGE_SECONDS.labels(stage="transform")
+SCORING_SECONDS = STAGE_SECONDS.labels(stage="scoring")
+RENDER_SECONDS = STAGE_SECONDS.labels(stage="render")
@@ -0,0 +1,250 @@
+import numpy as np
+import pandas as pd
+
+
+NUMERIC_TYPES = {"int", "float"}
+MAX_EXAMPLES = 10
+
+
+class SchemaValidator:
+    """Column checks compiled once from schema.yaml, run as vectorized passes.
+
+    Checks column names, declared types (`int`, `float`, `string`), null
+    rates, numeric ranges and categorical domains. Per-column statistics are
+    accumulated, so `validate` over a whole frame and `validate_chunks` over
+    a chunked reader produce the same report.
+
+    Blank strings count as nulls, and values that cannot be read as the
+    declared numeric type count as type errors, matching how transformation
+    and prediction coerce them.
+    """
+
+    def __init__(self, columns: dict, constraints: dict = None, max_null_rate: float = 0.0,
+                 check_nulls: bool = True, check_domains: bool = True, allow_extra_columns: bool = True):
+        constraints = constraints or {}
+        self.columns = dict(columns)
+        self.max_null_rate = float(max_null_rate)
+        self.check_nulls = check_nulls
+        self.check_domains = check_domains
+        self.allow_extra_columns = allow_extra_columns
+        self.rules = {}
+        for col, dtype in self.columns.items():
+            if dtype not in NUMERIC_TYPES | {"string"}:
+                raise ValueError(f"Unsupported type '{dtype}' for column {col}")
+            rule = dict(constraints.get(col, {}))
+            if "allowed" in rule:
+                allowed = rule["allowed"]
+                rule["allowed"] = pd.Index(allowed if dtype == "string" else [float(v) for v in allowed])
+            self.rules[col] = rule
+
+    @classmethod
+    def from_schema(cls, schema, columns: list = None, **kwargs):
+        """Builds a validator from the COLUMNS and CONSTRAINTS sections of schema.yaml.
+
+        Args:
+            schema (ConfigBox): loaded schema.yaml
+            columns (list): only validate these columns, e.g. the model inputs
+
+        Returns:
+            SchemaValidator: compiled validator
+        """
+        constraints = schema.get("CONSTRAINTS", {}) or {}
+        declared = dict(schema.COLUMNS)
+        if columns is not None:
+            declared = {col: declared[col] for col in columns if col in declared}
+        kwargs.setdefault("max_null_rate", constraints.get("max_null_rate", 0.0))
+        return cls(declared, dict(constraints.get("columns", {}) or {}), **kwargs)
+
+    def new_stats(self) -> dict:
+        return {col: {"rows": 0, "nulls": 0, "type_errors": 0, "out_of_range": 0, "unknown": 0,
+                      "min": None, "max": None, "examples": {}}
+                for col in self.columns}
+
+    def needs_check(self, col: str) -> bool:
+        # Nothing to check on a string column without null or domain checks
+        rule = self.rules[col]
+        return self.columns[col] != "string" or self.check_nulls or (self.check_domains and "allowed" in rule)
+
+    def column_masks(self, col: str, series: pd.Series) -> dict:
+        """Per-row masks of one column: `null`, `bad` (type errors), `outside` the range and
+        `unknown` (outside the domain), plus the numeric `values` (None for strings)."""
+        rule = self.rules[col]
+        if self.columns[col] in NUMERIC_TYPES:
+            values, null, bad = self.coerce_numeric(series, integer=self.columns[col] == "int")
+            valid = ~(null | bad)
+            outside = np.zeros(len(values), dtype=bool)
+            if "min" in rule:
+                outside |= valid & (values < rule["min"])
+            if "max" in rule:
+                outside |= valid & (values > rule["max"])
+            unknown = np.zeros(len(values), dtype=bool)
+            if self.check_domains and "allowed" in rule:
+                unknown = valid & ~np.isin(values, rule["allowed"].to_numpy())
+        else:
+            values = None
+            text = series.astype(str)
+            null = (series.isna() | (text.str.strip() == "")).to_numpy()
+            bad = np.zeros(len(series), dtype=bool)
+            outside = np.zeros(len(series), dtype=bool)
+            unknown = np.zeros(len(series), dtype=bool)
+            if self.check_domains and "allowed" in rule:
+                unknown = ~null & ~text.isin(rule["allowed"]).to_numpy()
+        return {"values": values, "null": null, "bad": bad, "outside": outside, "unknown": unknown}
+
+    def update_stats(self, stats: dict, data: pd.DataFrame):
+        for col in self.columns:
+            if col not in data.columns:
+                continue
+            col_stats = stats[col]
+            col_stats["rows"] += len(data)
+            if not self.needs_check(col):
+                continue
+            series = data[col]
+            masks = self.column_masks(col, series)
+
+            values = masks["values"]
+            if values is not None:
+                valid = ~(masks["null"] | masks["bad"])
+                if valid.any():
+                    low, high = float(values[valid].min()), float(values[valid].max())
+                    col_stats["min"] = low if col_stats["min"] is None else min(col_stats["min"], low)
+                    col_stats["max"] = high if col_stats["max"] is None else max(col_stats["max"], high)
+            col_stats["out_of_range"] += int(masks["outside"].sum())
+            self.add_unknown(col_stats, series, masks["unknown"])
+            self.add_examples(col_stats, series, masks["bad"])
+            col_stats["nulls"] += int(masks["null"].sum())
+            col_stats["type_errors"] += int(masks["bad"].sum())
+
+    @staticmethod
+    def coerce_numeric(series: pd.Series, integer: bool) -> tuple:
+        """Float values, null mask and type error mask of a column."""
+        if series.dtype.kind in "biuf":
+            values = series.to_numpy(dtype=float)
+            null = np.isnan(values)
+        else:
+            text = series.astype(str).str.strip()
+            null = (series.isna() | (text == "")).to_numpy()
+            values = pd.to_numeric(text.where(~null), errors="coerce").to_numpy(dtype=float)
+        bad = np.isnan(values) & ~null
+        if integer:
+            bad |= ~np.isnan(values) & (values != np.floor(values))
+        return values, null, bad
+
+    @staticmethod
+    def add_unknown(col_stats: dict, series: pd.Series, unknown: np.ndarray):
+        col_stats["unknown"] += int(unknown.sum())
+        SchemaValidator.add_examples(col_stats, series, unknown)
+
+    @staticmethod
+    def add_examples(col_stats: dict, series: pd.Series, mask: np.ndarray):
+        examples = col_stats["examples"]
+        if not mask.any() or len(examples) >= MAX_EXAMPLES:
+            return
+        for value, count in series[mask].astype(str).value_counts().items():
+            if value in examples or len(examples) < MAX_EXAMPLES:
+                examples[value] = examples.get(value, 0) + int(count)
+
+    def finalize(self, stats: dict, seen_columns: list, rows: int) -> dict:
+        errors = []
+        missing = [col for col in self.columns if col not in seen_columns]
+        unexpected = [col for col in seen_columns if col not in self.columns]
+        if missing:
+            errors.append(f"missing columns: {missing}")
+        if unexpected and not self.allow_extra_columns:
+            errors.append(f"unexpected columns: {unexpected}")
+
+        columns = {}
+        for col in self.columns:
+            if col in missing:
+                continue
+            col_stats = stats[col]
+            rule = self.rules[col]
+            null_rate = col_stats["nulls"] / col_stats["rows"] if col_stats["rows"] else 0.0
+            max_null_rate = rule.get("max_null_rate", self.max_null_rate)
+            col_errors = []
+            if col_stats["type_errors"]:
+                col_errors.append(f"{col_stats['type_errors']} values are not {self.columns[col]}")
+            if self.check_nulls and null_rate > max_null_rate:
+                col_errors.append(f"null rate {null_rate:.4f} above {max_null_rate}")
+            if col_stats["out_of_range"]:
+                col_errors.append(f"{col_stats['out_of_range']} values outside "
+                                  f"[{rule.get('min', '-inf')}, {rule.get('max', 'inf')}]")
+            if col_stats["unknown"]:
+                col_errors.append(f"{col_stats['unknown']} values outside the allowed domain")
+            errors.extend(f"{col}: {message}" for message in col_errors)
+
+            columns[col] = {
+                "dtype": self.columns[col],
+                "nulls": col_stats["nulls"],
+                "null_rate": round(null_rate, 6),
+                "type_errors": col_stats["type_errors"],
+                "out_of_range": col_stats["out_of_range"],
+                "unknown_values": col_stats["unknown"],
+                "min": col_stats["min"],
+                "max": col_stats["max"],
+                "examples": col_stats["examples"],
+                "errors": col_errors,
+            }
+
+        return {
+            "status": not errors,
+            "rows": rows,
+            "missing_columns": missing,
+            "unexpected_columns": unexpected,
+            "errors": errors,
+            "columns": columns,
+        }
+
+    def validate(self, data: pd.DataFrame) -> dict:
+        stats = self.new_stats()
+        self.update_stats(stats, data)
+        return self.finalize(stats, list(data.columns), len(data))
+
+    def validate_chunks(self, chunks) -> dict:
+        stats = self.new_stats()
+        seen_columns, rows = None, 0
+        for chunk in chunks:
+            if seen_columns is None:
+                seen_columns = list(chunk.columns)
+            self.update_stats(stats, chunk)
+            rows += len(chunk)
+        return self.finalize(stats, seen_columns or [], rows)
+
+    def check(self, data: pd.DataFrame):
+        """Raises ValueError listing every failed check."""
+        report = self.validate(data)
+        if not report["status"]:
+            raise ValueError(f"Input failed schema validation: {'; '.join(report['errors'])}")
+
+    def check_rows(self, data: pd.DataFrame) -> tuple:
+        """Per-row validation for request-time use, so one bad row does not fail its batch.
+
+        A null fails a row only when its column allows no nulls; rate
+        limits above 0 only make sense over a whole dataset.
+
+        Returns:
+            tuple: bool mask of the valid rows, and an object array with the
+                   reasons of every invalid row ("" for valid rows)
+
+        Raises:
+            ValueError: a column is missing, so no row can be checked
+        """
+        missing = [col for col in self.columns if col not in data.columns]
+        if missing:
+            raise ValueError(f"Input failed schema validation: missing columns: {missing}")
+
+        reasons = np.full(len(data), "", dtype=object)
+        for col in self.columns:
+            if not self.needs_check(col):
+                continue
+            rule = self.rules[col]
+            masks = self.column_masks(col, data[col])
+            failures = [(masks["bad"], f"{col}: not {self.columns[col]}"),
+                        (masks["outside"], f"{col}: outside [{rule.get('min', '-inf')}, {rule.get('max', 'inf')}]"),
+                        (masks["unknown"], f"{col}: outside the allowed domain")]
+            if self.check_nulls and rule.get("max_null_rate", self.max_null_rate) == 0:
+                failures.append((masks["null"], f"{col}: null"))
+            for mask, message in failures:
+                if mask.any():
+                    reasons[mask] += np.where(reasons[mask] == "", message, "; " + message)
+        return reasons == "", reasons
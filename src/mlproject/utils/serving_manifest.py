@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from mlproject.utils.stage_cache import hash_file
+
+
+# path -> (mtime, size, sha256) of its latest version, so unchanged artifacts are not re-read on
+# every reload check; a rewrite replaces the entry instead of adding one per retraining
+_hashes = {}
+
+
+def artifact_key(path: Path) -> str:
+    return os.path.normpath(str(path))
+
+
+def hash_artifact(path: Path) -> str:
+    stat = os.stat(path)
+    key = artifact_key(path)
+    entry = _hashes.get(key)
+    if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+        entry = (stat.st_mtime_ns, stat.st_size, hash_file(path))
+        _hashes[key] = entry
+    return entry[2]
+
+
+def write_serving_manifest(path: Path, artifacts: list) -> str:
+    """Records the sha256 of a consistent set of serving artifacts.
+
+    Written by model export once the feature pipeline, the model and the
+    bundle are all final, next to the target and renamed, so readers see
+    the old or the new manifest, never a partial one.
+
+    Returns:
+        str: version of the set, a hash of the file hashes
+    """
+    files = {artifact_key(artifact): hash_artifact(artifact) for artifact in artifacts}
+    version = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()[:16]
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"version": version, "files": files}, indent=4))
+    os.replace(tmp_path, path)
+    return version
+
+
+def read_serving_manifest(path: Path):
+    """The manifest as a dict, or None when model export has not written one."""
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def verify_serving_manifest(manifest: dict, paths: list) -> str:
+    """Manifest version, after checking that `paths` still hold the recorded content.
+
+    Raises:
+        ValueError: a file is not in the manifest or has changed since it
+            was written, e.g. training is rewriting the artifacts and model
+            export has not run yet
+    """
+    for path in paths:
+        expected = manifest["files"].get(artifact_key(path))
+        if expected is None:
+            raise ValueError(f"{path} is not in the serving manifest")
+        if hash_artifact(path) != expected:
+            raise ValueError(f"{path} changed after the serving manifest was written")
+    return manifest["version"]
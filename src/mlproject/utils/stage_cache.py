@@ -0,0 +1,141 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime, timezone
+from mlproject import logger
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """sha256 of a file's content, read in chunks
+
+    Args:
+        path (Path): path of the file
+        chunk_size (int): bytes read per chunk
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_config(sections: dict) -> str:
+    """sha256 of config/params/schema sections, independent of key order
+
+    Args:
+        sections (dict): name -> section as loaded from the YAML files
+
+    Returns:
+        str: hex digest
+    """
+    payload = json.dumps(sections, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class StageCache:
+    """Content-hash manifests that let a stage be skipped when nothing it reads changed.
+
+    After a stage runs, `record` writes `<root_dir>/<stage>.json` with the
+    sha256 of every input file, of its config sections and of every output
+    file. `is_fresh` reports whether the current inputs and config hash to
+    the same values and all outputs are still on disk unchanged.
+
+    Hashes are reused while a file's size and mtime match the manifest, so
+    an unchanged multi-GB input is not re-read on every run.
+    """
+
+    def __init__(self, root_dir: Path):
+        self.root_dir = Path(root_dir)
+
+    def manifest_path(self, stage: str) -> Path:
+        return self.root_dir / f"{stage}.json"
+
+    def load(self, stage: str) -> dict:
+        path = self.manifest_path(stage)
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable stage manifest: {path}")
+            return {}
+
+    def fingerprint(self, paths: list, previous: dict = None) -> dict:
+        """Hashes each file, None for a missing one.
+
+        Args:
+            paths (list): files to hash
+            previous (dict): entries from an earlier manifest to reuse
+
+        Returns:
+            dict: path -> {"sha256", "size", "mtime_ns"}
+        """
+        previous = previous or {}
+        files = {}
+        for path in paths:
+            key = str(path)
+            if not os.path.exists(path):
+                files[key] = None
+                continue
+            stat = os.stat(path)
+            known = previous.get(key)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                files[key] = known
+            else:
+                files[key] = {"sha256": hash_file(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        return files
+
+    @staticmethod
+    def digests(files: dict) -> dict:
+        return {path: entry["sha256"] if entry else None for path, entry in files.items()}
+
+    def is_fresh(self, stage: str, inputs: list, outputs: list, sections: dict) -> bool:
+        manifest = self.load(stage)
+        if not manifest:
+            return False
+        if manifest.get("config") != hash_config(sections):
+            logger.info(f"{stage}: config changed")
+            return False
+
+        current_inputs = self.digests(self.fingerprint(inputs, manifest.get("inputs")))
+        recorded_inputs = self.digests(manifest.get("inputs", {}))
+        if current_inputs != recorded_inputs:
+            changed = [path for path, digest in current_inputs.items() if digest != recorded_inputs.get(path)]
+            logger.info(f"{stage}: inputs changed: {changed or list(recorded_inputs)}")
+            return False
+
+        current_outputs = self.fingerprint(outputs, manifest.get("outputs"))
+        if self.digests(current_outputs) != self.digests(manifest.get("outputs", {})):
+            logger.info(f"{stage}: outputs missing or modified since the last run")
+            return False
+        return True
+
+    def record(self, stage: str, inputs: list, outputs: list, sections: dict):
+        previous = self.load(stage)
+        manifest = {
+            "stage": stage,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "config": hash_config(sections),
+            "inputs": self.fingerprint(inputs, previous.get("inputs")),
+            "outputs": self.fingerprint(outputs),
+        }
+        missing = [path for path, entry in manifest["outputs"].items() if entry is None]
+        if missing:
+            logger.warning(f"{stage}: declared outputs were not written: {missing}")
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        path = self.manifest_path(stage)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, stage: str):
+        path = self.manifest_path(stage)
+        if path.exists():
+            path.unlink()
@@ -0,0 +1,248 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from mlproject import logger
+from mlproject.entities.config_entity import TrackingConfig
+
+
+class NullTracker:
+    """Tracking backend `none`: every call is a no-op."""
+
+    run_id = None
+
+    def start_run(self, tags: dict = None) -> str:
+        return None
+
+    def log_params(self, params: dict):
+        pass
+
+    def log_metrics(self, metrics: dict):
+        pass
+
+    def log_artifact(self, path: Path, artifact_path: str = None):
+        pass
+
+    def log_model(self, model, name: str, features=None, predictions=None):
+        pass
+
+    def end_run(self, status: str = "FINISHED"):
+        pass
+
+    def close(self):
+        pass
+
+
+class BackgroundTracker(NullTracker, ABC):
+    """Runs artifact and model uploads on one background thread, in submission order.
+
+    `end_run` queues the status change behind the uploads, so the caller
+    can carry on; `close` waits for everything queued. A failed upload is
+    logged and marks the run FAILED instead of failing the evaluation.
+    """
+
+    def __init__(self, background: bool):
+        self.run_id = None
+        self.failed = False
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracking") if background else None
+
+    def submit(self, fn, *args):
+        if self.executor is None:
+            return self.guarded(fn, *args)
+        self.executor.submit(self.guarded, fn, *args)
+
+    def guarded(self, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            self.failed = True
+            logger.exception(f"Tracking call {fn.__name__} failed for run {self.run_id}: {e}")
+
+    def end_run(self, status: str = "FINISHED"):
+        if self.run_id is None:
+            return
+        self.submit(lambda: self.terminate("FAILED" if self.failed else status))
+
+    @abstractmethod
+    def terminate(self, status: str):
+        """Marks the run finished with `status` in the backend."""
+
+    def close(self):
+        if self.executor is not None:
+            start = time.perf_counter()
+            self.executor.shutdown(wait=True)
+            logger.info(f"Tracking uploads for run {self.run_id} done, waited {time.perf_counter() - start:.2f} s")
+
+
+class FileTracker(BackgroundTracker):
+    """Tracking backend `file`: one directory per run with run.json and copied artifacts.
+
+    Needs neither mlflow nor a network, for air-gapped clusters.
+    """
+
+    def __init__(self, config: TrackingConfig):
+        super().__init__(config.background_upload)
+        self.config = config
+        self.root_dir = Path(config.root_dir) / config.experiment_name
+        self.run = None
+        # self.run is changed and run.json rewritten from both the caller and the upload thread;
+        # reentrant so a change and the save that follows it hold the lock together
+        self.lock = threading.RLock()
+
+    @property
+    def run_dir(self) -> Path:
+        return self.root_dir / self.run_id
+
+    def start_run(self, tags: dict = None) -> str:
+        with self.lock:
+            self.run_id = uuid.uuid4().hex
+            self.run = {"run_id": self.run_id, "status": "RUNNING", "start_time": time.time(),
+                        "tags": dict(tags or {}), "params": {}, "metrics": {}, "artifacts": []}
+            (self.run_dir / "artifacts").mkdir(parents=True, exist_ok=True)
+            self.save()
+        logger.info(f"Tracking run {self.run_id} at {self.run_dir}")
+        return self.run_id
+
+    def save(self):
+        path = self.run_dir / "run.json"
+        tmp_path = path.with_suffix(".tmp")
+        with self.lock:
+            tmp_path.write_text(json.dumps(self.run, indent=4, default=str))
+            os.replace(tmp_path, path)
+
+    def log_params(self, params: dict):
+        with self.lock:
+            self.run["params"].update({key: str(value) for key, value in params.items()})
+            self.save()
+
+    def log_metrics(self, metrics: dict):
+        with self.lock:
+            self.run["metrics"].update({key: float(value) for key, value in metrics.items()})
+            self.save()
+
+    def add_artifact(self, target: Path):
+        with self.lock:
+            self.run["artifacts"].append(str(target.relative_to(self.run_dir)))
+            self.save()
+
+    def log_artifact(self, path: Path, artifact_path: str = None):
+        self.submit(self.copy_artifact, Path(path), artifact_path)
+
+    def copy_artifact(self, path: Path, artifact_path: str = None):
+        target = self.run_dir / "artifacts" / (artifact_path or "") / path.name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+        self.add_artifact(target)
+
+    def log_model(self, model, name: str, features=None, predictions=None):
+        if self.config.log_model:
+            self.submit(self.dump_model, model, name)
+
+    def dump_model(self, model, name: str):
+        import joblib
+
+        target = self.run_dir / "artifacts" / name / "model.joblib"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(model, target)
+        self.add_artifact(target)
+
+    def terminate(self, status: str):
+        with self.lock:
+            self.run["status"] = status
+            self.run["end_time"] = time.time()
+            self.save()
+
+
+class MlflowTracker(BackgroundTracker):
+    """Tracking backend `mlflow`: any MLflow store, a local SQLite file by default.
+
+    Goes through MlflowClient with explicit run ids, so uploads can run on
+    the background thread after the evaluation has moved on.
+    """
+
+    def __init__(self, config: TrackingConfig):
+        import mlflow
+        from mlflow.tracking import MlflowClient
+
+        super().__init__(config.background_upload)
+        self.config = config
+        tracking_uri = config.tracking_uri
+        if config.dagshub_repo:
+            import dagshub
+
+            repo_owner, repo_name = config.dagshub_repo.split("/", 1)
+            dagshub.init(repo_owner=repo_owner, repo_name=repo_name, mlflow=True)
+            tracking_uri = mlflow.get_tracking_uri()
+        elif tracking_uri.startswith("sqlite:///"):
+            Path(tracking_uri[len("sqlite:///"):]).parent.mkdir(parents=True, exist_ok=True)
+        mlflow.set_tracking_uri(tracking_uri)
+        self.tracking_uri = tracking_uri
+        self.client = MlflowClient(tracking_uri=tracking_uri)
+
+        experiment = self.client.get_experiment_by_name(config.experiment_name)
+        if experiment is not None:
+            self.experiment_id = experiment.experiment_id
+        else:
+            artifact_location = None
+            if config.artifact_location and not config.dagshub_repo:
+                artifact_location = Path(config.artifact_location).resolve().as_uri()
+            self.experiment_id = self.client.create_experiment(config.experiment_name,
+                                                               artifact_location=artifact_location)
+
+    def start_run(self, tags: dict = None) -> str:
+        run = self.client.create_run(self.experiment_id, tags={key: str(value) for key, value in (tags or {}).items()})
+        self.run_id = run.info.run_id
+        logger.info(f"Tracking run {self.run_id} in {self.tracking_uri}")
+        return self.run_id
+
+    def log_params(self, params: dict):
+        from mlflow.entities import Param
+
+        self.client.log_batch(self.run_id, params=[Param(key, str(value)) for key, value in params.items()])
+
+    def log_metrics(self, metrics: dict):
+        from mlflow.entities import Metric
+
+        timestamp = int(time.time() * 1000)
+        self.client.log_batch(self.run_id, metrics=[Metric(key, float(value), timestamp, 0)
+                                                    for key, value in metrics.items()])
+
+    def log_artifact(self, path: Path, artifact_path: str = None):
+        self.submit(self.client.log_artifact, self.run_id, str(path), artifact_path)
+
+    def log_model(self, model, name: str, features=None, predictions=None):
+        if self.config.log_model:
+            self.submit(self.upload_model, model, name, features, predictions)
+
+    def upload_model(self, model, name: str, features, predictions):
+        import mlflow
+        import mlflow.sklearn
+        from mlflow.models import infer_signature
+
+        signature = infer_signature(features, predictions) if features is not None else None
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_dir = os.path.join(tmp_dir, name)
+            mlflow.sklearn.save_model(model, model_dir, signature=signature)
+            self.client.log_artifacts(self.run_id, model_dir, artifact_path=name)
+        if self.config.registered_model_name:
+            mlflow.register_model(f"runs:/{self.run_id}/{name}", self.config.registered_model_name)
+
+    def terminate(self, status: str):
+        self.client.set_terminated(self.run_id, status=status)
+
+
+def get_tracker(config: TrackingConfig):
+    """Tracker for `model_evaluation.tracking.backend`: "mlflow", "file" or "none"."""
+    if config.backend == "mlflow":
+        return MlflowTracker(config)
+    if config.backend == "file":
+        return FileTracker(config)
+    if config.backend == "none":
+        return NullTracker()
+    raise ValueError(f"Unknown tracking backend: {config.backend}")
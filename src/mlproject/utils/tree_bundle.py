@@ -0,0 +1,99 @@
+import math
+import numpy as np
+
+
+# Encoding of LightGBM's missing_type in the bundle
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+
+# LightGBM's kZeroThreshold, a float32 constant compared against doubles
+ZERO_THRESHOLD = float(np.float32(1e-35))
+
+
+def sigmoid(raw_score: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """LightGBM's binary objective link, bit-for-bit: np.exp is not identical to libm's exp, which LightGBM uses."""
+    raw_score = np.asarray(raw_score, dtype=np.float64)
+    exp = np.fromiter(map(math.exp, (-scale * raw_score).tolist()), dtype=np.float64, count=len(raw_score))
+    return 1.0 / (1.0 + exp)
+
+
+class TreeEnsemble:
+    """Vectorized NumPy evaluator for the trees flattened by ModelExporter.
+
+    Follows LightGBM's NumericalDecision, sums the trees in booster order and
+    uses libm's exp for the sigmoid, so the probabilities are bit-for-bit
+    equal to LightGBM's `predict_proba`.
+    """
+
+    def __init__(self, bundle):
+        self.sigmoid = float(bundle["sigmoid"])
+        self.max_depth = int(bundle["max_depth"])
+        self.leaf_value = bundle["leaf_value"]
+
+        # Leaves become nodes that point at themselves, so every row can take
+        # exactly max_depth steps without masking finished trees.
+        n_split, n_leaf = len(bundle["split_feature"]), len(self.leaf_value)
+        self.leaf_offset = n_split
+        leaf_nodes = np.arange(n_split, n_split + n_leaf, dtype=np.int32)
+
+        def to_node(child):
+            return np.where(child < 0, n_split + ~child, child).astype(np.int32)
+
+        self.tree_root = to_node(bundle["tree_root"])
+        self.split_feature = np.concatenate([bundle["split_feature"], np.zeros(n_leaf, dtype=np.int32)])
+        self.threshold = np.concatenate([bundle["threshold"], np.full(n_leaf, np.inf)])
+        self.default_left = np.concatenate([bundle["default_left"], np.ones(n_leaf, dtype=bool)])
+        self.missing_type = np.concatenate([bundle["missing_type"], np.zeros(n_leaf, dtype=np.int8)])
+        # children[2 * node] is taken when the row goes left, children[2 * node + 1] otherwise
+        self.children = np.stack([
+            np.concatenate([to_node(bundle["left_child"]), leaf_nodes]),
+            np.concatenate([to_node(bundle["right_child"]), leaf_nodes]),
+        ], axis=1).ravel()
+        self.has_missing_splits = bool((self.missing_type != MISSING_NONE).any())
+
+    def leaf_indices(self, X: np.ndarray) -> np.ndarray:
+        """Returns the leaf reached in every tree, shape (n_rows, n_trees)."""
+        if not self.has_missing_splits:
+            # With missing_type None everywhere LightGBM reads NaN as 0.0
+            X = np.where(np.isnan(X), 0.0, X)
+
+        n_rows, n_features = X.shape
+        values = np.ascontiguousarray(X).ravel()
+        row_offset = (np.arange(n_rows) * n_features)[:, None]
+        node = np.repeat(self.tree_root[None, :], n_rows, axis=0)
+
+        for _ in range(self.max_depth):
+            fval = np.take(values, row_offset + np.take(self.split_feature, node))
+            threshold = np.take(self.threshold, node)
+
+            if self.has_missing_splits:
+                missing_type = np.take(self.missing_type, node)
+                is_nan = np.isnan(fval)
+                fval = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, fval)
+                use_default = (
+                    ((missing_type == MISSING_ZERO) & (np.abs(fval) <= ZERO_THRESHOLD))
+                    | ((missing_type == MISSING_NAN) & is_nan)
+                )
+                go_right = np.where(use_default, ~np.take(self.default_left, node), ~(fval <= threshold))
+            else:
+                go_right = fval > threshold
+
+            node = np.take(self.children, 2 * node + go_right)
+
+        return node - self.leaf_offset
+
+    def raw_score(self, X: np.ndarray, chunk_size: int = 20000) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        scores = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), chunk_size):
+            leaf_values = np.take(self.leaf_value, self.leaf_indices(X[start:start + chunk_size]).T)
+            score = np.zeros(leaf_values.shape[1], dtype=np.float64)
+            # Add tree by tree, in booster order, to match LightGBM's summation
+            for tree_values in leaf_values:
+                score += tree_values
+            scores[start:start + chunk_size] = score
+        return scores
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Positive class probability, as computed by LightGBM's binary objective."""
+        return sigmoid(self.raw_score(X), self.sigmoid)
@@ -0,0 +1,67 @@
+"""ApproximateSMOTE and RandomUndersampling on small synthetic classes.
+
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+from src.mlproject.utils.balancing import ApproximateSMOTE, RandomUndersampling
+
+
+def make_data(n_major: int = 900, n_minor: int = 100, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        np.r_[rng.normal(0, 1, n_major), rng.normal(3, 0.5, n_minor)],
+        np.r_[rng.uniform(0, 10, n_major), rng.uniform(2, 4, n_minor)],
+        # Category codes; the minority class only has codes 1 and 3
+        np.r_[rng.integers(0, 5, n_major), rng.choice([1, 3], n_minor)].astype(float),
+    ])
+    y = np.r_[np.zeros(n_major, dtype=int), np.ones(n_minor, dtype=int)]
+    return X, y
+
+
+@pytest.mark.parametrize("block_size", [2048, 16])
+def test_synthetic_rows_stay_in_minority_bounds(block_size):
+    X, y = make_data()
+    smote = ApproximateSMOTE(block_size=block_size, categorical=[2])
+    X_out, y_out = smote.fit_resample(X, y)
+    minority, synthetic = X[y == 1], X_out[len(X):]
+
+    assert (y_out[len(X):] == 1).all()
+    assert (synthetic[:, :2] >= minority[:, :2].min(axis=0)).all()
+    assert (synthetic[:, :2] <= minority[:, :2].max(axis=0)).all()
+    # Copied from one of the two rows, never interpolated between codes 1 and 3
+    assert set(np.unique(synthetic[:, 2])) <= {1.0, 3.0}
+
+
+@pytest.mark.parametrize("ratio", [1.0, 0.5])
+def test_output_ratio(ratio):
+    X, y = make_data()
+    for balancer in (ApproximateSMOTE(ratio=ratio), RandomUndersampling(ratio=ratio)):
+        _, y_out = balancer.fit_resample(X, y)
+        counts = np.bincount(y_out)
+        assert counts[1] / counts[0] == pytest.approx(ratio, abs=0.01)
+    # Undersampling keeps the whole minority class
+    assert np.bincount(RandomUndersampling(ratio=ratio).fit_resample(X, y)[1])[1] == 100
+
+
+def test_class_smaller_than_k_neighbors():
+    # k_neighbors is capped at the 3 other rows; row 0 is far away and still everybody's neighbour, never its own
+    X = np.array([[100.0, 100.0], [0.0, 0.0], [0.1, 0.0], [0.0, 0.1]])
+    neighbors = ApproximateSMOTE(k_neighbors=5).neighbors(X, np.random.default_rng(0))
+
+    assert neighbors.shape == (4, 3)
+    for row, found in enumerate(neighbors):
+        assert sorted(found) == [other for other in range(4) if other != row]
+
+
+@pytest.mark.parametrize("block_size", [2, 3])
+def test_windows_smaller_than_k_leave_no_empty_slots(block_size):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(7, 3))
+    neighbors = ApproximateSMOTE(k_neighbors=5, block_size=block_size, n_projections=1).neighbors(X, rng)
+
+    assert neighbors.shape == (7, 5)
+    assert (neighbors >= 0).all()
+    # Neither a row itself nor row 0 as filler for the slots no window could fill
+    assert not (neighbors == np.arange(7)[:, None]).any()
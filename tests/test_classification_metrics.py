@@ -0,0 +1,79 @@
+"""BinaryEvaluator against the sklearn metrics it replaces in evaluation.
+
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+from sklearn.metrics import (average_precision_score, brier_score_loss, f1_score, log_loss,
+                             precision_score, recall_score, roc_auc_score)
+
+from src.mlproject.utils.classification_metrics import BinaryEvaluator, predict_positive
+
+
+def make_scores(n: int = 3000, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.3).astype(int)
+    scores = np.clip(0.3 * y + rng.normal(0.35, 0.2, size=n), 0.0, 1.0)
+    # Rounding leaves many tied scores, and the clip exact 0s and 1s
+    return y, np.round(scores, 2)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_ranking_and_calibration_metrics_match_sklearn(seed):
+    y, scores = make_scores(seed=seed)
+    evaluator = BinaryEvaluator(y, scores)
+    calibration = evaluator.calibration()
+
+    assert evaluator.roc_auc() == pytest.approx(roc_auc_score(y, scores), abs=1e-12)
+    assert evaluator.average_precision() == pytest.approx(average_precision_score(y, scores), abs=1e-12)
+    assert calibration["brier"] == pytest.approx(brier_score_loss(y, scores), abs=1e-12)
+    assert calibration["log_loss"] == pytest.approx(log_loss(y, scores), abs=1e-12)
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.35, 0.5, 0.62, 1.0])
+def test_threshold_metrics_match_sklearn(threshold):
+    y, scores = make_scores()
+    predicted = predict_positive(scores, threshold).astype(int)
+    at_threshold = BinaryEvaluator(y, scores).at_threshold(threshold)
+
+    assert at_threshold["accuracy"] == pytest.approx(np.mean(predicted == y))
+    for name, metric in (("precision", precision_score), ("recall", recall_score), ("f1", f1_score)):
+        assert at_threshold[name] == pytest.approx(metric(y, predicted, average="weighted", zero_division=0))
+        assert at_threshold[f"{name}_positive"] == pytest.approx(metric(y, predicted, zero_division=0))
+
+
+def test_log_loss_clips_exact_zero_and_one():
+    y = np.array([1, 0, 1, 0])
+    scores = np.array([0.0, 1.0, 1.0, 0.0])
+    log_loss_value = BinaryEvaluator(y, scores).calibration()["log_loss"]
+
+    assert np.isfinite(log_loss_value)
+    assert log_loss_value == pytest.approx(-np.log(np.finfo(np.float64).eps) / 2)
+    assert log_loss_value == pytest.approx(log_loss(y, scores))
+
+
+def test_bootstrap_block_matches_weighted_sklearn():
+    y, scores = make_scores(n=500)
+    evaluator = BinaryEvaluator(y, scores)
+    rng = np.random.default_rng(3)
+    # Row counts of three resamples, in the evaluator's sorted order
+    weights = np.stack([np.bincount(rng.integers(0, evaluator.n, evaluator.n), minlength=evaluator.n)
+                        for _ in range(3)]).astype(float)
+    block = evaluator.bootstrap_block(weights, threshold=0.5)
+
+    for i, w in enumerate(weights):
+        sorted_y, sorted_scores = evaluator.y, evaluator.scores
+        predicted = predict_positive(sorted_scores, 0.5).astype(int)
+        assert block["roc_auc"][i] == pytest.approx(roc_auc_score(sorted_y, sorted_scores, sample_weight=w))
+        assert block["average_precision"][i] == pytest.approx(
+            average_precision_score(sorted_y, sorted_scores, sample_weight=w))
+        assert block["accuracy"][i] == pytest.approx(np.average(predicted == sorted_y, weights=w))
+        assert block["f1_positive"][i] == pytest.approx(f1_score(sorted_y, predicted, sample_weight=w))
+        assert block["brier"][i] == pytest.approx(brier_score_loss(sorted_y, sorted_scores, sample_weight=w))
+
+
+def test_bootstrap_intervals_cover_the_point_estimate():
+    y, scores = make_scores()
+    evaluator = BinaryEvaluator(y, scores)
+    intervals = evaluator.bootstrap(n_resamples=200)
+    assert intervals["roc_auc"]["low"] < evaluator.roc_auc() < intervals["roc_auc"]["high"]
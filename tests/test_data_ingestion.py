@@ -0,0 +1,107 @@
+"""DataIngestion.download_file against a local http.server.
+
+    python -m pytest tests
+"""
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.mlproject.components import data_ingestion
+from src.mlproject.components.data_ingestion import DataIngestion
+from src.mlproject.entities.config_entity import DataIngestionConfig
+
+
+PAYLOAD = bytes(range(256)) * 400
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD; `server.mode` picks the misbehaviour.
+
+    "drop": the first response sends half the body and closes the connection,
+    later ones honour Range with a 206.
+    "ignore_range": always answers 200 with the whole body.
+    """
+
+    def do_GET(self):
+        server = self.server
+        server.ranges.append(self.headers.get("Range"))
+        start = 0
+        if self.headers.get("Range") and server.mode != "ignore_range":
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+        body = PAYLOAD[start:]
+
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if server.mode == "drop" and len(server.ranges) == 1:
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    httpd.mode = None
+    httpd.ranges = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(data_ingestion.time, "sleep", lambda seconds: None)
+
+
+def make_ingestion(server, tmp_path, sha256=hashlib.sha256(PAYLOAD).hexdigest()) -> DataIngestion:
+    return DataIngestion(DataIngestionConfig(
+        root_dir=tmp_path,
+        source_URL=f"http://127.0.0.1:{server.server_port}/data.zip",
+        local_data_file=tmp_path / "data.zip",
+        unzip_dir=tmp_path,
+        sha256=sha256,
+        chunk_size=4096,
+        timeout=5,
+        retries=3,
+        extract=False,
+    ))
+
+
+def test_resumes_with_range_after_dropped_connection(server, tmp_path):
+    server.mode = "drop"
+    make_ingestion(server, tmp_path).download_file()
+
+    assert (tmp_path / "data.zip").read_bytes() == PAYLOAD
+    assert not (tmp_path / "data.zip.part").exists()
+    assert server.ranges[0] is None
+    assert server.ranges[1] == f"bytes={len(PAYLOAD) // 2}-"
+
+
+def test_restarts_when_server_ignores_range(server, tmp_path):
+    server.mode = "ignore_range"
+    (tmp_path / "data.zip.part").write_bytes(b"stale bytes from another download")
+    make_ingestion(server, tmp_path).download_file()
+
+    assert (tmp_path / "data.zip").read_bytes() == PAYLOAD
+    assert server.ranges == ["bytes=33-"]
+
+
+def test_checksum_mismatch_leaves_no_file(server, tmp_path):
+    ingestion = make_ingestion(server, tmp_path, sha256=hashlib.sha256(b"other data").hexdigest())
+    with pytest.raises(ValueError, match="sha256"):
+        ingestion.download_file()
+
+    assert not (tmp_path / "data.zip").exists()
+    assert not (tmp_path / "data.zip.part").exists()
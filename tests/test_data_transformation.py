@@ -0,0 +1,67 @@
+"""Streaming DataTransformation on a slice of the bundled data.
+
+    python -m pytest tests
+"""
+import dataclasses
+
+import numpy as np
+import pytest
+
+from src.mlproject.components.data_transformation import DataTransformation
+from src.mlproject.config.config import ConfigurationManager
+from src.mlproject.utils.common import read_csv_source
+
+
+ROWS = 401
+
+
+@pytest.fixture
+def streaming_config(tmp_path):
+    data = read_csv_source("artifacts/data_ingestion/data.zip").head(ROWS)
+    data.to_csv(tmp_path / "data.csv", index=False)
+    config = ConfigurationManager().get_data_transformation_config()
+    return dataclasses.replace(config, root_dir=tmp_path, data_path=tmp_path / "data.csv",
+                               feature_pipeline_path=tmp_path / "feature_pipeline.npz", streaming=True)
+
+
+@pytest.mark.parametrize("chunksize", [ROWS - 1, 200])
+def test_streaming_keeps_a_one_row_tail(streaming_config, tmp_path, chunksize):
+    transformation = DataTransformation(dataclasses.replace(streaming_config, chunksize=chunksize))
+    assert [len(chunk) for chunk in transformation.read_chunks()][-1] > 1
+
+    transformation.streaming_transform()
+
+    test_y = np.load(tmp_path / "test_target.npy")
+    tuning_y = np.load(tmp_path / "tuning_target.npy")
+    train_y = np.load(tmp_path / "train_target.npy")
+    # Every input row lands in test or in the unbalanced training split exactly once
+    assert len(test_y) + len(tuning_y) == ROWS
+    # SMOTE ran on every chunk's training part, the tail included
+    assert np.bincount(train_y)[0] == np.bincount(train_y)[1]
+
+
+def test_single_row_goes_to_train(streaming_config):
+    transformation = DataTransformation(streaming_config)
+    X, y = np.arange(3.0).reshape(1, 3), np.array([1])
+    train_x, test_x, train_y, test_y = transformation.split(X, y)
+    assert len(train_x) == 1 and len(test_x) == 0
+
+
+def test_pipeline_is_fitted_on_the_training_split(streaming_config, tmp_path):
+    data = read_csv_source(streaming_config.data_path)
+    transformation = DataTransformation(dataclasses.replace(streaming_config, chunksize=ROWS))
+    labels = transformation.split(np.arange(ROWS), data["Churn"].to_numpy())
+    # A category only a test row has must not reach the vocabulary
+    data.loc[labels[1][0], "PaymentMethod"] = "Carrier pigeon"
+    data.to_csv(streaming_config.data_path, index=False)
+
+    transformation.preprocess_data(data)
+    batch = transformation.pipeline
+    transformation.streaming_transform()
+    streaming = transformation.pipeline
+
+    assert "Carrier pigeon" not in batch.category_lookup["PaymentMethod"]
+    assert batch.medians == pytest.approx(streaming.medians)
+    assert batch.most_frequent == streaming.most_frequent
+    for col in batch.cat_cols:
+        assert list(batch.category_lookup[col]) == list(streaming.category_lookup[col])
@@ -0,0 +1,67 @@
+"""ModelExporter.export_trees, TreeEnsemble and the sklearn serving backend against LightGBM's own predict_proba.
+
+    python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+
+from src.mlproject.components.model_export import ModelExporter
+from src.mlproject.utils.tree_bundle import TreeEnsemble
+
+
+def make_data(n: int = 2000, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5))
+    y = (X[:, 0] + 0.5 * X[:, 1] - X[:, 2] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    # Missing values in training give NaN missing_type splits on column 0
+    X[rng.random(n) < 0.1, 0] = np.nan
+    # Exact zeros on column 1, which zero_as_missing turns into Zero missing_type splits
+    X[rng.random(n) < 0.2, 1] = 0.0
+    return X, y
+
+
+@pytest.mark.parametrize("zero_as_missing", [False, True])
+def test_bundle_matches_predict_proba(zero_as_missing):
+    X, y = make_data()
+    model = LGBMClassifier(n_estimators=50, num_leaves=15, zero_as_missing=zero_as_missing,
+                           random_state=0, verbose=-1).fit(X, y)
+
+    X_test, _ = make_data(n=1000, seed=1)
+    # Missing values where training had none, and zeros everywhere
+    X_test[::7, 3] = np.nan
+    X_test[::11] = 0.0
+    bundle = TreeEnsemble(ModelExporter(config=None).export_trees(model))
+
+    assert np.array_equal(bundle.predict_proba(X_test), model.predict_proba(X_test)[:, 1])
+
+
+def test_multiclass_model_is_rejected():
+    X, _ = make_data()
+    y = np.arange(len(X)) % 3
+    model = LGBMClassifier(n_estimators=5, verbose=-1).fit(X, y)
+    with pytest.raises(ValueError, match="binary"):
+        ModelExporter(config=None).export_trees(model)
+
+
+def test_categorical_splits_are_rejected():
+    X, y = make_data()
+    frame = pd.DataFrame(X[:, 2:], columns=["a", "b", "c"])
+    frame["category"] = pd.Categorical(np.where(y == 1, "churn", "stay"))
+    model = LGBMClassifier(n_estimators=5, min_child_samples=5, verbose=-1).fit(frame, y)
+    with pytest.raises(ValueError, match="Categorical"):
+        ModelExporter(config=None).export_trees(model)
+
+
+def test_serving_backends_match_predict_proba():
+    from src.mlproject.config.config import ConfigurationManager
+    from src.mlproject.pipeline.pipelineprediction import ChurnPredictionPipeline
+
+    pipeline = ChurnPredictionPipeline(ConfigurationManager().get_prediction_config())
+    X = np.load("artifacts/data_transformation/test_features.npy")
+    bundle = TreeEnsemble(np.load("artifacts/model_trainer/model_bundle.npz"))
+
+    expected = pipeline.model.predict_proba(X)[:, 1]
+    assert np.array_equal(pipeline.score(X), expected)
+    assert np.array_equal(bundle.predict_proba(X), expected)
@@ -0,0 +1,75 @@
+"""ModelHolder's reload contract, on a copy of the committed serving artifacts.
+
+    python -m pytest tests
+"""
+import dataclasses
+import shutil
+
+import joblib
+import pytest
+
+from mlproject.config.config import ConfigurationManager
+from mlproject.pipeline.model_holder import ModelHolder
+from mlproject.pipeline.pipelineprediction import ChurnPredictionPipeline
+from mlproject.utils import serving_manifest
+from mlproject.utils.serving_manifest import artifact_key, write_serving_manifest
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = ConfigurationManager().get_prediction_config()
+    for path in (config.feature_pipeline_path, config.model_path):
+        shutil.copy2(path, tmp_path / path.name)
+    config = dataclasses.replace(
+        config,
+        feature_pipeline_path=tmp_path / config.feature_pipeline_path.name,
+        model_path=tmp_path / config.model_path.name,
+        manifest_path=tmp_path / "serving_manifest.json",
+        reload_interval=0.0,
+        cache_enabled=False,
+    )
+    export(config)
+    return config
+
+
+def export(config) -> str:
+    """What model export does once the artifacts are final."""
+    return write_serving_manifest(config.manifest_path, ChurnPredictionPipeline.get_artifact_paths(config))
+
+
+def test_rewritten_model_waits_for_the_manifest(config):
+    holder = ModelHolder(config)
+    pipeline = holder.get()
+
+    model = joblib.load(config.model_path)
+    joblib.dump(model, config.model_path, compress=3)
+    assert not holder.reload_if_changed()
+    assert holder.get() is pipeline
+
+    version = export(config)
+    assert version != pipeline.version
+    assert holder.reload_if_changed()
+    assert holder.get() is not pipeline and holder.version == version
+
+
+def test_failed_reload_keeps_the_old_model(config):
+    holder = ModelHolder(config)
+    pipeline = holder.get()
+
+    config.model_path.write_bytes(b"not a model")
+    export(config)
+    assert not holder.reload_if_changed()
+    assert holder.get() is pipeline
+    assert holder.version == pipeline.version
+
+
+def test_hash_cache_keeps_one_entry_per_file(config):
+    entries = len(serving_manifest._hashes)
+    model = joblib.load(config.model_path)
+    for compress in (1, 3, 9):
+        joblib.dump(model, config.model_path, compress=compress)
+        export(config)
+    # Every retraining rewrites the same files; the cache must not grow with them
+    assert len(serving_manifest._hashes) == entries
+    assert serving_manifest._hashes[artifact_key(config.model_path)][2] == \
+        serving_manifest.hash_file(config.model_path)
@@ -0,0 +1,61 @@
+"""Prediction cache keys and counters, scored with the committed artifacts.
+
+    python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlproject.config.config import ConfigurationManager
+from mlproject.pipeline.pipelineprediction import ChurnPredictionPipeline
+from mlproject.pipeline.prediction_cache import PredictionCache
+from mlproject.utils.metrics import CACHE_EVICTIONS, CACHE_HITS, REGISTRY
+
+
+@pytest.fixture
+def rows():
+    data = pd.read_csv("artifacts/data_ingestion/Tele_Comm.csv", nrows=8)
+    data["TotalCharges"] = data["TotalCharges"].astype(object)
+    data.loc[[0, 3], "TotalCharges"] = " "
+    data.loc[5, "MonthlyCharges"] = np.nan
+    return data.drop(columns=["customerID", "Churn"])
+
+
+@pytest.fixture
+def metrics_enabled(monkeypatch):
+    monkeypatch.setattr(REGISTRY, "enabled", True)
+
+
+def make_pipeline(cache: PredictionCache) -> ChurnPredictionPipeline:
+    return ChurnPredictionPipeline(ConfigurationManager().get_prediction_config(), cache=cache)
+
+
+def test_missing_numbers_key_as_none(rows):
+    pipeline = make_pipeline(PredictionCache())
+    keys = pipeline.cache_keys(rows)
+    total_charges = pipeline.input_features.index("TotalCharges")
+    assert keys[0][total_charges] is None and keys[3][total_charges] is None
+    assert keys == pipeline.cache_keys(rows.copy())
+
+
+def test_rows_with_missing_numbers_hit(rows, metrics_enabled):
+    cache = PredictionCache()
+    pipeline = make_pipeline(cache)
+    first = pipeline.score_rows(rows)
+    hits = CACHE_HITS._default.value
+
+    second = pipeline.score_rows(rows.copy())
+    assert cache.stats()["hits"] == len(rows)
+    assert CACHE_HITS._default.value - hits == len(rows)
+    assert np.array_equal(first, second)
+
+
+def test_evictions_are_exported(rows, metrics_enabled):
+    cache = PredictionCache(max_size=3)
+    pipeline = make_pipeline(cache)
+    evictions = CACHE_EVICTIONS._default.value
+
+    pipeline.score_rows(rows)
+    assert cache.stats()["evictions"] == len(rows) - 3
+    assert CACHE_EVICTIONS._default.value - evictions == len(rows) - 3
+    assert "churnshield_cache_evictions_total" in REGISTRY.render()
@@ -0,0 +1,100 @@
+"""SchemaValidator reports and per-row checks, and the invalid rows of /predict/batch.
+
+    python -m pytest tests
+"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from mlproject.utils.common import read_yaml
+from mlproject.utils.schema_validator import SchemaValidator
+
+
+DATA = "artifacts/data_ingestion/Tele_Comm.csv"
+
+
+@pytest.fixture
+def validator():
+    return SchemaValidator.from_schema(read_yaml(Path("schema.yaml")), allow_extra_columns=False)
+
+
+@pytest.fixture
+def dirty_csv(tmp_path):
+    data = pd.read_csv(DATA, dtype=str, keep_default_na=False)
+    data.loc[[3, 700], "tenure"] = ["ten", "12.5"]
+    data.loc[[10, 2500], "MonthlyCharges"] = ["5000", "-1"]
+    data.loc[42, "gender"] = "Other"
+    data.loc[4000, "Contract"] = ""
+    path = tmp_path / "dirty.csv"
+    data.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("chunksize", [1000, 333, 97])
+def test_chunked_report_equals_whole_frame(validator, dirty_csv, chunksize):
+    whole = validator.validate(pd.read_csv(dirty_csv, dtype=str, keep_default_na=False))
+    chunked = validator.validate_chunks(pd.read_csv(dirty_csv, dtype=str, keep_default_na=False,
+                                                    chunksize=chunksize))
+
+    assert chunked == whole
+    assert not whole["status"]
+    assert whole["columns"]["tenure"]["type_errors"] == 2
+    assert whole["columns"]["tenure"]["examples"] == {"ten": 1, "12.5": 1}
+    assert whole["columns"]["MonthlyCharges"]["out_of_range"] == 2
+    assert whole["columns"]["MonthlyCharges"]["min"] == -1.0
+    assert whole["columns"]["gender"]["unknown_values"] == 1
+    assert whole["columns"]["Contract"]["nulls"] == 1
+    # Blank TotalCharges of new customers stay under its 1% null rate
+    assert whole["columns"]["TotalCharges"]["errors"] == []
+
+
+def test_clean_data_passes(validator):
+    report = validator.validate(pd.read_csv(DATA, dtype=str, keep_default_na=False))
+    assert report["status"], report["errors"]
+
+
+def test_check_rows(validator):
+    data = pd.read_csv(DATA, nrows=6).drop(columns=["customerID", "Churn"])
+    data = data.astype(object)
+    data.loc[1, "tenure"] = "ten"
+    data.loc[2, "MonthlyCharges"] = 5000
+    data.loc[3, ["gender", "SeniorCitizen"]] = ["Other", 2]
+    data.loc[4, "TotalCharges"] = " "
+    data.loc[5, "Partner"] = None
+
+    valid, reasons = SchemaValidator.from_schema(read_yaml(Path("schema.yaml")),
+                                                 columns=list(data.columns)).check_rows(data)
+
+    assert valid.tolist() == [True, False, False, False, True, False]
+    assert reasons[0] == "" and reasons[4] == ""
+    assert reasons[1] == "tenure: not int"
+    assert reasons[2] == "MonthlyCharges: outside [0, 1000]"
+    assert reasons[3] == "gender: outside the allowed domain; SeniorCitizen: outside the allowed domain"
+    assert reasons[5] == "Partner: null"
+
+
+def test_check_rows_needs_every_column(validator):
+    data = pd.read_csv(DATA, nrows=2).drop(columns=["tenure"])
+    with pytest.raises(ValueError, match="tenure"):
+        validator.check_rows(data)
+
+
+def test_predict_batch_reports_invalid_rows():
+    import app
+
+    records = pd.read_csv(DATA, nrows=3).drop(columns=["Churn"]).to_dict(orient="records")
+    records[1]["tenure"] = "ten"
+    records[2]["MonthlyCharges"] = 5000
+
+    response = app.app.test_client().post("/predict/batch", json=records)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["rows"] == 3 and body["invalid_rows"] == 2
+
+    good, bad_type, out_of_range = body["predictions"]
+    assert good["error"] is None and 0.0 <= good["churn_probability"] <= 1.0
+    assert good["customerID"] == records[0]["customerID"]
+    assert bad_type["error"] == "tenure: not int" and bad_type["churn_probability"] is None
+    assert out_of_range["error"] == "MonthlyCharges: outside [0, 1000]"
+    assert out_of_range["churn_probability"] is None
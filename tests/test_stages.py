@@ -0,0 +1,151 @@
+"""StageCache freshness, the executor's manifest handling and --stage/--from-stage/--force selection.
+
+    python -m pytest tests
+"""
+import json
+
+import pytest
+
+from mlproject.config.config import ConfigurationManager
+from mlproject.entities.config_entity import StageCacheConfig
+from mlproject.pipeline import executor
+from mlproject.pipeline.stages import Stage, get_stage, select_stages
+from mlproject.utils.stage_cache import StageCache
+
+
+SECTIONS = {"params": {"alpha": 1}}
+
+
+class WritingPipeline:
+    def main(self):
+        with open(WritingPipeline.output, "w") as f:
+            f.write("output")
+
+
+class FailingPipeline:
+    def main(self):
+        raise RuntimeError("stage failed half way")
+
+
+@pytest.fixture
+def files(tmp_path):
+    source, result = tmp_path / "input.csv", tmp_path / "output.csv"
+    source.write_text("a,b\n1,2\n")
+    result.write_text("output")
+    return source, result
+
+
+def test_fresh_after_record(tmp_path, files):
+    cache = StageCache(tmp_path / "manifests")
+    source, result = files
+    assert not cache.is_fresh("stage", [source], [result], SECTIONS)
+
+    cache.record("stage", [source], [result], SECTIONS)
+    assert cache.is_fresh("stage", [source], [result], SECTIONS)
+
+
+def test_stale_after_input_change(tmp_path, files):
+    cache = StageCache(tmp_path / "manifests")
+    source, result = files
+    cache.record("stage", [source], [result], SECTIONS)
+
+    source.write_text("a,b\n1,2\n3,4\n")
+    assert not cache.is_fresh("stage", [source], [result], SECTIONS)
+
+
+def test_stale_after_config_change(tmp_path, files):
+    cache = StageCache(tmp_path / "manifests")
+    source, result = files
+    cache.record("stage", [source], [result], SECTIONS)
+
+    assert not cache.is_fresh("stage", [source], [result], {"params": {"alpha": 2}})
+
+
+@pytest.mark.parametrize("change", ["modify", "delete"])
+def test_stale_after_output_change(tmp_path, files, change):
+    cache = StageCache(tmp_path / "manifests")
+    source, result = files
+    cache.record("stage", [source], [result], SECTIONS)
+
+    if change == "modify":
+        result.write_text("edited by hand")
+    else:
+        result.unlink()
+    assert not cache.is_fresh("stage", [source], [result], SECTIONS)
+
+
+@pytest.fixture
+def fake_stage(tmp_path, files, monkeypatch):
+    """Points run_stage at a stage whose pipeline class is swapped per test."""
+    source, result = files
+    WritingPipeline.output = result
+    stage = Stage(
+        name="fake",
+        title="Fake",
+        pipeline=f"{__name__}:WritingPipeline",
+        inputs=lambda cm: [source],
+        outputs=lambda cm: [result],
+        sections=lambda cm: SECTIONS,
+    )
+    monkeypatch.setattr(executor, "get_stage", lambda name: stage)
+    monkeypatch.setattr(ConfigurationManager, "get_stage_cache_config",
+                        lambda self: StageCacheConfig(root_dir=tmp_path / "manifests", enabled=True))
+    return stage
+
+
+def test_run_stage_skips_when_fresh(tmp_path, fake_stage):
+    assert executor.run_stage("fake")["status"] == executor.RAN
+    assert json.loads((tmp_path / "manifests" / "fake.json").read_text())["stage"] == "fake"
+    assert executor.run_stage("fake")["status"] == executor.SKIPPED
+    assert executor.run_stage("fake", force=True)["status"] == executor.RAN
+
+
+def test_failed_run_drops_manifest(tmp_path, fake_stage, monkeypatch):
+    executor.run_stage("fake")
+    manifest = tmp_path / "manifests" / "fake.json"
+    assert manifest.exists()
+
+    monkeypatch.setattr(executor, "get_stage", lambda name: Stage(
+        **{**fake_stage.__dict__, "pipeline": f"{__name__}:FailingPipeline"}))
+    with pytest.raises(RuntimeError):
+        executor.run_stage("fake", force=True)
+    # The old outputs are still on disk, but the next run must not skip the stage
+    assert not manifest.exists()
+    assert not StageCache(tmp_path / "manifests").is_fresh(
+        "fake", fake_stage.inputs(None), fake_stage.outputs(None), SECTIONS)
+
+
+def test_disabled_tuning_ignores_model_params():
+    cm = ConfigurationManager()
+    stage = get_stage("model_tuning")
+    cm.params.tuning.enabled = False
+    assert set(stage.sections(cm)) == {"tuning", "balancing"}
+    assert stage.inputs(cm) == [] and stage.outputs(cm) == []
+
+    cm.params.tuning.enabled = True
+    assert "LGBMClassifier" in stage.sections(cm)
+    assert cm.config.model_tuning.best_params_path in stage.outputs(cm)
+
+
+ALL = ["data_ingestion", "data_validation", "data_transformation", "model_tuning",
+       "model_training", "model_export", "model_evaluation"]
+
+
+@pytest.mark.parametrize("stage, from_stage, force, names, forced", [
+    (None, None, None, ALL, set()),
+    (["model_export", "data_ingestion"], None, None, ["data_ingestion", "model_export"], set()),
+    (None, "model_training", None, ["model_training", "model_export", "model_evaluation"],
+     {"model_training", "model_export", "model_evaluation"}),
+    (["model_export"], "model_training", None, ["model_export"],
+     {"model_training", "model_export", "model_evaluation"}),
+    (["model_export"], None, [], ["model_export"], {"model_export"}),
+    (None, None, ["model_training"], ALL, {"model_training"}),
+])
+def test_select_stages(stage, from_stage, force, names, forced):
+    assert select_stages(stage, from_stage, force) == (names, forced)
+
+
+@pytest.mark.parametrize("kwargs", [{"from_stage": "training"}, {"force": ["training"]}])
+def test_select_stages_rejects_unknown_names(kwargs):
+    with pytest.raises(ValueError):
+        select_stages(**kwargs)
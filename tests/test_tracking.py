@@ -0,0 +1,78 @@
+"""FileTracker's run.json and artifact copies, with and without the upload thread.
+
+    python -m pytest tests
+"""
+import json
+
+import joblib
+import pytest
+
+from mlproject.entities.config_entity import TrackingConfig
+from mlproject.utils.metrics import Metric, REGISTRY
+from mlproject.utils.tracking import BackgroundTracker, FileTracker, get_tracker
+
+
+def make_config(tmp_path, background_upload: bool) -> TrackingConfig:
+    return TrackingConfig(
+        backend="file",
+        tracking_uri=None,
+        artifact_location=None,
+        root_dir=tmp_path / "runs",
+        experiment_name="churn",
+        registered_model_name=None,
+        log_model=True,
+        background_upload=background_upload,
+        dagshub_repo=None,
+    )
+
+
+def read_run(tracker: FileTracker) -> dict:
+    return json.loads((tracker.run_dir / "run.json").read_text())
+
+
+@pytest.mark.parametrize("background_upload", [False, True])
+def test_run_json_and_artifacts(tmp_path, background_upload):
+    report = tmp_path / "metrics.json"
+    report.write_text('{"roc_auc": 0.83}')
+    tracker = get_tracker(make_config(tmp_path, background_upload))
+    assert isinstance(tracker, FileTracker)
+
+    run_id = tracker.start_run(tags={"model_version": "abc123"})
+    assert tracker.run_dir == tmp_path / "runs" / "churn" / run_id
+    assert read_run(tracker)["status"] == "RUNNING"
+
+    tracker.log_params({"n_estimators": 100, "learning_rate": 0.05})
+    tracker.log_metrics({"roc_auc": 0.83, "accuracy": 1})
+    tracker.log_artifact(report, "reports")
+    tracker.log_model({"weights": [1, 2, 3]}, "model")
+    tracker.end_run()
+    tracker.close()
+
+    run = read_run(tracker)
+    assert run["run_id"] == run_id and run["status"] == "FINISHED" and "end_time" in run
+    assert run["tags"] == {"model_version": "abc123"}
+    assert run["params"] == {"n_estimators": "100", "learning_rate": "0.05"}
+    assert run["metrics"] == {"roc_auc": 0.83, "accuracy": 1.0}
+    assert run["artifacts"] == ["artifacts/reports/metrics.json", "artifacts/model/model.joblib"]
+    assert (tracker.run_dir / "artifacts/reports/metrics.json").read_text() == report.read_text()
+    assert joblib.load(tracker.run_dir / "artifacts/model/model.joblib") == {"weights": [1, 2, 3]}
+
+
+@pytest.mark.parametrize("background_upload", [False, True])
+def test_failed_upload_marks_run_failed(tmp_path, background_upload):
+    tracker = FileTracker(make_config(tmp_path, background_upload))
+    tracker.start_run()
+    tracker.log_artifact(tmp_path / "missing.json")
+    tracker.end_run()
+    tracker.close()
+
+    run = read_run(tracker)
+    assert run["status"] == "FAILED"
+    assert run["artifacts"] == []
+
+
+def test_abstract_bases_need_their_hooks():
+    with pytest.raises(TypeError, match="terminate"):
+        BackgroundTracker(background=False)
+    with pytest.raises(TypeError, match="new_child"):
+        Metric(REGISTRY, "churnshield_test", "Not registered")